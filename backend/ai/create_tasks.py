@@ -1,14 +1,73 @@
+import csv
+import hashlib
 import json
 import pandas as pd
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 import re
 
 try:
     from backend.personalization import inject_style as _inject_style
 except ImportError:
-    def _inject_style(prompt: str, context_type: str = "general") -> str:
+    def _inject_style(prompt: str, context_type: str = "general", query_text: Optional[str] = None) -> str:
         return prompt
 
+# Task-title line prefixes in LLM output: "1. Title" or "- Title" / "* Title"
+_NUM_PREFIX_RE = re.compile(r'^\d+\.\s*')
+_BULLET_PREFIXES = ("- ", "* ")
+
+# Keep the model loaded between calls so Ollama can reuse the KV cache for the
+# static prompt preamble below
+_KEEP_ALIVE = "10m"
+
+# Fixed instructions placed first in every task-generation prompt. Only the
+# project-specific sections after it change between calls, so the shared
+# prefix stays cacheable.
+_TASK_PROMPT_PREAMBLE = """
+You are a project manager breaking down software development requirements into specific, actionable tasks.
+
+Based on the project requirements and constraints given at the end of this prompt, generate a comprehensive list of remaining tasks needed to complete the project.
+
+For each task, provide:
+1. A clear, specific title that describes what needs to be done
+2. A brief description of the task (1-2 sentences)
+3. The category/component it belongs to (e.g., "User Input Parsing", "Query Validation", etc.)
+
+Format your response as a structured list where each task is clearly numbered and contains:
+- Title: [Clear, actionable task title]
+- Description: [Brief description of what the task involves]
+- Category: [Which component/phase this belongs to]
+
+Focus on:
+- Breaking down complex processes into manageable tasks
+- Ensuring logical sequence and dependencies
+- Including error handling, testing, and monitoring tasks
+- Covering all aspects mentioned in the requirements
+- Not duplicating existing tasks
+
+Generate tasks that are specific, measurable, and implementable.
+"""
+
+# generate_tasks_batch(): jobs packed into one prompt, each section and each
+# answer introduced by a "===JOB n===" line. Capped because long multi-job
+# prompts degrade answer quality faster than they save per-call overhead.
+_MAX_BATCH_JOBS = 8
+_JOB_MARKER_RE = re.compile(r'^\s*===\s*JOB\s+(\d+)\s*===\s*$', re.MULTILINE)
+
+# Completed LLM responses kept on disk, keyed by provider/model + prompt
+_CACHE_MAX_ENTRIES = 256
+
+
+def _default_cache_dir() -> Path:
+    """Data/cache/tasks under DATA_DIR (or the project root)."""
+    try:
+        from backend.config import get_data_dir, _find_project_root
+        data_dir = get_data_dir()
+        base = Path(data_dir) if data_dir else _find_project_root() / "Data"
+    except ImportError:
+        base = Path(__file__).resolve().parent.parent.parent / "Data"
+    return base / "cache" / "tasks"
+
 
 def _get_task_defaults():
     """Get task defaults from config (no hardcoded personal data)."""
@@ -32,15 +91,114 @@ def _get_task_defaults():
         return {"assignee": "", "parent_id": "", "starting_id": 0}
 
 
+def _title_keys(tasks: Optional[List[Dict]]) -> frozenset:
+    """Normalize task titles once into case-insensitive lookup keys."""
+    return frozenset(
+        title.strip().lower()
+        for title in (task.get('title') for task in tasks or [])
+        if title
+    )
+
+
+class _TaskLineParser:
+    """Incremental parser for task-list LLM output, fed one line at a time.
+
+    Lets generate_tasks() parse a streamed response while the model is still
+    producing it; _parse_response() runs the same parser over a full string.
+
+    Fields are collected into parallel title/description/category lists and
+    only turned into task dicts once, in finish().
+    """
+
+    def __init__(self, make_task, starting_id: int, skip_titles: frozenset = frozenset()):
+        self._make_task = make_task  # (task_data, work_item_id) -> task dict
+        self._starting_id = starting_id
+        self._skip_titles = skip_titles  # normalized keys from _title_keys()
+        self._titles: List[Optional[str]] = []
+        self._descs: List[Optional[str]] = []
+        self._cats: List[Optional[str]] = []
+        self._open = False  # whether the last list slot is still being filled
+
+    def _start(self, title: Optional[str] = None) -> None:
+        self._titles.append(title)
+        self._descs.append(None)
+        self._cats.append(None)
+        self._open = True
+
+    def _set(self, column: List[Optional[str]], line: str) -> None:
+        # "Title:" etc. before any numbered line opens a task of its own
+        if not self._open:
+            self._start()
+        column[-1] = line.split(':', 1)[1].strip()
+
+    def feed(self, line: str) -> None:
+        line = line.strip()
+        if not line:
+            return
+
+        # Dispatch on the first character so most lines cost one comparison
+        first = line[0]
+        if first.isdigit():
+            # Task titles are usually numbered ...
+            num = _NUM_PREFIX_RE.match(line)
+            if num:
+                self._start(line[num.end():])
+                return
+        elif first in '-*':
+            # ... or bullet points
+            if line[1:2] == ' ':
+                self._start(line[2:].lstrip())
+                return
+        elif first in 'tT':
+            if line[:6].lower() == 'title:':
+                self._set(self._titles, line)
+                return
+        elif first in 'dD':
+            if line[:12].lower() == 'description:':
+                self._set(self._descs, line)
+                return
+        elif first in 'cC':
+            if line[:9].lower() == 'category:':
+                self._set(self._cats, line)
+                return
+
+        # If we have a title but no description, this might be the description
+        if self._open and self._titles[-1] and not self._descs[-1]:
+            if len(line) > 20:  # Reasonable description length
+                self._descs[-1] = line
+
+    def finish(self) -> List[Dict]:
+        tasks: List[Dict] = []
+        next_id = self._starting_id
+        skip = self._skip_titles
+        for title, desc, cat in zip(self._titles, self._descs, self._cats):
+            # Tasks the model repeated from the existing list are dropped before taking an ID
+            if not title or title.strip().lower() in skip:
+                continue
+            task_data = {'title': title}
+            if desc:
+                task_data['description'] = desc
+            if cat:
+                task_data['category'] = cat
+            tasks.append(self._make_task(task_data, next_id))
+            next_id += 1
+        self._titles, self._descs, self._cats = [], [], []
+        self._open = False
+        return tasks
+
+
 class TaskGenerator:
-    def __init__(self, provider=None):
+    def __init__(self, provider=None, cache_dir: Optional[Path] = None):
         """Initialize the TaskGenerator.
 
         Args:
             provider: Optional LLM provider instance (injected for testing).
                       Defaults to the global provider chain from get_provider().
+            cache_dir: Directory for cached LLM responses.
+                       Defaults to Data/cache/tasks.
         """
         self._provider = provider  # None = lazy init on first use
+        self._cache_dir = Path(cache_dir) if cache_dir else None
 
     def _get_provider(self):
         if self._provider is None:
@@ -76,122 +234,213 @@ class TaskGenerator:
         Returns:
             List of dictionaries containing task information
         """
-        defaults = _get_task_defaults()
-        assignee = assignee or defaults["assignee"]
-        parent_work_item_id = parent_work_item_id or defaults["parent_id"]
-        starting_work_item_id = starting_work_item_id if starting_work_item_id is not None else defaults["starting_id"]
+        assignee, parent_work_item_id, starting_work_item_id = self._resolve_defaults(
+            assignee, parent_work_item_id, starting_work_item_id
+        )
 
         # Prepare the prompt for the LLM
         prompt = self._create_prompt(requirements, constraints, existing_tasks)
 
-        # Generate response using the configured LLM provider
-        from backend.llm.base import LLMOptions
+        def make_task(task_data: Dict, work_item_id: int) -> Dict:
+            return self._create_task_dict(task_data, assignee, parent_work_item_id, work_item_id)
+
+        existing_titles = _title_keys(existing_tasks)
+
+        # Identical prompts skip the model entirely
+        cache_key = self._cache_key(prompt)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return self._parse_response(
+                cached, assignee, parent_work_item_id, starting_work_item_id, existing_titles
+            )
+
+        # Stream the response and parse complete lines while the model is still generating
+        from backend.llm.base import LLMOptions, TrackedStream
         from backend.config import http_timeout_long
-        response_text = self._get_provider().generate(
+        parser = _TaskLineParser(make_task, starting_work_item_id, existing_titles)
+        chunks: List[str] = []
+        pending = ""
+        stream = TrackedStream(self._get_provider().generate_stream(
             prompt=prompt,
-            options=LLMOptions(temperature=0.3, max_tokens=1000),
+            options=LLMOptions(temperature=0.3, max_tokens=1000, keep_alive=_KEEP_ALIVE),
             timeout=http_timeout_long(),
-        )
+        ))
+        for chunk in stream:
+            chunks.append(chunk)
+            pending += chunk
+            *lines, pending = pending.split('\n')
+            for line in lines:
+                parser.feed(line)
+        parser.feed(pending)
 
+        response_text = "".join(chunks).strip()
         if not response_text:
             return []
+        # A stream cut off mid-answer is still parsed, but never cached
+        if stream.completed:
+            self._cache_put(cache_key, response_text)
 
-        # Parse the response to extract tasks
-        tasks = self._parse_response(
-            response_text,
-            assignee,
-            parent_work_item_id,
-            starting_work_item_id,
-        )
-        
-        return tasks
+        return parser.finish()
     
-    def _create_prompt(self, requirements: str, constraints: str, existing_tasks: List[Dict] = None) -> str:
-        """Create a detailed prompt for task generation"""
-        
-        existing_tasks_text = ""
-        if existing_tasks:
-            existing_tasks_text = "\n\nExisting tasks already created:\n"
-            for i, task in enumerate(existing_tasks, 1):
-                existing_tasks_text += f"{i}. {task.get('title', 'Untitled Task')}\n"
-        
-        prompt = f"""
-You are a project manager breaking down software development requirements into specific, actionable tasks.
+    def generate_tasks_batch(self, jobs: List[Dict[str, Any]]) -> List[List[Dict]]:
+        """
+        Generate tasks for several projects, packing up to 8 into each LLM call.
 
-PROJECT REQUIREMENTS:
-{requirements}
+        Args:
+            jobs: One dict per project holding generate_tasks() keyword
+                  arguments (requirements, constraints, existing_tasks, ...)
 
-PROJECT CONSTRAINTS:
-{constraints}
+        Returns:
+            One task list per job, in the same order; a job the model did not
+            answer gets an empty list
+        """
+        results: List[List[Dict]] = []
+        for i in range(0, len(jobs), _MAX_BATCH_JOBS):
+            results.extend(self._generate_batch_chunk(jobs[i : i + _MAX_BATCH_JOBS]))
+        return results
 
-{existing_tasks_text}
+    def _generate_batch_chunk(self, jobs: List[Dict[str, Any]]) -> List[List[Dict]]:
+        """Run one multi-job LLM call and split the answer back per job."""
+        sections = "".join(
+            f"\n===JOB {n}===\n"
+            + self._project_sections(job["requirements"], job["constraints"], job.get("existing_tasks"))
+            for n, job in enumerate(jobs, 1)
+        )
+        prompt = f"""{_TASK_PROMPT_PREAMBLE}
+The input below contains {len(jobs)} separate projects, each introduced by a line of the form ===JOB n===.
+Answer for each project in turn, starting each answer with its own ===JOB n=== line.
+{sections}"""
+        # Style examples are retrieved for every project in the prompt, not just the first
+        query_text = "\n".join(job["requirements"] for job in jobs)
+        prompt = _inject_style(prompt, context_type="task", query_text=query_text)
 
-Based on the requirements and constraints above, generate a comprehensive list of remaining tasks needed to complete the project. 
+        cache_key = self._cache_key(prompt)
+        response_text = self._cache_get(cache_key)
+        if response_text is None:
+            from backend.llm.base import LLMOptions
+            from backend.config import http_timeout_long
+            response_text = self._get_provider().generate(
+                prompt=prompt,
+                options=LLMOptions(temperature=0.3, max_tokens=1000 * len(jobs), keep_alive=_KEEP_ALIVE),
+                timeout=http_timeout_long(),
+            )
+            if not response_text:
+                return [[] for _ in jobs]
+            self._cache_put(cache_key, response_text)
 
-For each task, provide:
-1. A clear, specific title that describes what needs to be done
-2. A brief description of the task (1-2 sentences)
-3. The category/component it belongs to (e.g., "User Input Parsing", "Query Validation", etc.)
+        # re.split with one group yields [preamble, n1, body1, n2, body2, ...]
+        parts = _JOB_MARKER_RE.split(response_text)
+        answers = {int(num): body for num, body in zip(parts[1::2], parts[2::2])}
+        if not answers and len(jobs) == 1:
+            answers = {1: response_text}
 
-Format your response as a structured list where each task is clearly numbered and contains:
-- Title: [Clear, actionable task title]
-- Description: [Brief description of what the task involves]
-- Category: [Which component/phase this belongs to]
+        results: List[List[Dict]] = []
+        for n, job in enumerate(jobs, 1):
+            assignee, parent_id, starting_id = self._resolve_defaults(
+                job.get("assignee"), job.get("parent_work_item_id"), job.get("starting_work_item_id")
+            )
+            results.append(self._parse_response(
+                answers.get(n, ""), assignee, parent_id, starting_id, _title_keys(job.get("existing_tasks"))
+            ))
+        return results
 
-Focus on:
-- Breaking down complex processes into manageable tasks
-- Ensuring logical sequence and dependencies
-- Including error handling, testing, and monitoring tasks
-- Covering all aspects mentioned in the requirements
-- Not duplicating existing tasks
+    @staticmethod
+    def _resolve_defaults(
+        assignee: Optional[str],
+        parent_work_item_id: Optional[str],
+        starting_work_item_id: Optional[int],
+    ):
+        """Fill unset assignee / parent / starting ID from config."""
+        defaults = _get_task_defaults()
+        return (
+            assignee or defaults["assignee"],
+            parent_work_item_id or defaults["parent_id"],
+            starting_work_item_id if starting_work_item_id is not None else defaults["starting_id"],
+        )
 
-Generate tasks that are specific, measurable, and implementable.
-"""
-        prompt = _inject_style(prompt, context_type="task")
+    def _cache_key(self, prompt: str) -> str:
+        """Hash the rendered prompt together with the provider and model that answer it."""
+        provider = self._get_provider()
+        primary = getattr(provider, "primary", provider)
+        ident = f"{getattr(primary, 'provider_name', '')}|{getattr(primary, 'model_name', '')}"
+        return hashlib.sha256(f"{ident}|{prompt}".encode()).hexdigest()
+
+    def _cache_path(self, key: str) -> Path:
+        if self._cache_dir is None:
+            self._cache_dir = _default_cache_dir()
+        return self._cache_dir / f"{key}.json"
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Return a cached response, or None on miss or unreadable entry."""
+        path = self._cache_path(key)
+        try:
+            with path.open() as f:
+                text = json.load(f).get("response")
+            path.touch()  # keep recently used entries out of eviction
+            return text or None
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _cache_put(self, key: str, response_text: str) -> None:
+        """Store a response and evict the least recently used entries past the cap."""
+        path = self._cache_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("w") as f:
+                json.dump({"response": response_text}, f)
+            entries = sorted(path.parent.glob("*.json"), key=lambda p: p.stat().st_mtime)
+            for stale in entries[:-_CACHE_MAX_ENTRIES]:
+                stale.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def _create_prompt(self, requirements: str, constraints: str, existing_tasks: List[Dict] = None) -> str:
+        """Create a detailed prompt for task generation"""
+        # Static instructions first, project-specific content last
+        prompt = _TASK_PROMPT_PREAMBLE + "\n" + self._project_sections(requirements, constraints, existing_tasks)
+        # Retrieve style examples by the requirements, not the (constant) preamble
+        prompt = _inject_style(prompt, context_type="task", query_text=requirements)
         return prompt
+
+    @staticmethod
+    def _project_sections(requirements: str, constraints: str, existing_tasks: List[Dict] = None) -> str:
+        """Render the project-specific part of a task-generation prompt."""
+        existing_tasks_text = ""
+        if existing_tasks:
+            existing_tasks_text = "\nExisting tasks already created:\n" + "".join(
+                f"{i}. {task.get('title', 'Untitled Task')}\n"
+                for i, task in enumerate(existing_tasks, 1)
+            )
+
+        return f"""PROJECT REQUIREMENTS:
+{requirements}
+
+PROJECT CONSTRAINTS:
+{constraints}
+{existing_tasks_text}"""
     
-    def _parse_response(self, response_text: str, assignee: str, parent_work_item_id: str, starting_id: int) -> List[Dict]:
-        """Parse the LLM response and create structured task dictionaries"""
-        
-        tasks = []
-        current_id = starting_id
-        
-        # Split response into lines and process
-        lines = response_text.split('\n')
-        current_task = {}
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Look for task titles (usually numbered or with bullet points)
-            if re.match(r'^\d+\.', line) or line.startswith('- ') or line.startswith('* '):
-                # If we have a previous task, save it
-                if current_task.get('title'):
-                    tasks.append(self._create_task_dict(current_task, assignee, parent_work_item_id, current_id))
-                    current_id += 1
-                
-                # Start new task
-                current_task = {'title': re.sub(r'^\d+\.\s*|\-\s*|\*\s*', '', line)}
-                
-            # Look for title/description patterns
-            elif line.lower().startswith('title:'):
-                current_task['title'] = line.split(':', 1)[1].strip()
-            elif line.lower().startswith('description:'):
-                current_task['description'] = line.split(':', 1)[1].strip()
-            elif line.lower().startswith('category:'):
-                current_task['category'] = line.split(':', 1)[1].strip()
-            elif current_task.get('title') and not current_task.get('description'):
-                # If we have a title but no description, this might be the description
-                if len(line) > 20:  # Reasonable description length
-                    current_task['description'] = line
-        
-        # Don't forget the last task
-        if current_task.get('title'):
-            tasks.append(self._create_task_dict(current_task, assignee, parent_work_item_id, current_id))
-        
-        return tasks
+    def _parse_response(
+        self,
+        response_text: str,
+        assignee: str,
+        parent_work_item_id: str,
+        starting_id: int,
+        skip_titles: frozenset = frozenset(),
+    ) -> List[Dict]:
+        """Parse the LLM response and create structured task dictionaries.
+
+        Tasks whose normalized title is in *skip_titles* are left out.
+        """
+        parser = _TaskLineParser(
+            lambda task_data, work_item_id: self._create_task_dict(
+                task_data, assignee, parent_work_item_id, work_item_id
+            ),
+            starting_id,
+            skip_titles,
+        )
+        for line in response_text.split('\n'):
+            parser.feed(line)
+        return parser.finish()
     
     def _create_task_dict(self, task_data: Dict, assignee: str, parent_work_item_id: str, work_item_id: int) -> Dict:
         """Create a structured task dictionary matching the required format"""
@@ -212,8 +461,13 @@ Generate tasks that are specific, measurable, and implementable.
     
     def export_to_csv(self, tasks: List[Dict], filename: str = "generated_tasks.csv"):
         """Export tasks to CSV file"""
-        df = pd.DataFrame(tasks)
-        df.to_csv(filename, index=False)
+        # Stream rows straight to disk rather than materialising a DataFrame;
+        # columns are the union of task keys in first-seen order (as pandas would)
+        fieldnames = list(dict.fromkeys(key for task in tasks for key in task))
+        with open(filename, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, restval='', lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(tasks)
         print(f"Tasks exported to {filename}")
 
     def import_from_csv(
@@ -237,37 +491,56 @@ Generate tasks that are specific, measurable, and implementable.
         Returns:
             List of task dictionaries compatible with generate_tasks output format
         """
-        df = pd.read_csv(filename)
+        # Every field ends up as a string, so skip the parser's numeric inference
+        df = pd.read_csv(filename, dtype=str)
         if title_col not in df.columns:
             raise ValueError(f"CSV must have '{title_col}' column. Found: {list(df.columns)}")
-        tasks = []
         defaults = _get_task_defaults()
-        for idx, row in df.iterrows():
-            task = {
+
+        # Convert whole columns at once instead of walking rows with iterrows();
+        # empty cells take the same default as a missing column
+        def _column(col: Optional[str], default: str) -> List[str]:
+            if col and col in df.columns:
+                return df[col].fillna(default).astype(str).tolist()
+            return [default] * len(df)
+
+        tasks = [
+            {
                 "Work Item Type": "Task",
-                "Title": str(row[title_col]),
-                "Assigned To": str(row.get(assignee_col, defaults.get("assignee", ""))) if assignee_col and assignee_col in df.columns else defaults.get("assignee", ""),
-                "State": str(row.get(state_col, "New")) if state_col and state_col in df.columns else "New",
+                "Title": title,
+                "Assigned To": assignee,
+                "State": state,
                 "Tags": "Imported",
                 "Work Item ID": str(1000 + idx),
-                "Description": str(row.get(description_col, "")) if description_col and description_col in df.columns else "",
+                "Description": description,
                 "Category": "import",
             }
-            tasks.append(task)
+            for idx, title, assignee, state, description in zip(
+                df.index,
+                _column(title_col, ""),
+                _column(assignee_col, defaults.get("assignee", "")),
+                _column(state_col, "New"),
+                _column(description_col, ""),
+            )
+        ]
         print(f"Imported {len(tasks)} tasks from {filename}")
         return tasks
     
     def export_to_markdown(self, tasks: List[Dict], filename: str = "generated_tasks.md"):
         """Export tasks to markdown table format"""
-        df = pd.DataFrame(tasks)
         # Select only the main columns for the table
         table_columns = ['Work Item Type', 'Title', 'Assigned To', 'State', 'Tags', 'Work Item ID', 'DevOps URL', 'Iteration Path', 'Parent Work Item ID']
-        table_df = df[table_columns]
-        
-        markdown_content = table_df.to_markdown(index=False)
-        
+
+        # Plain string join — avoids DataFrame.to_markdown's per-cell tabulate formatting
+        header = "| " + " | ".join(table_columns) + " |\n"
+        sep = "|" + "|".join(["---"] * len(table_columns)) + "|\n"
+        body = "".join(
+            "| " + " | ".join(str(task.get(col, '')) for col in table_columns) + " |\n"
+            for task in tasks
+        )
+
         with open(filename, 'w') as f:
-            f.write(markdown_content)
+            f.write(header + sep + body)
         print(f"Tasks exported to {filename}")
     
     def print_tasks(self, tasks: List[Dict]):
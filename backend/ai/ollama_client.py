@@ -7,13 +7,16 @@ commit_message_enhancer, sentiment_analysis, personalized_ai, and create_tasks.
 """
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Generator, Optional
 
 logger = logging.getLogger(__name__)
 
 # Lazy import to avoid loading config at module level before env is loaded
 _config = None
 
+# Shared requests.Session so streaming calls reuse the keep-alive connection
+_session = None
+
 
 def _get_config():
     global _config
@@ -45,6 +48,14 @@ def get_ollama_model(model_override: Optional[str] = None) -> str:
     return _get_config()["model"]
 
 
+def _get_session():
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
+
 def is_available(host: Optional[str] = None) -> bool:
     """Check if Ollama is available and responsive."""
     import urllib.request
@@ -64,7 +75,8 @@ def generate(
     host: Optional[str] = None,
     stream: bool = False,
     options: Optional[Dict[str, Any]] = None,
-    timeout: int = 30
+    timeout: int = 30,
+    keep_alive: Optional[str] = None
 ) -> Optional[str]:
     """
     Call Ollama generate API.
@@ -76,6 +88,8 @@ def generate(
         stream: Whether to stream response
         options: Additional options (temperature, num_predict, etc.)
         timeout: Request timeout in seconds
+        keep_alive: How long the model stays loaded afterwards (e.g. "10m");
+            server default if None
 
     Returns:
         Response text or None on failure
@@ -92,6 +106,8 @@ def generate(
         "stream": stream,
         "options": options or {"temperature": 0.3, "num_predict": 300}
     }
+    if keep_alive:
+        payload["keep_alive"] = keep_alive
 
     try:
         data = json.dumps(payload).encode()
@@ -145,3 +161,56 @@ def generate_with_requests(
     except Exception as e:
         logger.warning(f"Ollama generate failed: {e}")
         return None
+
+
+def generate_stream(
+    prompt: str,
+    model: Optional[str] = None,
+    host: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    timeout: int = 30,
+    keep_alive: Optional[str] = None
+) -> Generator[str, None, bool]:
+    """
+    Call Ollama generate API with streaming, yielding text chunks as they arrive.
+
+    Ollama streams newline-delimited JSON objects; each carries a piece of the
+    response until one arrives with ``done: true``. Returns True only once
+    that final object is seen; on failure it stops yielding and returns False.
+    """
+    import json
+
+    h = host or get_ollama_host()
+    m = get_ollama_model(model)
+
+    payload = {
+        "model": m,
+        "prompt": prompt,
+        "stream": True,
+        "options": options or {"temperature": 0.3, "num_predict": 300}
+    }
+    if keep_alive:
+        payload["keep_alive"] = keep_alive
+
+    try:
+        with _get_session().post(
+            f"{h}/api/generate",
+            json=payload,
+            stream=True,
+            timeout=timeout
+        ) as response:
+            if response.status_code != 200:
+                logger.warning(f"Ollama stream returned {response.status_code}")
+                return False
+            for raw in response.iter_lines():
+                if not raw:
+                    continue
+                chunk = json.loads(raw)
+                text = chunk.get("response", "")
+                if text:
+                    yield text
+                if chunk.get("done"):
+                    return True
+    except Exception as e:
+        logger.warning(f"Ollama stream failed: {e}")
+    return False
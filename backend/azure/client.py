@@ -11,15 +11,19 @@ Configuration (via .env):
     AZURE_API_VERSION    = 7.1
 """
 
+import asyncio
 import logging
 import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
+from urllib.parse import quote
 
 import aiohttp
 
+from backend.utils import json_utils
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,6 +76,19 @@ class AzureWorkItem:
     due_date: Optional[str] = None
 
 
+# JSON Patch field paths for work item creates, in the order they are emitted.
+# Title is always sent; the rest only when a value is given.
+_CREATE_FIELD_PATHS = (
+    "/fields/System.Title",
+    "/fields/System.Description",
+    "/fields/System.AreaPath",
+    "/fields/System.IterationPath",
+    "/fields/System.Tags",
+    "/fields/System.AssignedTo",
+    "/fields/Microsoft.VSTS.Scheduling.StoryPoints",
+)
+
+
 # ---------------------------------------------------------------------------
 # Client
 # ---------------------------------------------------------------------------
@@ -80,6 +97,8 @@ class AzureDevOpsClient:
     """Async Azure DevOps REST API client."""
 
     BASE_URL = "https://dev.azure.com"
+    # Keep-alive pool shared by concurrent chunk requests (batch GET/$batch)
+    MAX_CONNECTIONS = 32
 
     def __init__(
         self,
@@ -103,7 +122,13 @@ class AzureDevOpsClient:
         if self._session is None or self._session.closed:
             auth = aiohttp.BasicAuth(login="", password=self._pat)
             timeout = aiohttp.ClientTimeout(total=self._timeout_secs)
-            self._session = aiohttp.ClientSession(auth=auth, timeout=timeout)
+            connector = aiohttp.TCPConnector(limit=self.MAX_CONNECTIONS, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                auth=auth,
+                timeout=timeout,
+                connector=connector,
+                json_serialize=json_utils.dumps,
+            )
         return self._session
 
     async def close(self) -> None:
@@ -134,7 +159,7 @@ class AzureDevOpsClient:
         try:
             async with session.get(url, params=self._api_params(params)) as resp:
                 if resp.status == 200:
-                    return await resp.json()
+                    return await resp.json(loads=json_utils.loads)
                 logger.warning(f"GET {url} returned {resp.status}: {await resp.text()}")
                 return None
         except Exception as e:
@@ -160,7 +185,7 @@ class AzureDevOpsClient:
                 headers=headers or None,
             ) as resp:
                 if resp.status in (200, 201):
-                    return await resp.json()
+                    return await resp.json(loads=json_utils.loads)
                 logger.warning(f"POST {url} returned {resp.status}: {await resp.text()}")
                 return None
         except Exception as e:
@@ -178,7 +203,7 @@ class AzureDevOpsClient:
                 headers=headers,
             ) as resp:
                 if resp.status == 200:
-                    return await resp.json()
+                    return await resp.json(loads=json_utils.loads)
                 logger.warning(f"PATCH {url} returned {resp.status}: {await resp.text()}")
                 return None
         except Exception as e:
@@ -294,17 +319,20 @@ class AzureDevOpsClient:
 
     async def get_work_items_batch(self, ids: List[int]) -> List[AzureWorkItem]:
         """Fetch multiple work items by ID (batches of 200)."""
-        results: List[AzureWorkItem] = []
         batch_size = 200  # Azure DevOps API limit
+        url = self._org_url("_apis/wit/workitems")
 
-        for i in range(0, len(ids), batch_size):
-            batch = ids[i : i + batch_size]
-            csv_ids = ",".join(str(wid) for wid in batch)
-            url = self._org_url("_apis/wit/workitems")
-            data = await self._get(
-                url,
-                params={"ids": csv_ids, "$expand": "relations"},
-            )
+        # Chunks are independent — fetch them concurrently over the pooled session
+        pages = await asyncio.gather(*(
+            self._get(url, params={
+                "ids": ",".join(str(wid) for wid in ids[i : i + batch_size]),
+                "$expand": "relations",
+            })
+            for i in range(0, len(ids), batch_size)
+        ))
+
+        results: List[AzureWorkItem] = []
+        for data in pages:
             if data:
                 for item_data in data.get("value", []):
                     results.append(self._parse_work_item(item_data))
@@ -350,42 +378,68 @@ class AzureDevOpsClient:
 
     # -- write operations ---------------------------------------------------
 
-    async def create_work_item(
+    def _create_operations(
         self,
         title: str,
         description: str = "",
-        work_item_type: str = "Task",
-        parent_id: Optional[int] = None,
         area_path: Optional[str] = None,
         iteration_path: Optional[str] = None,
         tags: Optional[List[str]] = None,
         assigned_to: Optional[str] = None,
-    ) -> Optional[AzureWorkItem]:
-        """Create a new work item."""
+        parent_id: Optional[int] = None,
+        story_points: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Build the JSON Patch document for a work item create.
+
+        Field paths come from the fixed _CREATE_FIELD_PATHS layout; only the
+        values change per item, and unset fields are left out.
+        """
+        values = (
+            title,
+            description or None,
+            area_path or None,
+            iteration_path or None,
+            "; ".join(tags) if tags else None,
+            assigned_to or None,
+            story_points,
+        )
         operations: List[Dict[str, Any]] = [
-            {"op": "add", "path": "/fields/System.Title", "value": title},
+            {"op": "add", "path": path, "value": value}
+            for path, value in zip(_CREATE_FIELD_PATHS, values)
+            if value is not None
         ]
-
-        if description:
-            operations.append({"op": "add", "path": "/fields/System.Description", "value": description})
-        if area_path:
-            operations.append({"op": "add", "path": "/fields/System.AreaPath", "value": area_path})
-        if iteration_path:
-            operations.append({"op": "add", "path": "/fields/System.IterationPath", "value": iteration_path})
-        if tags:
-            operations.append({"op": "add", "path": "/fields/System.Tags", "value": "; ".join(tags)})
-        if assigned_to:
-            operations.append({"op": "add", "path": "/fields/System.AssignedTo", "value": assigned_to})
         if parent_id is not None:
-            parent_url = f"{self.BASE_URL}/{self._org}/_apis/wit/workitems/{parent_id}"
             operations.append({
                 "op": "add",
                 "path": "/relations/-",
                 "value": {
                     "rel": "System.LinkTypes.Hierarchy-Reverse",
-                    "url": parent_url,
+                    "url": f"{self.BASE_URL}/{self._org}/_apis/wit/workitems/{parent_id}",
                 },
             })
+        return operations
+
+    async def create_work_item(
+        self,
+        title: str,
+        description: str = "",
+        work_item_type: str = "Task",
+        parent_id: Optional[int] = None,
+        area_path: Optional[str] = None,
+        iteration_path: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        assigned_to: Optional[str] = None,
+    ) -> Optional[AzureWorkItem]:
+        """Create a new work item."""
+        operations = self._create_operations(
+            title,
+            description=description,
+            area_path=area_path,
+            iteration_path=iteration_path,
+            tags=tags,
+            assigned_to=assigned_to,
+            parent_id=parent_id,
+        )
 
         safe_type = work_item_type.replace(" ", "%20")
         url = self._project_url(f"_apis/wit/workitems/${safe_type}")
@@ -537,35 +591,16 @@ class AzureDevOpsClient:
         assigned_to: Optional[str] = None,
     ) -> Optional[AzureWorkItem]:
         """Create a work item with optional story points field."""
-        operations: List[Dict[str, Any]] = [
-            {"op": "add", "path": "/fields/System.Title", "value": title},
-        ]
-        if description:
-            operations.append({"op": "add", "path": "/fields/System.Description", "value": description})
-        if area_path:
-            operations.append({"op": "add", "path": "/fields/System.AreaPath", "value": area_path})
-        if iteration_path:
-            operations.append({"op": "add", "path": "/fields/System.IterationPath", "value": iteration_path})
-        if tags:
-            operations.append({"op": "add", "path": "/fields/System.Tags", "value": "; ".join(tags)})
-        if assigned_to:
-            operations.append({"op": "add", "path": "/fields/System.AssignedTo", "value": assigned_to})
-        if story_points is not None:
-            operations.append({
-                "op": "add",
-                "path": "/fields/Microsoft.VSTS.Scheduling.StoryPoints",
-                "value": story_points,
-            })
-        if parent_id is not None:
-            parent_url = f"{self.BASE_URL}/{self._org}/_apis/wit/workitems/{parent_id}"
-            operations.append({
-                "op": "add",
-                "path": "/relations/-",
-                "value": {
-                    "rel": "System.LinkTypes.Hierarchy-Reverse",
-                    "url": parent_url,
-                },
-            })
+        operations = self._create_operations(
+            title,
+            description=description,
+            area_path=area_path,
+            iteration_path=iteration_path,
+            tags=tags,
+            assigned_to=assigned_to,
+            parent_id=parent_id,
+            story_points=story_points,
+        )
 
         safe_type = work_item_type.replace(" ", "%20")
         url = self._project_url(f"_apis/wit/workitems/${safe_type}")
@@ -575,3 +610,60 @@ class AzureDevOpsClient:
             logger.info(f"Created work item #{wi.id} ({story_points} pts): {title}")
             return wi
         return None
+
+    async def create_work_items_batch(
+        self,
+        items: List[Dict[str, Any]],
+        work_item_type: str = "Task",
+    ) -> List[Optional[AzureWorkItem]]:
+        """Create many work items with one request per 200 items via ``_apis/wit/$batch``.
+
+        Each entry in *items* takes the keyword arguments of
+        create_work_item_with_story_points() (title, description, parent_id, …).
+        Returns one result per input item, in order; failed creates are None.
+        """
+        batch_size = 200  # Azure DevOps API limit
+
+        # Sub-request URIs are sent as-is, so encode both path segments
+        safe_project = quote(self._project, safe="")
+        safe_type = quote(work_item_type, safe="")
+        uri = f"/{safe_project}/_apis/wit/workitems/${safe_type}?api-version={self._api_version}"
+        url = self._org_url("_apis/wit/$batch")
+
+        chunks = [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+        pages = await asyncio.gather(*(
+            self._post(
+                url,
+                json_body=[
+                    {
+                        "method": "PATCH",
+                        "uri": uri,
+                        "headers": {"Content-Type": "application/json-patch+json"},
+                        "body": self._create_operations(**item),
+                    }
+                    for item in chunk
+                ],
+            )
+            for chunk in chunks
+        ))
+
+        results: List[Optional[AzureWorkItem]] = []
+        for chunk, data in zip(chunks, pages):
+            responses = data.get("value", []) if data else []
+            for j, item in enumerate(chunk):
+                sub = responses[j] if j < len(responses) else None
+                if not sub or sub.get("code") != 200:
+                    logger.warning(
+                        f"Batch create failed for '{item.get('title', '')}': "
+                        f"{sub.get('body') if sub else 'no response'}"
+                    )
+                    results.append(None)
+                    continue
+                body = sub.get("body", {})
+                if isinstance(body, str):
+                    body = json_utils.loads(body)
+                results.append(self._parse_work_item(body))
+
+        created = sum(1 for wi in results if wi)
+        logger.info(f"Batch-created {created}/{len(items)} {work_item_type} work items")
+        return results
@@ -172,6 +172,11 @@ def ipc_port() -> str:
     return get("IPC_PORT", "35893")
 
 
+def ipc_length_prefix() -> bool:
+    """Frame IPC messages with a 4-byte length prefix instead of a newline."""
+    return get_bool("IPC_LENGTH_PREFIX", False)
+
+
 # --- Azure DevOps (supports both AZURE_DEVOPS_PAT and AZURE_API_KEY for compatibility) ---
 def azure_pat() -> str:
     """Azure DevOps Personal Access Token."""
@@ -409,15 +409,7 @@ Keep it professional and constructive. Respond ONLY with valid JSON."""
         if base.activities:
             lines.append("  ┌─ ACTIVITIES ────────────────────────────────────────────────────────┐")
             
-            # Group by project
-            by_project: Dict[str, List[ActivitySummary]] = {}
-            for act in base.activities:
-                proj = act.project or "Other"
-                if proj not in by_project:
-                    by_project[proj] = []
-                by_project[proj].append(act)
-            
-            for project, activities in sorted(by_project.items()):
+            for project, activities in sorted(base.by_project.items()):
                 lines.append("  │")
                 lines.append(f"  │  📂 {project}")
                 for act in activities:
@@ -555,14 +547,7 @@ Keep it professional and constructive. Respond ONLY with valid JSON."""
             lines.append("## Activities")
             lines.append("")
             
-            by_project: Dict[str, List[ActivitySummary]] = {}
-            for act in base.activities:
-                proj = act.project or "Other"
-                if proj not in by_project:
-                    by_project[proj] = []
-                by_project[proj].append(act)
-            
-            for project, activities in sorted(by_project.items()):
+            for project, activities in sorted(base.by_project.items()):
                 lines.append(f"### {project}")
                 for act in activities:
                     status = {"completed": "✅", "in_progress": "🔄", "blocked": "🚫"}.get(act.status, "•")
@@ -8,18 +8,56 @@ All data collection requires explicit user consent and happens locally.
 """
 
 import os
+import re
+import json
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict
+from itertools import pairwise
+from typing import Dict, Iterator, List, Optional
 import sys
 
 # Add backend to path
 sys.path.insert(0, os.path.dirname(__file__))
 
 from personalized_ai import PersonalizedAI
+from backend.utils.text_utils import html_to_text, parse_iso_timestamp, strip_quoted_lines
 
 logger = logging.getLogger(__name__)
 
+# Start of the first quoted-history line in a reply: "> ...",
+# "-----Original Message-----", "... wrote:" or "On <date>, <name> wrote".
+# Only anchored alternatives and single-line lookaheads, so matching stays
+# linear in the body length.
+_REPLY_MARKER_RE = re.compile(
+    r'^(?:[^\S\n]*(?:>|-----Original Message-----)'
+    r'|(?=[^\n]*wrote:)'
+    r'|(?=[^\n]*On)(?=[^\n]*wrote))',
+    re.MULTILINE,
+)
+# "RE:", "Re:", "re :" ... at the start of a subject
+_REPLY_RE = re.compile(r'^\s*re\s*:', re.IGNORECASE)
+
+# Collected samples are handed to PersonalizedAI in bulk writes of this size
+_SAMPLE_FLUSH_SIZE = 1000
+
+# Azure DevOps calls retry throttling/transient errors this many times,
+# waiting for Retry-After when the server sends it and backing off otherwise
+_HTTP_RETRIES = 5
+_HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _email_keys(*emails: Optional[str]) -> frozenset:
+    """Lower-cased, non-empty addresses for case-insensitive sender checks"""
+    return frozenset(e.strip().lower() for e in emails if e and e.strip())
+
+
+def _flush_samples(ai: PersonalizedAI, pending: List[Dict], min_size: int = 1) -> None:
+    """Write buffered samples in one batch once at least min_size are queued"""
+    if len(pending) >= min_size:
+        ai.add_communication_samples(pending.copy())
+        pending.clear()
+
 
 class TeamsDataCollector:
     """Collect communication data from MS Teams"""
@@ -27,6 +65,7 @@ class TeamsDataCollector:
     def __init__(self, personalized_ai: PersonalizedAI):
         self.ai = personalized_ai
         self.graph_client = None
+        self._user_emails = _email_keys(personalized_ai.user_email)
     
     def initialize(self, graph_client):
         """Initialize with Microsoft Graph client"""
@@ -53,12 +92,20 @@ class TeamsDataCollector:
         
         logger.info(f"Collecting Teams chat history for last {days} days...")
         samples_collected = 0
+        pending: List[Dict] = []
         
         try:
             # Get all chats
             chats = self.graph_client.get_teams_chats()
             
-            cutoff_date = datetime.now() - timedelta(days=days)
+            # Compared as POSIX seconds: Graph timestamps are UTC-aware, while a
+            # fallback parse (or an offset-less string) is naive local time
+            cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp()
+            
+            # Bound once; looked up for every message pair below
+            is_user = self._is_user_message
+            extract = self._extract_message_content
+            parse_ts = self._parse_timestamp
             
             for chat in chats:
                 chat_id = chat.get('id')
@@ -66,31 +113,27 @@ class TeamsDataCollector:
                 # Get messages from this chat
                 messages = self._get_chat_messages(chat_id)
                 
-                for i in range(1, len(messages)):
-                    prev_msg = messages[i-1]
-                    current_msg = messages[i]
-                    
+                for prev_msg, current_msg in pairwise(messages):
                     # Check if current message is from user (response)
-                    if self._is_user_message(current_msg):
-                        # Previous message is the trigger
-                        trigger = self._extract_message_content(prev_msg)
-                        response = self._extract_message_content(current_msg)
-                        
-                        msg_time = self._parse_timestamp(current_msg.get('createdDateTime'))
+                    if is_user(current_msg):
+                        msg_time = parse_ts(current_msg.get('createdDateTime'))
                         
-                        if msg_time >= cutoff_date:
-                            self.ai.add_communication_sample(
+                        # Only strip HTML for messages inside the window
+                        if msg_time.timestamp() >= cutoff_ts:
+                            # Previous message is the trigger
+                            pending.append(dict(
                                 source='teams',
                                 context_type='chat',
-                                trigger=trigger,
-                                response=response,
+                                trigger=extract(prev_msg),
+                                response=extract(current_msg),
                                 metadata={
                                     'chat_id': chat_id,
                                     'timestamp': msg_time.isoformat(),
                                     'chat_type': chat.get('chatType', 'unknown')
                                 }
-                            )
+                            ))
                             samples_collected += 1
+                            _flush_samples(self.ai, pending, _SAMPLE_FLUSH_SIZE)
             
             logger.info(f"Collected {samples_collected} Teams chat samples")
             return samples_collected
@@ -98,27 +141,26 @@ class TeamsDataCollector:
         except Exception as e:
             logger.error(f"Error collecting Teams data: {e}")
             return samples_collected
+        finally:
+            _flush_samples(self.ai, pending)
     
-    def _get_chat_messages(self, chat_id: str) -> List[Dict]:
-        """Get messages from a specific chat"""
+    def _get_chat_messages(self, chat_id: str) -> Iterator[Dict]:
+        """Yield messages from a specific chat, oldest first"""
         # Implementation depends on graph client
         # This is a placeholder
         try:
-            # Would call something like:
-            # return self.graph_client.get_chat_messages(chat_id)
-            return []
+            # Would stream something like:
+            # yield from self.graph_client.iter_chat_messages(chat_id)
+            yield from ()
         except Exception as e:
             logger.error(f"Error getting chat messages: {e}")
-            return []
     
     def _is_user_message(self, message: Dict) -> bool:
         """Check if message is from the user"""
         if not message:
             return False
-        from_field = message.get('from') or {}
-        from_user = from_field.get('user') or {}
-        user_email = from_user.get('userPrincipalName', '')
-        return user_email == self.ai.user_email
+        from_user = (message.get('from') or {}).get('user') or {}
+        return (from_user.get('userPrincipalName') or '').lower() in self._user_emails
     
     def _extract_message_content(self, message: Dict) -> str:
         """Extract clean message content"""
@@ -128,17 +170,11 @@ class TeamsDataCollector:
         content = body.get('content', '')
         
         # Remove HTML tags if present
-        import re
-        content = re.sub(r'<[^>]+>', '', content)
+        content = html_to_text(content)
         
         return content.strip()
     
-    def _parse_timestamp(self, timestamp_str: str) -> datetime:
-        """Parse ISO timestamp"""
-        try:
-            return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        except:
-            return datetime.now()
+    _parse_timestamp = staticmethod(parse_iso_timestamp)
 
 
 class AzureDevOpsDataCollector:
@@ -147,6 +183,11 @@ class AzureDevOpsDataCollector:
     def __init__(self, personalized_ai: PersonalizedAI):
         self.ai = personalized_ai
         self.azure_client = None
+        self._user_emails = _email_keys(personalized_ai.user_email)
+        # Per-run lookup caches, reset by collect_comments_history()
+        self._projects: Optional[List[str]] = None
+        self._comments_cache: Dict[int, List[Dict]] = {}
+        self._session = None  # requests.Session, opened lazily by _http()
     
     def initialize(self, azure_client):
         """Initialize with Azure DevOps client"""
@@ -169,6 +210,9 @@ class AzureDevOpsDataCollector:
         
         logger.info(f"Collecting Azure DevOps comments for last {days} days...")
         samples_collected = 0
+        pending: List[Dict] = []
+        self._projects = None
+        self._comments_cache.clear()
         
         try:
             # Get work items updated in the last N days
@@ -178,32 +222,31 @@ class AzureDevOpsDataCollector:
             # Placeholder for actual implementation
             work_items = self._get_recent_work_items(days)
             
+            # Bound once; looked up for every comment pair below
+            is_user = self._is_user_comment
+            extract = self._extract_comment_text
+            
             for work_item in work_items:
                 work_item_id = work_item.get('id')
                 
                 # Get comments/discussions
-                comments = self._get_work_item_comments(work_item_id)
+                comments = self._get_work_item_comments(work_item_id, work_item.get('project'))
                 
-                for i in range(1, len(comments)):
-                    prev_comment = comments[i-1]
-                    current_comment = comments[i]
-                    
+                for prev_comment, current_comment in pairwise(comments):
                     # Check if current comment is from user
-                    if self._is_user_comment(current_comment):
-                        trigger = self._extract_comment_text(prev_comment)
-                        response = self._extract_comment_text(current_comment)
-                        
-                        self.ai.add_communication_sample(
+                    if is_user(current_comment):
+                        pending.append(dict(
                             source='azure_devops',
                             context_type='comment',
-                            trigger=trigger,
-                            response=response,
+                            trigger=extract(prev_comment),
+                            response=extract(current_comment),
                             metadata={
                                 'work_item_id': work_item_id,
                                 'work_item_type': work_item.get('type', 'unknown')
                             }
-                        )
+                        ))
                         samples_collected += 1
+                        _flush_samples(self.ai, pending, _SAMPLE_FLUSH_SIZE)
             
             logger.info(f"Collected {samples_collected} Azure DevOps comment samples")
             return samples_collected
@@ -211,6 +254,11 @@ class AzureDevOpsDataCollector:
         except Exception as e:
             logger.error(f"Error collecting Azure DevOps data: {e}")
             return samples_collected
+        finally:
+            _flush_samples(self.ai, pending)
+            if self._session is not None:
+                self._session.close()
+                self._session = None
     
     def _get_recent_work_items(self, days: int) -> List[Dict]:
         """Get recently updated work items from Azure DevOps"""
@@ -219,8 +267,6 @@ class AzureDevOpsDataCollector:
             return []
 
         try:
-            import requests
-            from requests.auth import HTTPBasicAuth
             from datetime import datetime, timedelta
 
             # Get Azure DevOps credentials from environment/config
@@ -253,18 +299,7 @@ class AzureDevOpsDataCollector:
 
             # Try to get projects first
             from backend.config import http_timeout_short
-            projects_url = f"{base_url}/_apis/projects?api-version=7.1"
-            projects_resp = requests.get(
-                projects_url,
-                auth=HTTPBasicAuth('', pat),
-                timeout=http_timeout_short()
-            )
-
-            if projects_resp.status_code != 200:
-                logger.warning(f"Could not fetch Azure DevOps projects: {projects_resp.status_code}")
-                return []
-
-            projects = projects_resp.json().get('value', [])
+            projects = self._get_projects(base_url, pat)
             if not projects:
                 logger.warning("No Azure DevOps projects found")
                 return []
@@ -272,13 +307,12 @@ class AzureDevOpsDataCollector:
             work_items = []
 
             # Query the first project for recent work items
-            project = projects[0]['name']
+            project = projects[0]
             wiql_url = f"{base_url}/{project}/_apis/wit/wiql?api-version=7.1"
 
-            wiql_resp = requests.post(
+            wiql_resp = self._http(pat).post(
                 wiql_url,
                 json=wiql_query,
-                auth=HTTPBasicAuth('', pat),
                 timeout=http_timeout_short()
             )
 
@@ -289,7 +323,8 @@ class AzureDevOpsDataCollector:
                     work_items.append({
                         'id': item.get('id'),
                         'url': item.get('url'),
-                        'type': 'work_item'
+                        'type': 'work_item',
+                        'project': project
                     })
 
                 logger.info(f"Found {len(work_items)} recently updated work items")
@@ -305,16 +340,56 @@ class AzureDevOpsDataCollector:
             logger.error(f"Error fetching Azure DevOps work items: {e}")
             return []
     
-    def _get_work_item_comments(self, work_item_id: int) -> List[Dict]:
+    def _http(self, pat: str):
+        """Keep-alive session reused by every Azure DevOps call in a collection run"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from requests.auth import HTTPBasicAuth
+            from urllib3.util.retry import Retry
+
+            retry = Retry(
+                total=_HTTP_RETRIES,
+                backoff_factor=0.5,
+                status_forcelist=_HTTP_RETRY_STATUSES,
+                allowed_methods=None,  # the only POST is a read-only WIQL query
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            self._session = requests.Session()
+            self._session.auth = HTTPBasicAuth('', pat)
+            self._session.mount('https://', HTTPAdapter(max_retries=retry))
+        return self._session
+
+    def _get_projects(self, base_url: str, pat: str) -> List[str]:
+        """Project names in the organization, fetched once per collection run"""
+        if self._projects is not None:
+            return self._projects
+
+        from backend.config import http_timeout_short
+
+        projects_resp = self._http(pat).get(
+            f"{base_url}/_apis/projects?api-version=7.1",
+            timeout=http_timeout_short()
+        )
+        if projects_resp.status_code != 200:
+            logger.warning(f"Could not fetch Azure DevOps projects: {projects_resp.status_code}")
+            return []
+
+        self._projects = [p['name'] for p in projects_resp.json().get('value', [])]
+        return self._projects
+
+    def _get_work_item_comments(self, work_item_id: int, project: Optional[str] = None) -> List[Dict]:
         """Get comments for a work item from Azure DevOps"""
         if not self.azure_client:
             logger.debug("Azure client not initialized")
             return []
 
-        try:
-            import requests
-            from requests.auth import HTTPBasicAuth
+        cached = self._comments_cache.get(work_item_id)
+        if cached is not None:
+            return cached
 
+        try:
             # Get Azure DevOps credentials
             from backend.config import azure_org, azure_pat
             org = azure_org()
@@ -327,31 +402,20 @@ class AzureDevOpsDataCollector:
             # Get projects to find which one contains this work item
             from backend.config import http_timeout_short
             base_url = f"https://dev.azure.com/{org}"
-            projects_url = f"{base_url}/_apis/projects?api-version=7.1"
-
-            projects_resp = requests.get(
-                projects_url,
-                auth=HTTPBasicAuth('', pat),
-                timeout=http_timeout_short()
-            )
-
-            if projects_resp.status_code != 200:
-                return []
-
-            projects = projects_resp.json().get('value', [])
+            projects = self._get_projects(base_url, pat)
+            if project in projects:
+                # The WIQL query already told us where it lives; try that first
+                projects = [project] + [p for p in projects if p != project]
 
             comments = []
 
             # Try each project to find the work item and its comments
-            for project in projects:
-                project_name = project['name']
-
+            for project_name in projects:
                 # Get comments for this work item
                 comments_url = f"{base_url}/{project_name}/_apis/wit/workItems/{work_item_id}/comments?api-version=7.1"
 
-                comments_resp = requests.get(
+                comments_resp = self._http(pat).get(
                     comments_url,
-                    auth=HTTPBasicAuth('', pat),
                     timeout=http_timeout_short()
                 )
 
@@ -373,6 +437,7 @@ class AzureDevOpsDataCollector:
                     logger.debug(f"Found {len(comments)} comments for work item {work_item_id}")
                     break  # Found the work item, no need to check other projects
 
+            self._comments_cache[work_item_id] = comments
             return comments
 
         except ImportError:
@@ -384,8 +449,8 @@ class AzureDevOpsDataCollector:
     
     def _is_user_comment(self, comment: Dict) -> bool:
         """Check if comment is from the user"""
-        author = comment.get('author', {})
-        return author.get('email', '') == self.ai.user_email
+        author = comment.get('author') or {}
+        return (author.get('email') or '').lower() in self._user_emails
     
     def _extract_comment_text(self, comment: Dict) -> str:
         """Extract clean comment text"""
@@ -420,37 +485,42 @@ class OutlookDataCollector:
         
         logger.info(f"Collecting Outlook sent emails for last {days} days...")
         samples_collected = 0
+        pending: List[Dict] = []
         
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
+            # Compared as POSIX seconds so aware and naive timestamps both work
+            cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp()
             
             # Get sent emails
             sent_emails = self._get_sent_emails(days)
             
+            # Bound once; looked up for every email below
+            is_reply = self._is_reply
+            parse_ts = self._parse_timestamp
+            
             for email in sent_emails:
                 email_id = email.get('id')
                 
                 # Check if this is a reply
-                if self._is_reply(email):
-                    # Get the original message being replied to
-                    trigger = self._get_original_message(email)
-                    response = self._extract_email_body(email)
-                    
-                    sent_time = self._parse_timestamp(email.get('sentDateTime'))
+                if is_reply(email):
+                    sent_time = parse_ts(email.get('sentDateTime'))
                     
-                    if sent_time >= cutoff_date:
-                        self.ai.add_communication_sample(
+                    # Only parse bodies of emails inside the window
+                    if sent_time.timestamp() >= cutoff_ts:
+                        pending.append(dict(
                             source='outlook',
                             context_type='email',
-                            trigger=trigger,
-                            response=response,
+                            # The original message being replied to
+                            trigger=self._get_original_message(email),
+                            response=self._extract_email_body(email),
                             metadata={
                                 'email_id': email_id,
                                 'subject': email.get('subject', ''),
                                 'timestamp': sent_time.isoformat()
                             }
-                        )
+                        ))
                         samples_collected += 1
+                        _flush_samples(self.ai, pending, _SAMPLE_FLUSH_SIZE)
             
             logger.info(f"Collected {samples_collected} Outlook email samples")
             return samples_collected
@@ -458,6 +528,8 @@ class OutlookDataCollector:
         except Exception as e:
             logger.error(f"Error collecting Outlook data: {e}")
             return samples_collected
+        finally:
+            _flush_samples(self.ai, pending)
     
     def _get_sent_emails(self, days: int) -> List[Dict]:
         """Get sent emails from Outlook using Microsoft Graph API"""
@@ -470,6 +542,7 @@ class OutlookDataCollector:
 
             sent_emails = []
             cutoff_date = datetime.now() - timedelta(days=days)
+            cutoff_ts = cutoff_date.timestamp()
 
             # Get messages from Sent folder
             # Note: Microsoft Graph API uses delta queries and filters
@@ -484,7 +557,7 @@ class OutlookDataCollector:
                         sent_time_str = message.get('sentDateTime')
                         if sent_time_str:
                             sent_time = self._parse_timestamp(sent_time_str)
-                            if sent_time >= cutoff_date:
+                            if sent_time.timestamp() >= cutoff_ts:
                                 sent_emails.append({
                                     'id': message.get('id'),
                                     'subject': message.get('subject', ''),
@@ -525,8 +598,7 @@ class OutlookDataCollector:
     
     def _is_reply(self, email: Dict) -> bool:
         """Check if email is a reply"""
-        subject = email.get('subject', '')
-        return subject.startswith('RE:') or subject.startswith('Re:')
+        return bool(_REPLY_RE.match(email.get('subject') or ''))
     
     def _get_original_message(self, email: Dict) -> str:
         """Extract the original message being replied to from email body"""
@@ -538,27 +610,13 @@ class OutlookDataCollector:
                 return "Original message not available"
 
             # Remove HTML tags for parsing
-            import re
-            content_plain = re.sub(r'<[^>]+>', '', content)
-
-            # Look for common quoted text markers
-            lines = content_plain.split('\n')
-            original_lines = []
-            in_original = False
-
-            for line in lines:
-                # Check for quote markers
-                if line.strip().startswith('>') or \
-                   line.strip().startswith('-----Original Message-----') or \
-                   'wrote:' in line or \
-                   'On' in line and 'wrote' in line:
-                    in_original = True
-
-                if in_original:
-                    original_lines.append(line)
-
-            if original_lines:
-                original_text = '\n'.join(original_lines).strip()
+            content_plain = html_to_text(content)
+
+            # The original message starts at the first line with a quote marker
+            marker = _REPLY_MARKER_RE.search(content_plain)
+
+            if marker:
+                original_text = content_plain[marker.start():].strip()
                 # Limit to first 500 chars to avoid too much context
                 return original_text[:500] if len(original_text) > 500 else original_text
 
@@ -574,22 +632,13 @@ class OutlookDataCollector:
         body = email.get('body', {})
         content = body.get('content', '')
         
-        # Remove HTML tags
-        import re
-        content = re.sub(r'<[^>]+>', '', content)
+        # Remove HTML tags and any quoted reply blocks
+        content = html_to_text(content, drop_quoted=True)
         
         # Remove quoted text (lines starting with >)
-        lines = content.split('\n')
-        user_lines = [line for line in lines if not line.strip().startswith('>')]
-        
-        return '\n'.join(user_lines).strip()
+        return strip_quoted_lines(content).strip()
     
-    def _parse_timestamp(self, timestamp_str: str) -> datetime:
-        """Parse ISO timestamp"""
-        try:
-            return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        except:
-            return datetime.now()
+    _parse_timestamp = staticmethod(parse_iso_timestamp)
 
 
 class DataCollectionOrchestrator:
@@ -610,7 +659,7 @@ class DataCollectionOrchestrator:
         if azure_client:
             self.azure_collector.initialize(azure_client)
     
-    def collect_all_data(self, days: int = 30) -> Dict[str, int]:
+    async def collect_all_data(self, days: int = 30) -> Dict[str, int]:
         """
         Collect data from all sources
         
@@ -621,40 +670,39 @@ class DataCollectionOrchestrator:
             Dictionary with counts per source
         """
         if not self.ai.consent_given:
-            print("⚠️  Data collection consent not given.")
-            print("   Run: python personalized_ai.py request-consent")
+            logger.warning("Data collection consent not given. "
+                           "Run: python personalized_ai.py request-consent")
             return {}
         
-        print(f"\n📥 Collecting communication data (last {days} days)...")
-        print("=" * 70)
-        
-        results = {}
-        
-        # Collect from Teams
-        print("📱 Collecting from MS Teams...")
-        results['teams'] = self.teams_collector.collect_chat_history(days)
-        print(f"   ✓ Collected {results['teams']} samples")
-        
-        # Collect from Azure DevOps
-        print("🔷 Collecting from Azure DevOps...")
-        results['azure_devops'] = self.azure_collector.collect_comments_history(days)
-        print(f"   ✓ Collected {results['azure_devops']} samples")
-        
-        # Collect from Outlook
-        print("📧 Collecting from Outlook...")
-        results['outlook'] = self.outlook_collector.collect_sent_emails(days)
-        print(f"   ✓ Collected {results['outlook']} samples")
+        # Progress banner only for a person at a terminal; servers get log lines
+        interactive = sys.stdout.isatty()
+        if interactive:
+            print(f"\n📥 Collecting communication data (last {days} days)...")
+            print("=" * 70)
+        logger.info(f"Collecting communication data for last {days} days from all sources...")
         
+        # The sources hit independent APIs, so collect from all three at once.
+        # The collectors use blocking HTTP clients and run in worker threads.
+        teams, azure_devops, outlook = await asyncio.gather(
+            asyncio.to_thread(self.teams_collector.collect_chat_history, days),
+            asyncio.to_thread(self.azure_collector.collect_comments_history, days),
+            asyncio.to_thread(self.outlook_collector.collect_sent_emails, days),
+        )
+        results = {'teams': teams, 'azure_devops': azure_devops, 'outlook': outlook}
         total = sum(results.values())
-        print()
-        print(f"✅ Total samples collected: {total}")
-        print()
+        
+        # One structured summary line for log pipelines
+        logger.info("Data collection summary: " + json.dumps({'days': days, **results, 'total': total}))
+        if interactive:
+            print(f"📱 MS Teams:     ✓ Collected {teams} samples")
+            print(f"🔷 Azure DevOps: ✓ Collected {azure_devops} samples")
+            print(f"📧 Outlook:      ✓ Collected {outlook} samples")
+            print(f"\n✅ Total samples collected: {total}\n")
         
         # Update profile with new data
         if total > 0:
-            print("🧠 Updating AI profile with new data...")
             self.ai._update_profile()
-            print("   ✓ Profile updated")
+            logger.info("AI profile updated with new data")
         
         return results
     
@@ -683,7 +731,7 @@ if __name__ == "__main__":
     if command == "collect":
         # In real usage, you would pass actual clients here
         # orchestrator.initialize_collectors(graph_client, azure_client)
-        orchestrator.collect_all_data(days)
+        asyncio.run(orchestrator.collect_all_data(days))
     elif command == "show-profile":
         orchestrator.show_profile_summary()
     else:
@@ -290,6 +290,37 @@ def save_sample(
         return False
 
 
+def save_samples(user_email: Optional[str], samples: List[Dict]) -> int:
+    """Insert many samples in one transaction; existing sample_ids are skipped.
+
+    Each dict has the save_sample() keyword arguments except user_email.
+    Returns the number of rows actually inserted.
+    """
+    if not samples:
+        return 0
+    _init()
+    rows = [
+        (
+            s["sample_id"], user_email, s["source"], s["timestamp"], s["context_type"],
+            s["trigger_text"], s["response_text"], json.dumps(s.get("metadata") or {}),
+        )
+        for s in samples
+    ]
+    try:
+        with _conn() as con:
+            before = con.total_changes
+            con.executemany(
+                """INSERT OR IGNORE INTO learning_samples
+                   (sample_id, user_email, source, timestamp, context_type,
+                    trigger_text, response_text, metadata_json)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+            return con.total_changes - before
+    except Exception:
+        return 0
+
+
 def delete_all_samples(user_email: str) -> int:
     _init()
     with _conn() as con:
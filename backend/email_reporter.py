@@ -8,17 +8,22 @@ activities from the SQLite database and sending them via Microsoft Graph API.
 import os
 import sys
 import json
+import atexit
 import sqlite3
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from typing import Iterator, List, Dict, Optional, Tuple
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from dataclasses import dataclass, field
 
 # Add project root for backend imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 
-@dataclass
+@dataclass(slots=True)
 class ActivitySummary:
     """Summary of a single activity"""
     timestamp: datetime
@@ -30,7 +35,7 @@ class ActivitySummary:
     source: str  # 'commit', 'manual', 'timer'
 
 
-@dataclass
+@dataclass(slots=True)
 class DailyReport:
     """Complete daily report data"""
     date: datetime
@@ -41,6 +46,170 @@ class DailyReport:
     completed_count: int
     in_progress_count: int
     blocked_count: int
+    by_project: Dict[str, List[ActivitySummary]] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        # Grouped once here; every formatter lists activities by project
+        if self.activities and not self.by_project:
+            by_project = defaultdict(list)
+            for act in self.activities:
+                by_project[act.project].append(act)
+            self.by_project = dict(by_project)
+
+
+# Applied once when the reporter's connection is opened
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+)
+
+# Day queries, keyed by whether task_updates has the optional time_estimate and
+# source columns (the Go daemon's schema does not). Fixed SQL text lets the
+# connection's statement cache reuse the prepared statements across reports.
+_ACTIVITIES_SQL_TEMPLATE = """
+    SELECT timestamp, project, ticket_id, status, update_text, {time_columns}
+    FROM task_updates
+    WHERE timestamp >= ? AND timestamp <= ?
+    ORDER BY timestamp ASC
+"""
+_ACTIVITIES_SQL = {
+    True: _ACTIVITIES_SQL_TEMPLATE.format(time_columns="time_estimate, source"),
+    False: _ACTIVITIES_SQL_TEMPLATE.format(time_columns="NULL, NULL"),
+}
+
+# Same defaults as the activity rows: missing project -> 'Unknown',
+# missing status -> 'in_progress', empty tickets are not counted
+_SUMMARY_SQL_TEMPLATE = """
+    SELECT {hours},
+           json_group_array(DISTINCT COALESCE(NULLIF(project, ''), 'Unknown')),
+           json_group_array(DISTINCT ticket_id) FILTER (WHERE ticket_id <> ''),
+           COUNT(*) FILTER (WHERE status = 'completed'),
+           COUNT(*) FILTER (WHERE COALESCE(NULLIF(status, ''), 'in_progress') = 'in_progress'),
+           COUNT(*) FILTER (WHERE status = 'blocked')
+    FROM task_updates
+    WHERE timestamp >= ? AND timestamp <= ?
+"""
+_SUMMARY_SQL = {
+    True: _SUMMARY_SQL_TEMPLATE.format(hours="TOTAL(time_estimate)"),
+    False: _SUMMARY_SQL_TEMPLATE.format(hours="0.0"),
+}
+
+# Rows pulled from SQLite per fetchmany() when listing a day's activities
+_FETCH_BATCH_SIZE = 1024
+
+# Same index the Go daemon creates; covers the daily summary query and lets the
+# activity listing range-scan by timestamp without a sort
+_DAY_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_task_updates_ts_status "
+    "ON task_updates(timestamp, status, project, ticket_id)"
+)
+
+
+# Static parts of the HTML report, built once at import
+_STYLE = """    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            background-color: white;
+            padding: 30px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        h1 {
+            color: #2c3e50;
+            border-bottom: 3px solid #3498db;
+            padding-bottom: 10px;
+        }
+        h2 {
+            color: #34495e;
+            margin-top: 25px;
+        }
+        .summary {
+            background-color: #ecf0f1;
+            padding: 15px;
+            border-radius: 5px;
+            margin: 20px 0;
+        }
+        .summary-item {
+            margin: 8px 0;
+            font-size: 16px;
+        }
+        .project-section {
+            margin: 20px 0;
+            padding: 15px;
+            background-color: #f8f9fa;
+            border-left: 4px solid #3498db;
+        }
+        .project-title {
+            font-weight: bold;
+            color: #2c3e50;
+            font-size: 18px;
+            margin-bottom: 10px;
+        }
+        .activity {
+            margin: 10px 0;
+            padding: 10px;
+            background-color: white;
+            border-radius: 4px;
+        }
+        .status-completed { color: #27ae60; }
+        .status-progress { color: #f39c12; }
+        .status-blocked { color: #e74c3c; }
+        .footer {
+            margin-top: 30px;
+            padding-top: 20px;
+            border-top: 1px solid #ecf0f1;
+            color: #7f8c8d;
+            font-size: 14px;
+        }
+    </style>
+"""
+_HTML_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+""" + _STYLE + """</head>
+<body>
+    <div class="container">
+        <h1>📊 Daily Status Report</h1>
+"""
+_HTML_TAIL = """
+    </div>
+</body>
+</html>
+"""
+
+# Status markers shared by the text and HTML formatters
+_STATUS_SYMBOL = {'completed': '✓', 'in_progress': '→', 'blocked': '✗'}
+_STATUS_EMOJI = {'completed': '✅', 'in_progress': '🔄', 'blocked': '🚫'}
+_STATUS_CLASS = {'completed': 'completed', 'in_progress': 'progress', 'blocked': 'blocked'}
+
+
+def _clock_time(dt: datetime) -> str:
+    """12-hour "HH:MM AM" time; same output as strftime('%I:%M %p') without parsing a format"""
+    return f"{dt.hour % 12 or 12:02d}:{dt.minute:02d} {'AM' if dt.hour < 12 else 'PM'}"
+
+
+@lru_cache(maxsize=None)
+def _status_label(status: str) -> str:
+    """'in_progress' -> 'In Progress'; statuses repeat, so each is formatted once"""
+    return status.replace('_', ' ').title()
+
+
+def _day_bounds(date: datetime) -> Tuple[datetime, datetime]:
+    """First and last instant of the given day"""
+    return (
+        date.replace(hour=0, minute=0, second=0, microsecond=0),
+        date.replace(hour=23, minute=59, second=59, microsecond=999999),
+    )
 
 
 class EmailReporter:
@@ -66,6 +235,71 @@ class EmailReporter:
                     db_path = str(cur / "Data" / "db" / "devtrack.db")
         self.db_path = db_path
         self.graph_client = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._time_columns: Optional[bool] = None
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """Open the database on first use and reuse the connection afterwards"""
+        with self._conn_lock:
+            if self._conn is None:
+                # Autocommit: reads never hold a transaction open between reports.
+                # Shared across threads; sqlite3 serializes use of one connection.
+                conn = sqlite3.connect(
+                    self.db_path, isolation_level=None, check_same_thread=False,
+                    cached_statements=256,
+                )
+                for pragma in _CONNECTION_PRAGMAS:
+                    try:
+                        conn.execute(pragma)
+                    except sqlite3.Error:
+                        pass  # database locked or read-only; tuning is optional
+                try:
+                    conn.execute(_DAY_INDEX_SQL)
+                except sqlite3.Error:
+                    pass  # table not created yet, or database is read-only
+                atexit.register(conn.close)
+                self._conn = conn
+            return self._conn
+    
+    def _has_time_columns(self) -> bool:
+        """Whether task_updates has time_estimate and source; checked once per connection"""
+        if self._time_columns is None:
+            columns = {row[1] for row in self._get_conn().execute("PRAGMA table_info(task_updates)")}
+            if not columns:
+                return False  # table not created yet; look again next time
+            self._time_columns = {"time_estimate", "source"} <= columns
+        return self._time_columns
+    
+    @contextmanager
+    def _read_transaction(self):
+        """Run the enclosed queries on one snapshot of the database"""
+        with self._read_lock:
+            try:
+                conn = self._get_conn()
+                conn.execute("BEGIN")
+            except sqlite3.Error:
+                yield  # each query reports its own error
+                return
+            try:
+                yield
+            finally:
+                conn.execute("COMMIT")
+    
+    def close(self):
+        """Close the cached database connection"""
+        with self._conn_lock:
+            if self._conn is not None:
+                atexit.unregister(self._conn.close)
+                try:
+                    # Refreshes planner statistics only when they are stale
+                    self._conn.execute("PRAGMA optimize")
+                except sqlite3.Error:
+                    pass
+                self._conn.close()
+                self._conn = None
+                self._time_columns = None
     
     def initialize_graph(self, graph_client):
         """
@@ -89,70 +323,92 @@ class EmailReporter:
         if date is None:
             date = datetime.now()
         
-        start_of_day = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_of_day = date.replace(hour=23, minute=59, second=59, microsecond=999999)
+        start_of_day, end_of_day = _day_bounds(date)
         
         activities = []
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Query task updates for the day (schema: Go devtrack uses timestamp, project,
-            # ticket_id, status, update_text; no time_estimate/source - use 0 and 'manual')
-            cursor.execute("PRAGMA table_info(task_updates)")
-            columns = [r[1] for r in cursor.fetchall()]
-            has_time_estimate = "time_estimate" in columns
-            has_source = "source" in columns
-
-            if has_time_estimate and has_source:
-                query = """
-                    SELECT timestamp, project, ticket_id, status, update_text,
-                           time_estimate, source
-                    FROM task_updates
-                    WHERE timestamp >= ? AND timestamp <= ?
-                    ORDER BY timestamp ASC
-                """
-            else:
-                query = """
-                    SELECT timestamp, project, ticket_id, status, update_text
-                    FROM task_updates
-                    WHERE timestamp >= ? AND timestamp <= ?
-                    ORDER BY timestamp ASC
-                """
+            cursor = self._get_conn().cursor()
+            cursor.execute(
+                _ACTIVITIES_SQL[self._has_time_columns()],
+                (start_of_day.isoformat(), end_of_day.isoformat()),
+            )
 
-            cursor.execute(query, (start_of_day.isoformat(), end_of_day.isoformat()))
-
-            for row in cursor.fetchall():
-                if has_time_estimate and has_source:
-                    timestamp_str, project, ticket_id, status, description, time_est, source = row
-                else:
-                    timestamp_str, project, ticket_id, status, description = row
-                    time_est, source = 0, "manual"
-                
-                activities.append(ActivitySummary(
-                    timestamp=datetime.fromisoformat(timestamp_str),
-                    project=project or "Unknown",
-                    ticket_id=ticket_id or "",
-                    status=status or "in_progress",
-                    description=description or "",
-                    time_spent=float(time_est or 0),
-                    source=source or "manual"
-                ))
-            
-            conn.close()
+            # Convert in bounded batches instead of materializing every raw row first
+            cursor.arraysize = _FETCH_BATCH_SIZE
+            append = activities.append
+            while rows := cursor.fetchmany():
+                for timestamp_str, project, ticket_id, status, description, time_est, source in rows:
+                    append(ActivitySummary(
+                        timestamp=datetime.fromisoformat(timestamp_str),
+                        project=project or "Unknown",
+                        ticket_id=ticket_id or "",
+                        status=status or "in_progress",
+                        description=description or "",
+                        time_spent=float(time_est or 0),
+                        source=source or "manual"
+                    ))
             
         except Exception as e:
             print(f"Error fetching activities: {e}")
         
         return activities
     
-    def generate_daily_report(self, date: Optional[datetime] = None) -> DailyReport:
+    def get_daily_summary(self, date: Optional[datetime] = None) -> Dict:
+        """
+        Aggregate a day's activities in SQLite
+        
+        Args:
+            date: Date to summarize (default: today)
+            
+        Returns:
+            Dict with total_hours, projects_worked, tickets_updated and
+            completed/in_progress/blocked counts
+        """
+        if date is None:
+            date = datetime.now()
+        
+        start_of_day, end_of_day = _day_bounds(date)
+        
+        summary = {
+            'total_hours': 0.0,
+            'projects_worked': [],
+            'tickets_updated': [],
+            'completed_count': 0,
+            'in_progress_count': 0,
+            'blocked_count': 0,
+        }
+        
+        try:
+            cursor = self._get_conn().cursor()
+            cursor.execute(
+                _SUMMARY_SQL[self._has_time_columns()],
+                (start_of_day.isoformat(), end_of_day.isoformat()),
+            )
+            
+            total_hours, projects, tickets, completed, in_progress, blocked = cursor.fetchone()
+            summary.update(
+                total_hours=float(total_hours or 0),
+                projects_worked=sorted(json.loads(projects)),
+                tickets_updated=sorted(json.loads(tickets or '[]')),
+                completed_count=completed,
+                in_progress_count=in_progress,
+                blocked_count=blocked,
+            )
+            
+        except Exception as e:
+            print(f"Error summarizing activities: {e}")
+        
+        return summary
+    
+    def generate_daily_report(self, date: Optional[datetime] = None,
+                              summary_only: bool = False) -> DailyReport:
         """
         Generate a complete daily report
         
         Args:
             date: Date to generate report for (default: today)
+            summary_only: Only compute the statistics; activities is left empty
             
         Returns:
             DailyReport object with all statistics
@@ -160,26 +416,17 @@ class EmailReporter:
         if date is None:
             date = datetime.now()
         
-        activities = self.get_daily_activities(date)
-        
-        # Calculate statistics
-        total_hours = sum(act.time_spent for act in activities)
-        projects_worked = list(set(act.project for act in activities if act.project))
-        tickets_updated = list(set(act.ticket_id for act in activities if act.ticket_id))
-        
-        completed_count = sum(1 for act in activities if act.status == 'completed')
-        in_progress_count = sum(1 for act in activities if act.status == 'in_progress')
-        blocked_count = sum(1 for act in activities if act.status == 'blocked')
+        # Statistics are aggregated by SQLite; rows are only loaded for listing.
+        # One read transaction, so a daemon write in between can't make the
+        # totals disagree with the listed activities.
+        with self._read_transaction():
+            activities = [] if summary_only else self.get_daily_activities(date)
+            summary = self.get_daily_summary(date)
         
         return DailyReport(
             date=date,
             activities=activities,
-            total_hours=total_hours,
-            projects_worked=projects_worked,
-            tickets_updated=tickets_updated,
-            completed_count=completed_count,
-            in_progress_count=in_progress_count,
-            blocked_count=blocked_count
+            **summary
         )
     
     def format_report_text(self, report: DailyReport, style: str = 'professional') -> str:
@@ -226,21 +473,10 @@ class EmailReporter:
             lines.append("ACTIVITIES")
             lines.append("-" * 70)
             
-            # Group by project
-            by_project: Dict[str, List[ActivitySummary]] = {}
-            for act in report.activities:
-                if act.project not in by_project:
-                    by_project[act.project] = []
-                by_project[act.project].append(act)
-            
-            for project, activities in sorted(by_project.items()):
+            for project, activities in sorted(report.by_project.items()):
                 lines.append(f"\n{project}:")
                 for act in activities:
-                    status_emoji = {
-                        'completed': '✓',
-                        'in_progress': '→',
-                        'blocked': '✗'
-                    }.get(act.status, '•')
+                    status_emoji = _STATUS_SYMBOL.get(act.status, '•')
                     
                     ticket_str = f"[{act.ticket_id}] " if act.ticket_id else ""
                     time_str = f" ({act.time_spent:.1f}h)" if act.time_spent > 0 else ""
@@ -249,7 +485,7 @@ class EmailReporter:
         
         lines.append("")
         lines.append("-" * 70)
-        lines.append(f"Report generated at {datetime.now().strftime('%I:%M %p')}")
+        lines.append(f"Report generated at {_clock_time(datetime.now())}")
         
         return "\n".join(lines)
     
@@ -274,20 +510,10 @@ class EmailReporter:
         if report.activities:
             lines.append("What I worked on:")
             
-            by_project: Dict[str, List[ActivitySummary]] = {}
-            for act in report.activities:
-                if act.project not in by_project:
-                    by_project[act.project] = []
-                by_project[act.project].append(act)
-            
-            for project, activities in sorted(by_project.items()):
+            for project, activities in sorted(report.by_project.items()):
                 lines.append(f"\n{project}:")
                 for act in activities:
-                    status_emoji = {
-                        'completed': '✅',
-                        'in_progress': '🔄',
-                        'blocked': '🚫'
-                    }.get(act.status, '📌')
+                    status_emoji = _STATUS_EMOJI.get(act.status, '📌')
                     
                     ticket_str = f"{act.ticket_id} - " if act.ticket_id else ""
                     lines.append(f"  {status_emoji} {ticket_str}{act.description}")
@@ -299,46 +525,46 @@ class EmailReporter:
     
     def _format_detailed(self, report: DailyReport, date_str: str) -> str:
         """Format with detailed timestamps and metadata"""
-        lines = []
-        
-        lines.append(f"Detailed Activity Report - {date_str}")
-        lines.append("=" * 70)
-        lines.append("")
+        return "\n".join(self._iter_detailed(report, date_str))
+    
+    def _iter_detailed(self, report: DailyReport, date_str: str) -> Iterator[str]:
+        """Yield the detailed report line by line"""
+        yield f"Detailed Activity Report - {date_str}"
+        yield "=" * 70
+        yield ""
         
         # Statistics
-        lines.append("STATISTICS")
-        lines.append("-" * 70)
-        lines.append(f"Total Activities: {len(report.activities)}")
-        lines.append(f"Total Hours: {report.total_hours:.2f}h")
-        lines.append(f"Projects: {len(report.projects_worked)}")
-        lines.append(f"Tickets: {len(report.tickets_updated)}")
-        lines.append(f"Completed: {report.completed_count}")
-        lines.append(f"In Progress: {report.in_progress_count}")
-        lines.append(f"Blocked: {report.blocked_count}")
-        lines.append("")
+        yield "STATISTICS"
+        yield "-" * 70
+        yield f"Total Activities: {len(report.activities)}"
+        yield f"Total Hours: {report.total_hours:.2f}h"
+        yield f"Projects: {len(report.projects_worked)}"
+        yield f"Tickets: {len(report.tickets_updated)}"
+        yield f"Completed: {report.completed_count}"
+        yield f"In Progress: {report.in_progress_count}"
+        yield f"Blocked: {report.blocked_count}"
+        yield ""
         
         # Detailed activities
         if report.activities:
-            lines.append("DETAILED ACTIVITIES")
-            lines.append("-" * 70)
+            yield "DETAILED ACTIVITIES"
+            yield "-" * 70
             
             for i, act in enumerate(report.activities, 1):
-                time_str = act.timestamp.strftime('%I:%M %p')
-                status_str = act.status.replace('_', ' ').title()
+                time_str = _clock_time(act.timestamp)
+                status_str = _status_label(act.status)
                 
-                lines.append(f"\n{i}. {time_str} - {act.project}")
+                yield f"\n{i}. {time_str} - {act.project}"
                 if act.ticket_id:
-                    lines.append(f"   Ticket: {act.ticket_id}")
-                lines.append(f"   Status: {status_str}")
-                lines.append(f"   Description: {act.description}")
+                    yield f"   Ticket: {act.ticket_id}"
+                yield f"   Status: {status_str}"
+                yield f"   Description: {act.description}"
                 if act.time_spent > 0:
-                    lines.append(f"   Time: {act.time_spent:.1f}h")
-                lines.append(f"   Source: {act.source}")
+                    yield f"   Time: {act.time_spent:.1f}h"
+                yield f"   Source: {act.source}"
         
-        lines.append("")
-        lines.append("=" * 70)
-        
-        return "\n".join(lines)
+        yield ""
+        yield "=" * 70
     
     def format_report_html(self, report: DailyReport) -> str:
         """
@@ -350,79 +576,14 @@ class EmailReporter:
         Returns:
             HTML formatted report
         """
+        return "".join(self._iter_html(report))
+    
+    def _iter_html(self, report: DailyReport) -> Iterator[str]:
+        """Yield the HTML report in chunks"""
         date_str = report.date.strftime('%A, %B %d, %Y')
         
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        .container {{
-            background-color: white;
-            padding: 30px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        h1 {{
-            color: #2c3e50;
-            border-bottom: 3px solid #3498db;
-            padding-bottom: 10px;
-        }}
-        h2 {{
-            color: #34495e;
-            margin-top: 25px;
-        }}
-        .summary {{
-            background-color: #ecf0f1;
-            padding: 15px;
-            border-radius: 5px;
-            margin: 20px 0;
-        }}
-        .summary-item {{
-            margin: 8px 0;
-            font-size: 16px;
-        }}
-        .project-section {{
-            margin: 20px 0;
-            padding: 15px;
-            background-color: #f8f9fa;
-            border-left: 4px solid #3498db;
-        }}
-        .project-title {{
-            font-weight: bold;
-            color: #2c3e50;
-            font-size: 18px;
-            margin-bottom: 10px;
-        }}
-        .activity {{
-            margin: 10px 0;
-            padding: 10px;
-            background-color: white;
-            border-radius: 4px;
-        }}
-        .status-completed {{ color: #27ae60; }}
-        .status-progress {{ color: #f39c12; }}
-        .status-blocked {{ color: #e74c3c; }}
-        .footer {{
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 1px solid #ecf0f1;
-            color: #7f8c8d;
-            font-size: 14px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📊 Daily Status Report</h1>
-        <p style="color: #7f8c8d; font-size: 18px;">{date_str}</p>
+        yield _HTML_HEAD
+        yield f"""        <p style="color: #7f8c8d; font-size: 18px;">{date_str}</p>
         
         <div class="summary">
             <h2>Summary</h2>
@@ -432,67 +593,46 @@ class EmailReporter:
 """
         
         if report.blocked_count > 0:
-            html += f"""
+            yield f"""
             <div class="summary-item">🚫 <strong>Blocked:</strong> {report.blocked_count} tasks</div>
 """
         
-        html += f"""
+        yield f"""
             <div class="summary-item">📁 <strong>Projects:</strong> {', '.join(report.projects_worked)}</div>
         </div>
         
         <h2>Activities</h2>
 """
         
-        # Group by project
-        by_project: Dict[str, List[ActivitySummary]] = {}
-        for act in report.activities:
-            if act.project not in by_project:
-                by_project[act.project] = []
-            by_project[act.project].append(act)
-        
-        for project, activities in sorted(by_project.items()):
-            html += f"""
+        for project, activities in sorted(report.by_project.items()):
+            yield f"""
         <div class="project-section">
             <div class="project-title">{project}</div>
 """
             
             for act in activities:
-                status_class = {
-                    'completed': 'completed',
-                    'in_progress': 'progress',
-                    'blocked': 'blocked'
-                }.get(act.status, 'progress')
-                
-                status_emoji = {
-                    'completed': '✓',
-                    'in_progress': '→',
-                    'blocked': '✗'
-                }.get(act.status, '•')
+                status_class = _STATUS_CLASS.get(act.status, 'progress')
+                status_emoji = _STATUS_SYMBOL.get(act.status, '•')
                 
                 ticket_str = f'<strong>[{act.ticket_id}]</strong> ' if act.ticket_id else ''
                 time_str = f' <em>({act.time_spent:.1f}h)</em>' if act.time_spent > 0 else ''
                 
-                html += f"""
+                yield f"""
             <div class="activity">
                 <span class="status-{status_class}">{status_emoji}</span>
                 {ticket_str}{act.description}{time_str}
             </div>
 """
             
-            html += """
+            yield """
         </div>
 """
         
-        html += f"""
+        yield f"""
         <div class="footer">
-            Report generated automatically at {datetime.now().strftime('%I:%M %p')}
-        </div>
-    </div>
-</body>
-</html>
-"""
-        
-        return html
+            Report generated automatically at {_clock_time(datetime.now())}
+        </div>"""
+        yield _HTML_TAIL
     
     async def send_email_report(
         self,
@@ -536,13 +676,15 @@ class EmailReporter:
             print(f"✗ Failed to send report: {e}")
             return False
     
-    def save_report(self, report: DailyReport, output_path: Optional[str] = None):
+    def save_report(self, report: DailyReport, output_path: Optional[str] = None,
+                    format: str = 'text'):
         """
         Save report to file
         
         Args:
             report: DailyReport to save
             output_path: Path to save to (auto-generated if None)
+            format: 'text' (detailed style) or 'html'
         """
         if output_path is None:
             date_str = report.date.strftime('%Y-%m-%d')
@@ -557,12 +699,16 @@ class EmailReporter:
                     cur = Path(__file__).resolve().parent.parent
                     reports_dir = str(cur / "Data" / "reports")
             os.makedirs(reports_dir, exist_ok=True)
-            output_path = os.path.join(reports_dir, f"report-{date_str}.txt")
-        
-        content = self.format_report_text(report, style='detailed')
+            ext = 'html' if format == 'html' else 'txt'
+            output_path = os.path.join(reports_dir, f"report-{date_str}.{ext}")
         
-        with open(output_path, 'w') as f:
-            f.write(content)
+        # Written chunk by chunk; the full report is never held as one string
+        with open(output_path, 'w', encoding='utf-8') as f:
+            if format == 'html':
+                f.writelines(self._iter_html(report))
+            else:
+                date_str = report.date.strftime('%A, %B %d, %Y')
+                f.writelines(f"{line}\n" for line in self._iter_detailed(report, date_str))
         
         print(f"✓ Report saved to {output_path}")
 
@@ -638,6 +784,8 @@ async def main():
     
     else:
         print(f"Unknown command: {command}")
+    
+    reporter.close()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,16 @@
 import json
 import logging
 import os
+import sqlite3
 import sys
-
-import pytz
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from github import Github, Auth, GithubException
 
@@ -13,16 +20,143 @@ _project_root = os.path.dirname(os.path.dirname(_script_dir))
 if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
+from backend.utils import json_utils
+
+# Commit records of every analyzed repository, one JSON object per line
+_EXPORT_FILE = 'all_repos.jsonl'
+
+# Repositories analyzed concurrently; requests release the GIL while waiting
+# on GitHub, so threads overlap network latency
+_MAX_WORKERS = 16
+
+# GitHub's GraphQL API caps connections at 100 nodes per page
+_GRAPHQL_PAGE_SIZE = 100
+# Branches fetched per page, each with the first page of its history
+_GRAPHQL_BRANCH_PAGE_SIZE = 25
+
+_COMMIT_FIELDS = """
+    oid
+    message
+    committedDate
+    additions @include(if: $stats)
+    deletions @include(if: $stats)
+    author { name email }
+"""
+
+_BRANCHES_QUERY = """
+query($owner: String!, $name: String!, $cursor: String, $branches: Int!, $commits: Int!, $stats: Boolean!) {
+  repository(owner: $owner, name: $name) {
+    refs(refPrefix: "refs/heads/", first: $branches, after: $cursor) {
+      pageInfo { endCursor hasNextPage }
+      nodes {
+        name
+        target {
+          ... on Commit {
+            history(first: $commits) {
+              pageInfo { endCursor hasNextPage }
+              nodes { %s }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+""" % _COMMIT_FIELDS
+
+_HISTORY_QUERY = """
+query($owner: String!, $name: String!, $ref: String!, $cursor: String, $commits: Int!, $stats: Boolean!) {
+  repository(owner: $owner, name: $name) {
+    ref(qualifiedName: $ref) {
+      target {
+        ... on Commit {
+          history(first: $commits, after: $cursor) {
+            pageInfo { endCursor hasNextPage }
+            nodes { %s }
+          }
+        }
+      }
+    }
+  }
+}
+""" % _COMMIT_FIELDS
+
+
+def _graphql_url(api_url):
+    """GraphQL endpoint for a REST base URL (github.com or GitHub Enterprise /api/v3)"""
+    api_url = (api_url or "https://api.github.com").rstrip("/")
+    if api_url.endswith("/api/v3"):
+        return api_url[:-len("v3")] + "graphql"
+    return api_url + "/graphql"
+
+
+def _http_session(token):
+    """Session shared by all analysis threads, retrying rate limits and gateway errors"""
+    retry = Retry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=None,  # GraphQL queries are POSTs but read-only
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=_MAX_WORKERS * 2, pool_maxsize=_MAX_WORKERS * 2, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Authorization"] = f"Bearer {token}"
+    return session
+
+
+class _ETagCache:
+    """
+    On-disk store of REST responses keyed by URL, used for conditional requests.
+
+    GitHub answers a matching If-None-Match with 304 Not Modified, which does
+    not count against the rate limit, and the stored body is reused.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT PRIMARY KEY, etag TEXT NOT NULL, body TEXT NOT NULL, next_url TEXT)"
+        )
+
+    def get(self, url):
+        """Cached (etag, body, next_url) for a URL, or None"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, body, next_url FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+
+    def put(self, url, etag, body, next_url):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, etag, body, next_url) VALUES (?, ?, ?, ?)",
+                (url, etag, body, next_url),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
 
 class GitHubBranchAnalyzer:
-    def __init__(self, token=None):
+    def __init__(self, token=None, session=None, cache_path=None):
         """
         Initialize GitHub Branch Analyzer with robust authentication and logging.
 
         This method ensures secure access to GitHub and sets up comprehensive logging.
         """
         # Load environment from project root
-        from backend.config import github_token, timezone, log_file_path, get_github_log_path
+        from backend.config import (
+            github_token, timezone, log_file_path, get_github_log_path,
+            get_github_api_url, get_int, database_path,
+        )
         self.token = token or github_token()
         tz_name = timezone()
         log_path_val = get_github_log_path()
@@ -35,6 +169,14 @@ class GitHubBranchAnalyzer:
         self.auth = Auth.Token(self.token)
         self.github = Github(auth=self.auth)
 
+        # Commit history is read through GraphQL: one request returns up to
+        # 100 commits with their stats instead of one REST call per commit
+        self.api_url = (get_github_api_url() or "https://api.github.com").rstrip("/")
+        self.graphql_url = _graphql_url(self.api_url)
+        self.timeout = get_int("HTTP_TIMEOUT", 30)
+        self.session = session or _http_session(self.token)
+        self.cache = _ETagCache(cache_path or str(database_path().parent / "gh_cache.db"))
+
         # Configure logging
         log_dir = os.path.dirname(log_path)
         if log_dir and not os.path.exists(log_dir):
@@ -49,40 +191,178 @@ class GitHubBranchAnalyzer:
         )
         self.logger = logging.getLogger(__name__)
 
-        # Configure timezone
-        self.ist_tz = pytz.timezone(tz_name)
+        # Configure timezone (zoneinfo caches zones and converts in C)
+        self.ist_tz = ZoneInfo(tz_name)
+
+
+    def _get_json(self, url, params=None):
+        """
+        Conditional GET of a REST URL through the ETag cache.
+
+        Returns:
+            tuple: (decoded JSON body, URL of the next page or None)
+        """
+        url = requests.Request('GET', url, params=params).prepare().url
+        cached = self.cache.get(url)
+        headers = {'Accept': 'application/vnd.github+json'}
+        if cached:
+            headers['If-None-Match'] = cached[0]
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached:
+            return json.loads(cached[1]), cached[2]
+        response.raise_for_status()
+
+        next_url = response.links.get('next', {}).get('url')
+        etag = response.headers.get('ETag')
+        if etag:
+            self.cache.put(url, etag, response.text, next_url)
+        return response.json(), next_url
+
+
+    def _get_paginated(self, url, params=None):
+        """Yield every item of a paginated REST list endpoint"""
+        while url:
+            items, url = self._get_json(url, params)
+            params = None  # the next-page URL already carries the query string
+            yield from items
 
 
     def getRepos(self):
         """
         Retrieve repositories and their branches for the authenticated user.
 
+        Unchanged listings are served from the ETag cache (304 responses).
+
         Returns:
         dict: A dictionary with repository names as keys and lists of branch names as values.
         """
-        # auth = Auth.Token(token)
-        g = Github(auth=self.auth)
         repo_list = {}
 
         try:
-            for repo in g.get_user().get_repos():
-                print("Processing repo:", repo.name)
+            for repo in self._get_paginated(f"{self.api_url}/user/repos", {'per_page': 100}):
+                print("Processing repo:", repo['name'])
 
                 # Collect all branches for the current repository
-                branches = [branch.name for branch in repo.get_branches()]
+                branches = [
+                    branch['name'] for branch in
+                    self._get_paginated(f"{self.api_url}/repos/{repo['full_name']}/branches", {'per_page': 100})
+                ]
 
                 # Store repository name and its branches
-                repo_list[repo.name] = branches
+                repo_list[repo['name']] = branches
 
         except Exception as e:
             print(f"Error retrieving repositories: {e}")
 
-        finally:
-            g.close()
-
         return repo_list
 
 
+    def _graphql(self, query, variables):
+        """
+        Run a GitHub GraphQL query.
+
+        Returns:
+            dict: The response's "data" object
+
+        Raises:
+            RuntimeError: If GitHub reports errors for the query
+        """
+        response = self.session.post(
+            self.graphql_url,
+            json={'query': query, 'variables': variables},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get('errors'):
+            raise RuntimeError(payload['errors'][0].get('message', payload['errors']))
+        return payload['data']
+
+
+    def _iter_branch_commits(self, repository_name, max_commits=None, include_stats=True, seen_shas=None):
+        """
+        Stream commits for every branch of a repository.
+
+        Branches are fetched in pages together with the first page of their
+        history; longer histories are continued with one request per 100
+        commits. max_commits limits how many commits are read per branch
+        (None = full history, 1 = head commit only). include_stats=False
+        leaves out additions/deletions, which GitHub computes per commit.
+
+        With a seen_shas set, commit SHAs are added to it as they stream, and
+        a branch's history stops paging after the page that reaches a commit
+        already read from another branch, whose older history has been read
+        already.
+
+        Yields:
+            tuple: (branch name, GraphQL commit node), newest commit first
+        """
+        owner, name = repository_name.split('/', 1)
+        commits_per_page = min(max_commits or _GRAPHQL_PAGE_SIZE, _GRAPHQL_PAGE_SIZE)
+        variables = {
+            'owner': owner,
+            'name': name,
+            'cursor': None,
+            'branches': _GRAPHQL_BRANCH_PAGE_SIZE,
+            'commits': commits_per_page,
+            'stats': include_stats,
+        }
+
+        while True:
+            refs = self._graphql(_BRANCHES_QUERY, variables)['repository']['refs']
+
+            for ref in refs['nodes']:
+                history = (ref.get('target') or {}).get('history')
+                yielded = 0
+                while history:
+                    joined = False
+                    for node in history['nodes']:
+                        if seen_shas is not None:
+                            joined = joined or node['oid'] in seen_shas
+                            seen_shas.add(node['oid'])
+                        yield ref['name'], node
+                    yielded += len(history['nodes'])
+
+                    page = history['pageInfo']
+                    if joined or not page['hasNextPage'] or (max_commits and yielded >= max_commits):
+                        break
+                    data = self._graphql(_HISTORY_QUERY, {
+                        'owner': owner,
+                        'name': name,
+                        'ref': f"refs/heads/{ref['name']}",
+                        'cursor': page['endCursor'],
+                        'commits': commits_per_page,
+                        'stats': include_stats,
+                    })
+                    history = data['repository']['ref']['target']['history']
+
+            if not refs['pageInfo']['hasNextPage']:
+                return
+            variables['cursor'] = refs['pageInfo']['endCursor']
+
+
+    def _commit_info(self, repository_name, branch_name, node):
+        """Flatten a GraphQL commit node into the exported commit/branch record"""
+        commit_time_utc = datetime.fromisoformat(node['committedDate'])
+        commit_time_ist = commit_time_utc.astimezone(self.ist_tz)
+        author = node.get('author') or {}
+
+        return {
+            'repository_name': repository_name,
+            'branch_name': branch_name,
+            'commit_sha': node['oid'],
+            'commit_message': node['message'],
+            'last_modified_time_ist': commit_time_ist.isoformat(timespec='seconds'),
+            'lines_modified': (
+                (node.get('additions') or 0) + (node.get('deletions') or 0)
+                if 'additions' in node else None
+            ),
+            'author_name': author.get('name'),
+            'author_email': author.get('email')
+        }
+
+
     def analyze_repository_branches(self, repository_name):
         """
         Analyze branches in a specific repository, extracting detailed branch information.
@@ -94,40 +374,20 @@ class GitHubBranchAnalyzer:
             list: Detailed information about each branch
         """
         try:
-            # Retrieve the repository
-            repo = self.github.get_repo(repository_name)
-
             branch_details = []
 
-            # Iterate through all branches
-            for branch in repo.get_branches():
+            # Head commit of every branch, with stats, in one request per 25 branches
+            for branch_name, node in self._iter_branch_commits(repository_name, max_commits=1):
                 try:
-                    # Get the latest commit for this branch
-                    commit = repo.get_commit(branch.commit.sha)
-
-                    # Convert commit time to IST
-                    commit_time_utc = commit.commit.committer.date
-                    commit_time_ist = commit_time_utc.astimezone(self.ist_tz)
-
-                    # Calculate total lines modified
-                    lines_modified = commit.stats.total if commit.stats else 0
-
-                    branch_info = {
-                        'repository_name': repository_name,
-                        'branch_name': branch.name,
-                        'last_modified_time_ist': commit_time_ist.strftime('%Y-%m-%d %H:%M:%S %Z'),
-                        'lines_modified': lines_modified,
-                        'author_name': commit.commit.author.name,
-                        'author_email': commit.commit.author.email
-                    }
-
+                    branch_info = self._commit_info(repository_name, branch_name, node)
+                    del branch_info['commit_sha'], branch_info['commit_message']
                     branch_details.append(branch_info)
 
                     # Log successful branch processing
-                    self.logger.info(f"Processed branch: {branch.name}")
+                    self.logger.info(f"Processed branch: {branch_name}")
 
                 except Exception as branch_error:
-                    self.logger.error(f"Error processing branch {branch.name}: {branch_error}")
+                    self.logger.error(f"Error processing branch {branch_name}: {branch_error}")
 
             return branch_details
 
@@ -155,61 +415,48 @@ class GitHubBranchAnalyzer:
             raise e
 
 
-    def analyze_repository_commits(self, repository_name):
+    def export_jsonl(self, records, output):
+        """
+        Append records to an open binary file as newline-delimited JSON.
+
+        Args:
+            records (list): Commit or branch detail dictionaries
+            output: File object opened in 'wb' mode
+        """
+        output.writelines(json_utils.dumps_bytes(record) + b'\n' for record in records)
+
+
+    def analyze_repository_commits(self, repository_name, include_stats=True):
         """
 		Analyze all commits in all branches of a specific repository,
 		extracting detailed commit information.
 
+		A branch whose history joins one already read stops paging there:
+		the shared older commits are reported under the branch that read
+		them first. Commits on the pages fetched are reported once per
+		branch they were read for.
+
 		Args:
 			repository_name (str): Full name of the repository (e.g., 'username/repo')
+			include_stats (bool): Fetch additions/deletions for lines_modified;
+				when False lines_modified is None and the queries are cheaper
 
 		Returns:
 			list: Detailed information about each commit in all branches
 		"""
         try:
-            # Retrieve the repository
-            repo = self.github.get_repo(repository_name)
-
             commit_details = []
 
-            # Iterate through all branches
-            for branch in repo.get_branches():
+            for branch_name, node in self._iter_branch_commits(
+                    repository_name, include_stats=include_stats, seen_shas=set()):
                 try:
-                    self.logger.info(f"Analyzing branch: {branch.name}")
-
-                    # Iterate through all commits in the branch
-                    commits = repo.get_commits(sha=branch.name)
-                    for commit in commits:
-                        try:
-                            # Convert commit time to IST
-                            commit_time_utc = commit.commit.committer.date
-                            commit_time_ist = commit_time_utc.astimezone(self.ist_tz)
-
-                            # Calculate total lines modified
-                            lines_modified = commit.stats.total if commit.stats else 0
-
-                            # Commit details
-                            commit_info = {
-                                'repository_name': repository_name,
-                                'branch_name': branch.name,
-                                'commit_sha': commit.sha,
-                                'commit_message': commit.commit.message,
-                                'last_modified_time_ist': commit_time_ist.strftime('%Y-%m-%d %H:%M:%S %Z'),
-                                'lines_modified': lines_modified,
-                                'author_name': commit.commit.author.name,
-                                'author_email': commit.commit.author.email
-                            }
-
-                            commit_details.append(commit_info)
-
-                            # Log successful commit processing
-                            self.logger.info(f"Processed commit: {commit.sha} on branch {branch.name}")
-
-                        except Exception as commit_error:
-                            self.logger.error(f"Error processing commit {commit.sha} on branch {branch.name}: {commit_error}")
+                    commit_details.append(self._commit_info(repository_name, branch_name, node))
 
-                except Exception as branch_error:
-                    self.logger.error(f"Error processing branch {branch.name}: {branch_error}")
+                    # Log successful commit processing
+                    self.logger.info(f"Processed commit: {node['oid']} on branch {branch_name}")
+
+                except Exception as commit_error:
+                    self.logger.error(f"Error processing commit {node.get('oid')} on branch {branch_name}: {commit_error}")
 
             return commit_details
 
@@ -219,18 +466,30 @@ class GitHubBranchAnalyzer:
 
 
 def main():
+    branch_analyzer = None
     try:
         branch_analyzer = GitHubBranchAnalyzer()
         repolist = branch_analyzer.getRepos()
-        for repo, branches in repolist.items():
-            print(repo)
-            print(branches)
-            repository_name = f'{os.getenv("USER_NAME")}/{repo}'
-            commit_analysis = branch_analyzer.analyze_repository_commits(repository_name)
-            branch_analyzer.export_branch_analysis(commit_analysis, output_file=f'{repo}.json')
-            print("*"*10)
+        user_name = os.getenv("USER_NAME")
+
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor, open(_EXPORT_FILE, 'wb') as output:
+            futures = {
+                executor.submit(branch_analyzer.analyze_repository_commits, f'{user_name}/{repo}'): repo
+                for repo in repolist
+            }
+            for future in as_completed(futures):
+                repo = futures[future]
+                print(repo)
+                print(repolist[repo])
+                commit_analysis = future.result()
+                branch_analyzer.export_jsonl(commit_analysis, output)
+                branch_analyzer.logger.info(f"Exported {len(commit_analysis)} commits for {repo} to {_EXPORT_FILE}")
+                print("*"*10)
     except Exception as e:
         print(f"Analysis failed: {e}")
+    finally:
+        if branch_analyzer is not None:
+            branch_analyzer.cache.close()
 
 
 if __name__ == "__main__":
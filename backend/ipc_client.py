@@ -5,16 +5,19 @@ This module provides the Python side of IPC communication with the Go daemon.
 It handles receiving triggers from Go and sending responses back.
 """
 
-import json
+import itertools
 import os
 import socket
+import struct
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Callable, Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Union
 import logging
 from threading import Thread, Lock
 
+from backend.utils import json_utils
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,6 +25,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Initial size of the preallocated receive buffer; it doubles only for
+# messages that don't fit and shrinks back once they are consumed
+_RECV_BUFFER_SIZE = 64 * 1024
+# Length-prefixed framing (IPC_LENGTH_PREFIX): little-endian uint32 payload size,
+# capped to match the Go daemon's maxIPCFrameSize
+_FRAME_HEADER = struct.Struct('<I')
+_MAX_FRAME_SIZE = 64 << 20
+# Auto-generated message ids: "<type>-<pid>-<n>" is unique per process without
+# touching the clock
+_PID = os.getpid()
+_msg_counter = itertools.count()
+# Default SO_SNDBUF/SO_RCVBUF so bulk task updates don't stall on small kernel buffers
+_SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
 
 class MessageType(str, Enum):
     """IPC Message types"""
@@ -48,9 +65,16 @@ class MessageType(str, Enum):
     WORKSPACE_RELOAD = "workspace_reload"
 
 
+# Wire value -> member. Decoding through this dict skips the Enum __call__
+# machinery that MessageType(value) goes through for every received message.
+_TYPES_BY_VALUE: Dict[str, MessageType] = {t.value: t for t in MessageType}
+
+
 class IPCMessage:
     """Represents an IPC message"""
 
+    __slots__ = ('type', 'id', 'data', 'error', '_ts_ns', '_timestamp')
+
     def __init__(
         self,
         msg_type: MessageType,
@@ -59,13 +83,22 @@ class IPCMessage:
         error: Optional[str] = None
     ):
         self.type = msg_type
-        # Use timezone-aware timestamp (RFC3339 format for Go compatibility)
-        from datetime import timezone
-        self.timestamp = datetime.now(timezone.utc).astimezone().isoformat()
-        self.id = msg_id or f"{msg_type.value}_{int(time.time() * 1000000)}"
+        # Creation time; formatted only if the message is serialized (received
+        # messages usually never are)
+        self._ts_ns = time.time_ns()
+        self._timestamp: Optional[str] = None
+        self.id = msg_id or f"{msg_type.value}-{_PID}-{next(_msg_counter)}"
         self.data = data
         self.error = error
 
+    @property
+    def timestamp(self) -> str:
+        """Creation time as a timezone-aware RFC3339 string (Go time.Time compatible)"""
+        if self._timestamp is None:
+            created = datetime.fromtimestamp(self._ts_ns / 1e9, timezone.utc)
+            self._timestamp = created.astimezone().isoformat()
+        return self._timestamp
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to dictionary"""
         result = {
@@ -80,34 +113,71 @@ class IPCMessage:
 
     def to_json(self) -> str:
         """Convert message to JSON string"""
-        return json.dumps(self.to_dict())
+        return json_utils.dumps(self.to_dict())
+
+    def to_bytes(self) -> bytes:
+        """Encode message as a newline-terminated UTF-8 JSON frame"""
+        return json_utils.dumps_bytes(self.to_dict()) + b'\n'
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'IPCMessage':
         """Create message from dictionary"""
-        return cls(
-            msg_type=MessageType(data["type"]),
-            data=data.get("data", {}),
-            msg_id=data.get("id"),
-            error=data.get("error")
-        )
+        raw_type = data["type"]
+        msg_type = _TYPES_BY_VALUE.get(raw_type)
+        if msg_type is None:
+            raise ValueError(f"{raw_type!r} is not a valid MessageType")
+
+        # Fill the slots directly rather than going through __init__: received
+        # messages keep the sender's id and timestamp, so there is nothing to
+        # generate
+        message = cls.__new__(cls)
+        message.type = msg_type
+        message.data = data.get("data", {})
+        message.error = data.get("error")
+        message._timestamp = data.get("timestamp")
+        message._ts_ns = time.time_ns() if message._timestamp is None else 0
+        msg_id = data.get("id")
+        message.id = msg_id or f"{raw_type}-{_PID}-{next(_msg_counter)}"
+        return message
 
     @classmethod
-    def from_json(cls, json_str: str) -> 'IPCMessage':
-        """Create message from JSON string"""
-        data = json.loads(json_str)
+    def from_json(cls, json_str: Union[str, bytes]) -> 'IPCMessage':
+        """Create message from a JSON string or UTF-8 bytes"""
+        data = json_utils.loads(json_str)
         return cls.from_dict(data)
 
 
 class IPCClient:
     """Python IPC client for communicating with Go daemon"""
 
-    def __init__(self, socket_path: Optional[str] = None):
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        length_prefixed: Optional[bool] = None,
+        socket_buffer_size: Optional[int] = _SOCKET_BUFFER_SIZE,
+    ):
         self.socket_path = socket_path or self._get_socket_path()
+        # Requested kernel send/receive buffer size; None keeps the OS default
+        self.socket_buffer_size = socket_buffer_size
+        if length_prefixed is None:
+            from backend.config import ipc_length_prefix
+            length_prefixed = ipc_length_prefix()
+        # Must match the daemon's IPC_LENGTH_PREFIX setting
+        self.length_prefixed = length_prefixed
         self.sock: Optional[socket.socket] = None
         self.connected = False
         self.running = False
-        self.lock = Lock()
+        # connect/disconnect mutate sock and connected under _state_lock;
+        # sends are serialized by _send_lock. Reads take no lock: only one
+        # thread (the listener, or the caller when not listening) may call
+        # receive_message, so a slow recv never stalls an outgoing ACK.
+        self._state_lock = Lock()
+        self._send_lock = Lock()
+        # Preallocated receive buffer filled with recv_into; bytes in
+        # [_rx_pos, _rx_end) have been received but not yet returned
+        self._rx_buf = bytearray(_RECV_BUFFER_SIZE)
+        self._rx_pos = 0
+        self._rx_end = 0
         self.handlers: Dict[MessageType, Callable] = {}
         self.listener_thread: Optional[Thread] = None
 
@@ -132,7 +202,7 @@ class IPCClient:
 
         for attempt in range(retry_count):
             try:
-                with self.lock:
+                with self._state_lock:
                     if self.connected:
                         logger.info("Already connected to IPC server")
                         return True
@@ -140,6 +210,7 @@ class IPCClient:
                     # Create TCP socket
                     self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                     self.sock.settimeout(timeout)
+                    self._configure_socket(self.sock)
 
                     # Parse address:port
                     host, port = self.socket_path.split(':')
@@ -167,10 +238,21 @@ class IPCClient:
         logger.error("Failed to connect to IPC server after all retries")
         return False
 
+    def _configure_socket(self, sock: socket.socket):
+        """Disable Nagle and size the kernel buffers before connecting"""
+        # Messages are small request/ACK frames; don't hold them back for coalescing
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.socket_buffer_size:
+            # Set before connect() so the receive window scale is negotiated for it
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.socket_buffer_size)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_buffer_size)
+
     def disconnect(self):
         """Disconnect from the IPC server"""
-        with self.lock:
-            if not self.connected:
+        with self._state_lock:
+            # A socket can outlive `connected` when the peer hung up or a
+            # receive failed; it still needs closing
+            if not self.connected and not self.sock:
                 return
 
             if self.sock:
@@ -180,6 +262,7 @@ class IPCClient:
                     pass
                 self.sock = None
 
+            self._rx_pos = self._rx_end = 0
             self.connected = False
             logger.info("Disconnected from IPC server")
 
@@ -193,23 +276,57 @@ class IPCClient:
         Returns:
             True if sent successfully
         """
-        with self.lock:
-            if not self.connected or not self.sock:
+        with self._send_lock:
+            sock = self.sock
+            if not self.connected or not sock:
                 logger.error("Not connected to IPC server")
                 return False
 
             try:
-                json_data = message.to_json()
-                # Add newline delimiter
-                data = (json_data + '\n').encode('utf-8')
-                self.sock.sendall(data)
-                logger.debug(f"Sent message: {message.type}")
+                sock.sendall(self._encode_frame(message))
+                logger.debug("Sent message: %s", message.type)
                 return True
             except Exception as e:
                 logger.error(f"Failed to send message: {e}")
                 self.connected = False
                 return False
 
+    def send_messages(self, messages: List[IPCMessage]) -> bool:
+        """
+        Send several messages to the Go daemon in one write
+
+        Frames are handed to the kernel together with a scatter-gather
+        sendmsg(), so a burst costs one syscall instead of one per message.
+
+        Args:
+            messages: The messages to send, in order
+
+        Returns:
+            True if all messages were sent successfully
+        """
+        if not messages:
+            return True
+        frames = [self._encode_frame(message) for message in messages]
+
+        with self._send_lock:
+            sock = self.sock
+            if not self.connected or not sock:
+                logger.error("Not connected to IPC server")
+                return False
+
+            try:
+                # sendmsg may write only part of the batch (and is missing on
+                # Windows); finish whatever is left with sendall
+                sent = sock.sendmsg(frames) if hasattr(sock, 'sendmsg') else 0
+                if sent < sum(map(len, frames)):
+                    sock.sendall(b''.join(frames)[sent:])
+                logger.debug("Sent %d messages", len(frames))
+                return True
+            except Exception as e:
+                logger.error(f"Failed to send messages: {e}")
+                self.connected = False
+                return False
+
     def receive_message(self, timeout: Optional[float] = None) -> Optional[IPCMessage]:
         """
         Receive a message from the Go daemon
@@ -220,44 +337,152 @@ class IPCClient:
         Returns:
             The received message or None if error
         """
-        with self.lock:
-            if not self.connected or not self.sock:
-                logger.error("Not connected to IPC server")
+        # Single-reader: see __init__. Bind the socket once so a concurrent
+        # disconnect surfaces as a socket error rather than an AttributeError.
+        sock = self.sock
+        if not self.connected or not sock:
+            logger.error("Not connected to IPC server")
+            return None
+
+        try:
+            if timeout is not None:
+                sock.settimeout(timeout)
+            else:
+                sock.settimeout(None)
+
+            data = self._read_prefixed(sock) if self.length_prefixed else self._read_line(sock)
+            if data is None:
+                if self._rx_end > self._rx_pos:
+                    logger.warning("Connection closed while receiving message")
+                elif self.running:
+                    logger.info("IPC server closed the connection")
+                self.connected = False
                 return None
 
-            try:
-                if timeout is not None:
-                    self.sock.settimeout(timeout)
-                else:
-                    self.sock.settimeout(None)
-
-                # Read until newline
-                data = b''
-                while True:
-                    chunk = self.sock.recv(1)
-                    if not chunk:
-                        if data:
-                            logger.warning("Connection closed while receiving message")
-                        return None
-                    if chunk == b'\n':
-                        break
-                    data += chunk
-
-                if not data:
-                    return None
-
-                json_str = data.decode('utf-8')
-                message = IPCMessage.from_json(json_str)
-                logger.debug(f"Received message: {message.type}")
-                return message
-
-            except socket.timeout:
+            if self._rx_pos == self._rx_end:
+                # Everything consumed: rewind instead of compacting later, and
+                # drop any oversized buffer a large message forced
+                self._rx_pos = self._rx_end = 0
+                if len(self._rx_buf) > _RECV_BUFFER_SIZE:
+                    self._rx_buf = bytearray(_RECV_BUFFER_SIZE)
+
+            if not data:
                 return None
-            except Exception as e:
-                logger.error(f"Failed to receive message: {e}")
-                self.connected = False
+
+            message = IPCMessage.from_json(data)
+            logger.debug("Received message: %s", message.type)
+            return message
+
+        except socket.timeout:
+            return None
+        except Exception as e:
+            logger.error(f"Failed to receive message: {e}")
+            self.connected = False
+            return None
+
+    def receive_messages(self, timeout: Optional[float] = None) -> List[IPCMessage]:
+        """
+        Receive the next message plus any others already buffered
+
+        Waits like receive_message() for the first message, then drains every
+        complete frame that arrived in the same reads without touching the
+        socket again.
+
+        Args:
+            timeout: Receive timeout in seconds for the first message (None for blocking)
+
+        Returns:
+            The received messages in order (empty on timeout or error)
+        """
+        message = self.receive_message(timeout)
+        if message is None:
+            return []
+        messages = [message]
+        while self.connected and self._frame_buffered():
+            message = self.receive_message(timeout)
+            if message is None:
+                break
+            messages.append(message)
+        return messages
+
+    def _frame_buffered(self) -> bool:
+        """Whether a complete frame is already in the receive buffer"""
+        if not self.length_prefixed:
+            return self._rx_buf.find(b'\n', self._rx_pos, self._rx_end) != -1
+        unread = self._rx_end - self._rx_pos
+        if unread < _FRAME_HEADER.size:
+            return False
+        (size,) = _FRAME_HEADER.unpack_from(self._rx_buf, self._rx_pos)
+        return unread >= _FRAME_HEADER.size + size
+
+    def _encode_frame(self, message: IPCMessage) -> bytes:
+        """Frame a message for the wire using the configured framing"""
+        if not self.length_prefixed:
+            return message.to_bytes()
+        payload = json_utils.dumps_bytes(message.to_dict())
+        return _FRAME_HEADER.pack(len(payload)) + payload
+
+    def _recv_more(self, sock: socket.socket, need: int = 0) -> int:
+        """
+        recv_into the free tail of the receive buffer
+
+        Unread bytes are moved to the front (and the buffer doubled) only when
+        the tail is full or cannot hold ``need`` unread bytes.
+
+        Returns:
+            Number of bytes received (0 on EOF)
+        """
+        buf = self._rx_buf
+        unread = self._rx_end - self._rx_pos
+        if self._rx_end == len(buf) or need > len(buf) - self._rx_pos:
+            if self._rx_pos:
+                buf[:unread] = buf[self._rx_pos:self._rx_end]
+                self._rx_pos, self._rx_end = 0, unread
+            size = len(buf)
+            while size <= unread or size < need:
+                size *= 2
+            if size > len(buf):
+                buf.extend(bytes(size - len(buf)))
+
+        received = sock.recv_into(memoryview(buf)[self._rx_end:])
+        self._rx_end += received
+        return received
+
+    def _fill(self, sock: socket.socket, size: int) -> bool:
+        """Receive until at least size unread bytes are buffered; False on EOF"""
+        while self._rx_end - self._rx_pos < size:
+            if not self._recv_more(sock, size):
+                return False
+        return True
+
+    def _read_line(self, sock: socket.socket) -> Optional[bytearray]:
+        """Take the next newline-terminated frame from the buffer (None on EOF)"""
+        # Only newly received bytes are scanned for the delimiter
+        scanned = 0
+        while (end := self._rx_buf.find(b'\n', self._rx_pos + scanned, self._rx_end)) == -1:
+            scanned = self._rx_end - self._rx_pos
+            if not self._recv_more(sock):
                 return None
 
+        data = self._rx_buf[self._rx_pos:end]
+        self._rx_pos = end + 1
+        return data
+
+    def _read_prefixed(self, sock: socket.socket) -> Optional[bytearray]:
+        """Take the next length-prefixed frame from the buffer (None on EOF)"""
+        header_size = _FRAME_HEADER.size
+        if not self._fill(sock, header_size):
+            return None
+        (size,) = _FRAME_HEADER.unpack_from(self._rx_buf, self._rx_pos)
+        if size > _MAX_FRAME_SIZE:
+            raise ValueError(f"IPC frame of {size} bytes exceeds {_MAX_FRAME_SIZE} byte limit")
+        if not self._fill(sock, header_size + size):
+            return None
+
+        start = self._rx_pos + header_size
+        self._rx_pos = start + size
+        return self._rx_buf[start:self._rx_pos]
+
     def register_handler(self, msg_type: MessageType, handler: Callable[[IPCMessage], None]):
         """
         Register a handler function for a message type
@@ -267,7 +492,7 @@ class IPCClient:
             handler: The handler function
         """
         self.handlers[msg_type] = handler
-        logger.info(f"Registered handler for message type: {msg_type}")
+        logger.info("Registered handler for message type: %s", msg_type)
 
     def start_listening(self):
         """Start listening for messages in a background thread"""
@@ -283,6 +508,14 @@ class IPCClient:
     def stop_listening(self):
         """Stop listening for messages"""
         self.running = False
+        # The listener blocks in recv() without a timeout; shutting down the
+        # read side wakes it with EOF
+        sock = self.sock
+        if sock and self.listener_thread and self.listener_thread.is_alive():
+            try:
+                sock.shutdown(socket.SHUT_RD)
+            except OSError:
+                pass
         if self.listener_thread:
             self.listener_thread.join(timeout=2)
         logger.info("Stopped listening for IPC messages")
@@ -291,33 +524,16 @@ class IPCClient:
         """Main listening loop (runs in background thread)"""
         while self.running and self.connected:
             try:
-                message = self.receive_message(timeout=1.0)
-                if message is None:
-                    continue
-
-                # Handle shutdown message
-                if message.type == MessageType.SHUTDOWN:
-                    logger.info("Received shutdown message")
-                    self.running = False
-                    break
-
-                # Call registered handler
-                handler = self.handlers.get(message.type)
-                if handler:
-                    try:
-                        handler(message)
-                    except Exception as e:
-                        logger.error(f"Error in handler for {message.type}: {e}")
-                        # Send error response
-                        error_msg = IPCMessage(
-                            msg_type=MessageType.ERROR,
-                            msg_id=message.id,
-                            data={},
-                            error=str(e)
-                        )
-                        self.send_message(error_msg)
-                else:
-                    logger.warning(f"No handler registered for message type: {message.type}")
+                # Block until data arrives instead of polling; EOF or
+                # stop_listening() ends the wait. A burst is handled in full
+                # before blocking again.
+                for message in self.receive_messages():
+                    # Handle shutdown message
+                    if message.type == MessageType.SHUTDOWN:
+                        logger.info("Received shutdown message")
+                        self.running = False
+                        return
+                    self._dispatch(message)
 
             except Exception as e:
                 if self.running:
@@ -325,6 +541,25 @@ class IPCClient:
                     from backend.config import ipc_retry_delay_ms
                     time.sleep(ipc_retry_delay_ms() / 1000.0)
 
+    def _dispatch(self, message: IPCMessage):
+        """Call the registered handler, replying with an error message if it fails"""
+        handler = self.handlers.get(message.type)
+        if handler:
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error(f"Error in handler for {message.type}: {e}")
+                # Send error response
+                error_msg = IPCMessage(
+                    msg_type=MessageType.ERROR,
+                    msg_id=message.id,
+                    data={},
+                    error=str(e)
+                )
+                self.send_message(error_msg)
+        else:
+            logger.warning("No handler registered for message type: %s", message.type)
+
 
 def create_response_message(request_id: str, data: Dict[str, Any]) -> IPCMessage:
     """Create a response message"""
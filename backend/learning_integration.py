@@ -48,11 +48,34 @@ class GraphClientAdapter:
         messages_response = await self.graph.get_all_chat_messages(chat_id, since_datetime=since_datetime)
         return [self._message_to_dict(msg) for msg in messages_response]
     
+    async def iter_chat_messages(self, chat_id: str, since_datetime: Optional[datetime] = None):
+        """Stream messages from a specific chat, newest first"""
+        async for msg in self.graph.iter_chat_messages(chat_id, since_datetime=since_datetime):
+            yield self._message_to_dict(msg)
+
+    async def iter_chat_messages_batch(self, chat_ids, since_datetime: Optional[datetime] = None):
+        """Newest-first message streams for several chats, first pages fetched in Graph batches"""
+        streams = await self.graph.iter_chat_messages_batch(chat_ids, since_datetime=since_datetime)
+        results = {}
+        for chat_id in chat_ids:
+            stream = streams.get(chat_id)
+            if stream is None:
+                # Sub-request failed inside the batch; stream this chat on its own
+                results[chat_id] = self.iter_chat_messages(chat_id, since_datetime)
+            else:
+                results[chat_id] = self._dict_stream(stream)
+        return results
+
+    async def _dict_stream(self, messages):
+        async for msg in messages:
+            yield self._message_to_dict(msg)
+
     async def get_sent_emails(self, days: int = 30):
-        """Get sent emails"""
-        # Would use Graph API to get sent items
-        # Placeholder for now
-        return []
+        """Get sent emails from the last `days` days (filtered by Graph)"""
+        from datetime import timedelta
+        since = datetime.now(tz=timezone.utc) - timedelta(days=days)
+        messages = await self.graph.get_sent_messages(since)
+        return [self._email_to_dict(msg) for msg in messages]
     
     def _chat_to_dict(self, chat):
         """Convert chat object to dictionary"""
@@ -64,41 +87,72 @@ class GraphClientAdapter:
             'lastUpdatedDateTime': chat.last_updated_date_time.isoformat() if hasattr(chat, 'last_updated_date_time') and chat.last_updated_date_time else None
         }
     
+    def _email_to_dict(self, email):
+        """Convert mail message object to dictionary"""
+        def address(recipient):
+            email_address = getattr(recipient, 'email_address', None)
+            return {'address': getattr(email_address, 'address', None),
+                    'name': getattr(email_address, 'name', None)}
+
+        body = getattr(email, 'body', None)
+        sent = getattr(email, 'sent_date_time', None)
+        sender = getattr(email, 'from_', None)
+        return {
+            'id': getattr(email, 'id', None),
+            'subject': getattr(email, 'subject', None) or '',
+            'sentDateTime': sent.isoformat() if sent else None,
+            'body': {'content': getattr(body, 'content', None) or ''},
+            'from': address(sender) if sender else {},
+            'toRecipients': [address(r) for r in (getattr(email, 'to_recipients', None) or [])],
+            'isRead': bool(getattr(email, 'is_read', False)),
+        }
+
     def _message_to_dict(self, message):
         """Convert message object to dictionary"""
-        from_user = None
-        if hasattr(message, 'from_') and message.from_:
+        # Graph SDK models define every attribute, so read them directly and
+        # treat AttributeError (a link that is None, or a bare object) as absent
+        try:
             # Teams chat messages use from_.user (Identity), not from_.email_address
-            if hasattr(message.from_, 'user') and message.from_.user:
-                user_identity = message.from_.user
-                # UPN is absent in Teams; use tenantId from additional_data if needed
-                upn = None
-                if hasattr(user_identity, 'additional_data') and user_identity.additional_data:
-                    upn = user_identity.additional_data.get('userPrincipalName')
-                display_name = getattr(user_identity, 'display_name', None)
-                from_user = {
-                    'user': {
-                        'userPrincipalName': upn,
-                        'displayName': display_name,
-                        'id': getattr(user_identity, 'id', None),
-                    }
+            user_identity = message.from_.user
+        except AttributeError:
+            user_identity = None
+
+        if user_identity:
+            # UPN is absent in Teams; use tenantId from additional_data if needed
+            additional_data = getattr(user_identity, 'additional_data', None)
+            from_user = {
+                'user': {
+                    'userPrincipalName': additional_data.get('userPrincipalName') if additional_data else None,
+                    'displayName': getattr(user_identity, 'display_name', None),
+                    'id': getattr(user_identity, 'id', None),
                 }
+            }
+        else:
             # Fallback for Outlook-style messages with email_address
-            elif hasattr(message.from_, 'email_address') and message.from_.email_address:
-                from_user = {
-                    'user': {
-                        'userPrincipalName': getattr(message.from_.email_address, 'address', None),
-                        'displayName': getattr(message.from_.email_address, 'name', None),
-                    }
+            try:
+                email_address = message.from_.email_address
+            except AttributeError:
+                email_address = None
+            from_user = {
+                'user': {
+                    'userPrincipalName': getattr(email_address, 'address', None),
+                    'displayName': getattr(email_address, 'name', None),
                 }
-        
-        body_content = None
-        if hasattr(message, 'body') and message.body:
-            body_content = message.body.content if hasattr(message.body, 'content') else None
-        
+            } if email_address else None
+
+        try:
+            body_content = message.body.content
+        except AttributeError:
+            body_content = None
+
+        try:
+            created = message.created_date_time.isoformat()
+        except AttributeError:
+            created = None
+
         return {
-            'id': message.id if hasattr(message, 'id') else None,
-            'createdDateTime': message.created_date_time.isoformat() if hasattr(message, 'created_date_time') and message.created_date_time else None,
+            'id': getattr(message, 'id', None),
+            'createdDateTime': created,
             'from': from_user,
             'body': {
                 'content': body_content
@@ -106,6 +160,22 @@ class GraphClientAdapter:
         }
 
 
+async def _pairs_newest_first(messages, is_user):
+    """
+    (previous, current) pairs of (message, is_user) from a newest-first stream.
+
+    Graph returns chat history ordered by createdDateTime desc, so each pair
+    of neighbours is swapped to (older, newer) as it arrives; nothing beyond
+    the pair window is held.
+    """
+    newer = None
+    async for message in messages:
+        tagged = (message, is_user(message))
+        if newer is not None:
+            yield tagged, newer
+        newer = tagged
+
+
 class AsyncTeamsDataCollector(TeamsDataCollector):
     """Async version of Teams data collector"""
 
@@ -122,7 +192,7 @@ class AsyncTeamsDataCollector(TeamsDataCollector):
         if self.user_object_id and from_user.get('id'):
             return from_user['id'] == self.user_object_id
         # Fallback to UPN
-        return from_user.get('userPrincipalName', '') == self.ai.user_email
+        return (from_user.get('userPrincipalName') or '').lower() in self._user_emails
 
     async def collect_chat_history_async(
         self, days: int = 30, since_datetime: Optional[datetime] = None, mongo_store=None
@@ -142,6 +212,7 @@ class AsyncTeamsDataCollector(TeamsDataCollector):
             return 0
 
         samples_collected = 0
+        pending = []  # written to the learning store in one batch at the end
 
         try:
             from datetime import timedelta
@@ -158,72 +229,80 @@ class AsyncTeamsDataCollector(TeamsDataCollector):
                 cutoff_date = datetime.now(tz=timezone.utc) - timedelta(days=days)
                 print(f"📱 Collecting Teams chat history for last {days} days...")
             
-            for i, chat in enumerate(chats, 1):
-                chat_id = chat.get('id')
-                if not chat_id:
-                    continue
-
+            chats = [chat for chat in chats if chat.get('id')]
+            # Compared as POSIX seconds: a timestamp that fails to parse falls
+            # back to naive local now(), which can't be compared to cutoff_date
+            cutoff_ts = cutoff_date.timestamp()
+            print(f"   Fetching messages from {len(chats)} chats...")
+
+            # One Graph $batch round-trip covers the first page of up to 20
+            # chats; later pages stream in while each chat is processed
+            streams = await self.graph_client.iter_chat_messages_batch(
+                [chat['id'] for chat in chats], since_datetime=cutoff_date
+            )
+            chat_pairs = [_pairs_newest_first(streams[chat['id']], self._is_user_message) for chat in chats]
+
+            # Bound once; looked up for every message pair below
+            extract = self._extract_message_content
+            parse_ts = self._parse_timestamp
+            use_mongo = bool(mongo_store and mongo_store.is_available())
+            user_email = self.ai.user_email
+
+            for i, (chat, pairs) in enumerate(zip(chats, chat_pairs), 1):
+                chat_id = chat['id']
                 print(f"   Processing chat {i}/{len(chats)}...", end='\r')
 
-                # Get messages from this chat (pass cutoff for early termination)
-                messages = await self.graph_client.get_chat_messages(
-                    chat_id, since_datetime=cutoff_date
-                )
-
-                if not messages or len(messages) < 2:
-                    continue
-
-                # Look for user responses (message following another person's message)
-                for j in range(1, len(messages)):
-                    prev_msg = messages[j-1]
-                    current_msg = messages[j]
-
+                # Look for user responses (message following another person's message).
+                # Each message is classified once, as it enters the pair window.
+                async for (prev_msg, prev_is_user), (current_msg, current_is_user) in pairs:
                     # Check if current message is from user
-                    if self._is_user_message(current_msg):
+                    if current_is_user:
                         # Check if previous message is NOT from user (someone asked/said something)
-                        if not self._is_user_message(prev_msg):
-                            trigger = self._extract_message_content(prev_msg)
-                            response = self._extract_message_content(current_msg)
+                        if not prev_is_user:
+                            msg_time = parse_ts(current_msg.get('createdDateTime', ''))
+                            if msg_time.timestamp() < cutoff_ts:
+                                continue
+
+                            trigger = extract(prev_msg)
+                            response = extract(current_msg)
 
                             # Skip if either is empty
                             if not trigger or not response:
                                 continue
 
-                            msg_time = self._parse_timestamp(current_msg.get('createdDateTime', ''))
                             message_id = current_msg.get('id') or ''
 
-                            if msg_time >= cutoff_date:
-                                metadata = {
-                                    'chat_id': chat_id,
-                                    'timestamp': msg_time.isoformat(),
-                                    'chat_type': chat.get('chatType', 'unknown'),
-                                    'prev_message_id': prev_msg.get('id') or '',
-                                }
-
-                                # MongoDB upsert (deduplicated by message_id)
-                                if mongo_store and mongo_store.is_available() and message_id:
-                                    inserted = await mongo_store.upsert_sample(
-                                        message_id=message_id,
-                                        user_email=self.ai.user_email,
-                                        source='teams',
-                                        context_type='chat',
-                                        trigger=trigger,
-                                        response=response,
-                                        timestamp=msg_time,
-                                        metadata=metadata,
-                                    )
-                                    if not inserted:
-                                        continue  # already stored, skip in-memory add too
-
-                                # Add to in-memory list for profile computation
-                                self.ai.add_communication_sample(
+                            metadata = {
+                                'chat_id': chat_id,
+                                'timestamp': msg_time.isoformat(),
+                                'chat_type': chat.get('chatType', 'unknown'),
+                                'prev_message_id': prev_msg.get('id') or '',
+                            }
+
+                            # MongoDB upsert (deduplicated by message_id)
+                            if use_mongo and message_id:
+                                inserted = await mongo_store.upsert_sample(
+                                    message_id=message_id,
+                                    user_email=user_email,
                                     source='teams',
                                     context_type='chat',
                                     trigger=trigger,
                                     response=response,
+                                    timestamp=msg_time,
                                     metadata=metadata,
                                 )
-                                samples_collected += 1
+                                if not inserted:
+                                    continue  # already stored, skip in-memory add too
+
+                            # Queue for the in-memory list used for profile computation
+                            pending.append(dict(
+                                source='teams',
+                                context_type='chat',
+                                trigger=trigger,
+                                response=response,
+                                metadata=metadata,
+                            ))
+                            samples_collected += 1
 
             print(f"\n   ✓ Collected {samples_collected} Teams chat samples")
             return samples_collected
@@ -233,6 +312,9 @@ class AsyncTeamsDataCollector(TeamsDataCollector):
             import traceback
             traceback.print_exc()
             return samples_collected
+        finally:
+            if pending:
+                self.ai.add_communication_samples(pending)
 
 
 def _load_last_collected() -> Optional[datetime]:
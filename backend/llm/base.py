@@ -8,7 +8,7 @@ calling Ollama or cloud APIs directly.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Generator, Iterator, Optional
 
 
 @dataclass
@@ -18,6 +18,9 @@ class LLMOptions:
     max_tokens: int = 300
     # Provider-specific extras (e.g. Ollama's num_ctx, Anthropic's top_k)
     extra: Dict[str, Any] = field(default_factory=dict)
+    # How long a local model stays loaded after the call (Ollama keep_alive,
+    # e.g. "10m"); keeps its prompt-prefix cache warm. Ignored by cloud providers.
+    keep_alive: Optional[str] = None
 
 
 class LLMProvider(ABC):
@@ -50,6 +53,26 @@ class LLMProvider(ABC):
         Must NOT raise — catch all exceptions internally and return None.
         """
 
+    def generate_stream(
+        self,
+        prompt: str,
+        options: Optional[LLMOptions] = None,
+        timeout: int = 30,
+    ) -> Generator[str, None, bool]:
+        """Yield the completion text in chunks as it is produced.
+
+        Returns (as the generator's return value) True only if the model
+        finished the completion; a stream cut short by an error just stops,
+        so use TrackedStream to tell the two apart.
+        The default yields the whole generate() result as one chunk;
+        providers with native streaming override this.
+        Must NOT raise — yield nothing on failure.
+        """
+        result = self.generate(prompt, options, timeout)
+        if result:
+            yield result
+        return bool(result)
+
     @property
     @abstractmethod
     def provider_name(self) -> str:
@@ -59,3 +82,18 @@ class LLMProvider(ABC):
     @abstractmethod
     def model_name(self) -> str:
         """The specific model being used, e.g. 'llama3.2', 'gpt-4o-mini'."""
+
+
+class TrackedStream:
+    """Iterate a generate_stream() generator and keep its completion flag.
+
+    `completed` is False until the stream finishes and reports that the
+    model's answer is complete (plain iterators never do).
+    """
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self.completed = False
+
+    def __iter__(self) -> Iterator[str]:
+        self.completed = bool((yield from self._chunks))
@@ -6,7 +6,7 @@ module is preserved untouched (other code may import it directly).
 """
 
 import logging
-from typing import Optional
+from typing import Generator, Optional
 
 from backend.llm.base import LLMOptions, LLMProvider
 
@@ -52,7 +52,29 @@ class OllamaProvider(LLMProvider):
                 host=self._host,
                 options={"temperature": opts.temperature, "num_predict": opts.max_tokens, **opts.extra},
                 timeout=timeout,
+                keep_alive=opts.keep_alive,
             )
         except Exception as e:
             logger.warning(f"OllamaProvider.generate failed: {e}")
             return None
+
+    def generate_stream(
+        self,
+        prompt: str,
+        options: Optional[LLMOptions] = None,
+        timeout: int = 30,
+    ) -> Generator[str, None, bool]:
+        try:
+            from backend.ai.ollama_client import generate_stream
+            opts = options or LLMOptions()
+            return (yield from generate_stream(
+                prompt=prompt,
+                model=self._model,
+                host=self._host,
+                options={"temperature": opts.temperature, "num_predict": opts.max_tokens, **opts.extra},
+                timeout=timeout,
+                keep_alive=opts.keep_alive,
+            ))
+        except Exception as e:
+            logger.warning(f"OllamaProvider.generate_stream failed: {e}")
+            return False
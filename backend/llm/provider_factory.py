@@ -15,9 +15,9 @@ Call reset_provider_cache() in tests that need to change the provider mid-test.
 """
 
 import logging
-from typing import List, Optional
+from typing import Generator, List, Optional
 
-from backend.llm.base import LLMOptions, LLMProvider
+from backend.llm.base import LLMOptions, LLMProvider, TrackedStream
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +62,39 @@ class ProviderChain:
         logger.warning("All LLM providers failed or unavailable — returning None")
         return None
 
+    def generate_stream(
+        self,
+        prompt: str,
+        options: Optional[LLMOptions] = None,
+        timeout: int = 30,
+    ) -> Generator[str, None, bool]:
+        """Stream from the first provider that yields any output.
+
+        Falls back to the next provider only if one produces nothing; once
+        chunks have been yielded the stream is committed to that provider,
+        and its completion flag is returned.
+        """
+        for provider in self._providers:
+            if not provider.is_available():
+                logger.debug(f"LLM provider '{provider.provider_name}' unavailable, skipping")
+                continue
+            stream = getattr(provider, "generate_stream", None)
+            if stream is None:
+                result = provider.generate(prompt, options, timeout)
+                if result:
+                    yield result
+                    return True
+                continue
+            chunks = TrackedStream(stream(prompt, options, timeout))
+            produced = False
+            for chunk in chunks:
+                produced = True
+                yield chunk
+            if produced:
+                return chunks.completed
+        logger.warning("All LLM providers failed or unavailable — empty stream")
+        return False
+
 
 def _build_chain() -> ProviderChain:
     """Build provider chain from configuration."""
@@ -6,42 +6,115 @@ Reads and analyzes exported Teams chat data from DuckDB files
 
 import duckdb
 import os
+import re
 import sys
 from datetime import datetime
 import glob
+from html import unescape
 
 # Add project root for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+try:
+    from backend.utils.text_utils import clean_html_tags
+except ImportError:
+    # Run standalone without the backend package on the path
+    _HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+    def clean_html_tags(text: str) -> str:
+        if not text:
+            return ""
+        return ' '.join(unescape(_HTML_TAG_RE.sub('', text)).split())
+
+# Message content with tags stripped and whitespace collapsed inside DuckDB, so
+# only cleaned text is materialized in Python; entities are decoded afterwards
+# by _decode_entities
+_CLEAN_CONTENT_SQL = r"trim(regexp_replace(regexp_replace(content, '<[^>]+>', '', 'g'), '\s+', ' ', 'g'))"
+
+# chat_metadata columns read by the analyzer, named as in the export schema
+_METADATA_COLUMNS = (
+    'chat_id',
+    'chat_topic',
+    'chat_type',
+    'created_datetime',
+    'last_updated_datetime',
+    'export_datetime',
+    'total_messages',
+)
+
+# Rows pulled from DuckDB per fetch while printing a timeline
+_TIMELINE_BATCH_SIZE = 1000
+
+
+def _decode_entities(text: str) -> str:
+    """Finish cleaning _CLEAN_CONTENT_SQL output: decode HTML entities (&nbsp; included)
+
+    Whitespace is always collapsed again here: DuckDB's '\\s' and trim()
+    only cover ASCII, so a literal U+00A0 in the content survives them.
+    """
+    if not text:
+        return ""
+    if '&' in text:
+        text = unescape(text)
+    return ' '.join(text.split())
+
 class ChatAnalyzer:
-    def __init__(self, db_path: str):
-        """Initialize the analyzer with a DuckDB file path"""
+    def __init__(self, db_path: str, threads: int = None, memory_limit: str = None):
+        """Initialize the analyzer with a DuckDB file path
+
+        threads and memory_limit (e.g. '4GB') override DuckDB's defaults of
+        all hardware threads and 80% of RAM.
+        """
         if not os.path.exists(db_path):
             raise FileNotFoundError(f"Database file not found: {db_path}")
         
+        config = {}
+        if threads:
+            config['threads'] = threads
+        if memory_limit:
+            config['memory_limit'] = memory_limit
+        
         self.db_path = db_path
-        self.conn = duckdb.connect(db_path, read_only=True)
+        self.conn = duckdb.connect(db_path, read_only=True, config=config)
+        self._activity_ready = False
         self._load_metadata()
     
     def _load_metadata(self):
         """Load chat metadata from the database"""
         try:
-            result = self.conn.execute("SELECT * FROM chat_metadata").fetchone()
-            if result:
-                self.metadata = {
-                    'chat_id': result[0],
-                    'chat_topic': result[1],
-                    'chat_type': result[2],
-                    'created_datetime': result[3],
-                    'last_updated_datetime': result[4],
-                    'export_datetime': result[5],
-                    'total_messages': result[6]
-                }
-            else:
-                self.metadata = {}
+            result = self.conn.execute(f"""
+                SELECT {', '.join(_METADATA_COLUMNS)}
+                FROM chat_metadata
+            """).fetchone()
+            self.metadata = dict(zip(_METADATA_COLUMNS, result)) if result else {}
         except Exception:
             self.metadata = {}
     
+    def _activity(self) -> str:
+        """Name of a temp table of per-day, per-hour, per-sender message counts.
+
+        Built with one scan of chat_messages on first use; the summary, sender,
+        daily and hourly reports all roll it up instead of rescanning messages.
+        """
+        if not self._activity_ready:
+            self.conn.execute("""
+                CREATE TEMP TABLE _activity AS
+                SELECT 
+                    DATE(created_datetime) as date,
+                    EXTRACT(HOUR FROM created_datetime) as hour,
+                    sender_name,
+                    COUNT(*) as messages,
+                    SUM(LENGTH(content)) as total_length,
+                    COUNT(content) as with_content,
+                    MIN(created_datetime) as first_message,
+                    MAX(created_datetime) as last_message
+                FROM chat_messages
+                WHERE is_deleted = false
+                GROUP BY ALL
+            """)
+            self._activity_ready = True
+        return "_activity"
+    
     def show_summary(self):
         """Display a summary of the chat"""
         print("=" * 60)
@@ -57,15 +130,14 @@ class ChatAnalyzer:
             print(f"Total Messages: {self.metadata.get('total_messages', 'Unknown')}")
         
         # Get basic statistics
-        stats = self.conn.execute("""
+        stats = self.conn.execute(f"""
             SELECT 
-                COUNT(*) as total_messages,
+                COALESCE(SUM(messages), 0) as total_messages,
                 COUNT(DISTINCT sender_name) as unique_senders,
-                MIN(created_datetime) as first_message,
-                MAX(created_datetime) as last_message,
-                AVG(LENGTH(content)) as avg_message_length
-            FROM chat_messages
-            WHERE is_deleted = false
+                MIN(first_message) as first_message,
+                MAX(last_message) as last_message,
+                SUM(total_length) / SUM(with_content) as avg_message_length
+            FROM {self._activity()}
         """).fetchone()
         
         if stats:
@@ -83,15 +155,14 @@ class ChatAnalyzer:
         print("\nSENDER STATISTICS")
         print("-" * 40)
         
-        result = self.conn.execute("""
+        result = self.conn.execute(f"""
             SELECT 
                 sender_name,
-                COUNT(*) as message_count,
-                AVG(LENGTH(content)) as avg_length,
-                MIN(created_datetime) as first_message,
-                MAX(created_datetime) as last_message
-            FROM chat_messages 
-            WHERE is_deleted = false
+                SUM(messages) as message_count,
+                SUM(total_length) / SUM(with_content) as avg_length,
+                MIN(first_message) as first_message,
+                MAX(last_message) as last_message
+            FROM {self._activity()}
             GROUP BY sender_name 
             ORDER BY message_count DESC
         """).fetchall()
@@ -109,15 +180,14 @@ class ChatAnalyzer:
         print(f"\nDAILY ACTIVITY (Last {days} days)")
         print("-" * 40)
         
-        result = self.conn.execute("""
+        result = self.conn.execute(f"""
             SELECT 
-                DATE(created_datetime) as date,
-                COUNT(*) as messages,
+                date,
+                SUM(messages) as messages,
                 COUNT(DISTINCT sender_name) as active_senders
-            FROM chat_messages 
-            WHERE is_deleted = false 
-                AND created_datetime >= CURRENT_DATE - INTERVAL ? DAY
-            GROUP BY DATE(created_datetime) 
+            FROM {self._activity()}
+            WHERE date >= CURRENT_DATE - CAST(? AS INTEGER)
+            GROUP BY date 
             ORDER BY date DESC
         """, [days]).fetchall()
         
@@ -132,22 +202,29 @@ class ChatAnalyzer:
         print(f"\nSEARCH RESULTS for '{keyword}' (showing top {limit})")
         print("-" * 60)
         
-        result = self.conn.execute("""
+        # Plain keywords are a substring test; only keep LIKE when the user
+        # typed their own wildcards
+        if '%' in keyword or '_' in keyword:
+            match, pattern = "LOWER(content) LIKE LOWER(?)", f'%{keyword}%'
+        else:
+            match, pattern = "contains(LOWER(content), LOWER(?))", keyword
+        
+        result = self.conn.execute(f"""
             SELECT 
                 sender_name,
                 created_datetime,
-                content
+                {_CLEAN_CONTENT_SQL}
             FROM chat_messages 
-            WHERE LOWER(content) LIKE LOWER(?) 
+            WHERE {match} 
                 AND is_deleted = false
             ORDER BY created_datetime DESC
             LIMIT ?
-        """, [f'%{keyword}%', limit]).fetchall()
+        """, [pattern, limit]).fetchall()
         
         if result:
             for i, row in enumerate(result, 1):
                 timestamp = row[1].strftime('%Y-%m-%d %H:%M:%S') if row[1] else 'Unknown'
-                clean_content = self._clean_html_tags(row[2]) if row[2] else ""
+                clean_content = _decode_entities(row[2])
                 
                 if len(clean_content) > 200:
                     clean_content = clean_content[:200] + "..."
@@ -162,21 +239,21 @@ class ChatAnalyzer:
         print("\nHOURLY ACTIVITY PATTERN")
         print("-" * 30)
         
-        result = self.conn.execute("""
+        result = self.conn.execute(f"""
             SELECT 
-                EXTRACT(HOUR FROM created_datetime) as hour,
-                COUNT(*) as messages
-            FROM chat_messages 
-            WHERE is_deleted = false
-            GROUP BY EXTRACT(HOUR FROM created_datetime)
+                hour,
+                SUM(messages) as messages
+            FROM {self._activity()}
+            GROUP BY hour
             ORDER BY hour
         """).fetchall()
         
         if result:
+            scale = max(1, max(r[1] for r in result) // 20)
             for row in result:
                 hour = int(row[0])
                 count = row[1]
-                bar = "█" * (count // max(1, max([r[1] for r in result]) // 20))
+                bar = "█" * (count // scale)
                 print(f"{hour:2d}:00 - {hour+1:2d}:00 │ {count:4d} {bar}")
     
     def export_to_csv(self, output_file: str = None):
@@ -185,33 +262,36 @@ class ChatAnalyzer:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             output_file = f"chat_export_{timestamp}.csv"
         
-        result = self.conn.execute("""
-            SELECT 
-                message_id,
-                sender_name,
-                sender_email,
-                created_datetime,
-                content,
-                message_type,
-                is_deleted
-            FROM chat_messages 
-            ORDER BY created_datetime
-        """).fetchdf()
+        # COPY streams straight from DuckDB to disk and reports the row count
+        (total,) = self.conn.execute("""
+            COPY (
+                SELECT 
+                    message_id,
+                    sender_name,
+                    sender_email,
+                    created_datetime,
+                    content,
+                    message_type,
+                    is_deleted
+                FROM chat_messages 
+                ORDER BY created_datetime
+            ) TO ? (HEADER, FORMAT CSV)
+        """, [output_file]).fetchone()
         
-        result.to_csv(output_file, index=False)
         print(f"\nMessages exported to: {output_file}")
-        print(f"Total records: {len(result)}")
+        print(f"Total records: {total}")
     
     def get_message_timeline(self, sender: str = None):
         """Get chronological timeline of messages"""
         print(f"\nMESSAGE TIMELINE" + (f" for {sender}" if sender else ""))
         print("-" * 50)
         
-        query = """
+        # Timestamps are formatted by DuckDB so no datetime objects are built
+        query = f"""
             SELECT 
                 sender_name,
-                created_datetime,
-                content
+                COALESCE(strftime(created_datetime, '%Y-%m-%d %H:%M:%S'), 'Unknown'),
+                {_CLEAN_CONTENT_SQL}
             FROM chat_messages 
             WHERE is_deleted = false
         """
@@ -223,32 +303,19 @@ class ChatAnalyzer:
         
         query += " ORDER BY created_datetime"
         
-        result = self.conn.execute(query, params).fetchall()
-        
-        for row in result:
-            timestamp = row[1].strftime('%Y-%m-%d %H:%M:%S') if row[1] else 'Unknown'
-            
-            # Clean HTML tags from content
-            content = self._clean_html_tags(row[2]) if row[2] else ""
-            
-            # Show complete message wrapped in braces
-            print(f"{timestamp} - {row[0]}: {{{content}}}")
+        # Stream rows in batches rather than materializing the whole chat, and
+        # write each batch with a single call. HTML tags were already stripped
+        # in the query; each message is shown complete, wrapped in braces
+        cursor = self.conn.execute(query, params)
+        while rows := cursor.fetchmany(_TIMELINE_BATCH_SIZE):
+            sys.stdout.write(''.join(
+                f"{timestamp} - {sender_name}: {{{_decode_entities(content)}}}\n"
+                for sender_name, timestamp, content in rows
+            ))
     
     def _clean_html_tags(self, text: str) -> str:
-        """Remove HTML tags and decode common HTML entities"""
-        try:
-            from backend.utils.text_utils import clean_html_tags
-            return clean_html_tags(text)
-        except ImportError:
-            import re
-            if not text:
-                return ""
-            text = re.sub(r'<[^>]+>', '', text)
-            for entity, replacement in {'&nbsp;': ' ', '&amp;': '&', '&lt;': '<', '&gt;': '>', '&quot;': '"', '&#39;': "'", '&apos;': "'"}.items():
-                text = text.replace(entity, replacement)
-            return ' '.join(text.split())
-        
-        return text
+        """Remove HTML tags and decode HTML entities"""
+        return clean_html_tags(text)
     
     def close(self):
         """Close the database connection"""
@@ -2,9 +2,12 @@
 # Licensed under the MIT License.
 
 # <UserAuthConfigSnippet>
+import asyncio
+import time
 from configparser import SectionProxy
 from datetime import datetime, timezone
-from typing import Optional
+from itertools import chain, pairwise
+from typing import AsyncIterator, Dict, List, Optional
 
 from azure.identity import DeviceCodeCredential
 try:
@@ -26,12 +29,84 @@ from msgraph.generated.models.recipient import Recipient
 from msgraph.generated.models.email_address import EmailAddress
 from msgraph.generated.chats.chats_request_builder import ChatsRequestBuilder
 from msgraph.generated.chats.item.messages.messages_request_builder import MessagesRequestBuilder as ChatMessagesRequestBuilder
+from msgraph.generated.models.chat_message_collection_response import ChatMessageCollectionResponse
+from msgraph.generated.models.conversation_member_collection_response import ConversationMemberCollectionResponse
+from msgraph.generated.models.o_data_errors.o_data_error import ODataError
+from msgraph_core.requests.batch_request_content import BatchRequestContent
+from msgraph_core.requests.batch_request_item import BatchRequestItem
+
+# Graph accepts at most 20 sub-requests per JSON $batch call
+GRAPH_BATCH_LIMIT = 20
+
+# Throttled $batch sub-requests are not retried by the SDK (the outer call
+# succeeds), so _batch_get resends them itself this many times, waiting as
+# long as their Retry-After asks (capped), before fetching them one by one
+GRAPH_BATCH_RETRIES = 2
+GRAPH_BATCH_RETRY_STATUSES = frozenset({429, 503, 504})
+GRAPH_BATCH_MAX_RETRY_WAIT_SECS = 30.0
+
+# How long get_teams_chats() reuses its last response (config: chatsCacheTtlSecs)
+CHATS_CACHE_TTL_SECS = 60.0
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Make a datetime comparable with Graph's: naive values are taken as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _odata_datetime(value: datetime) -> str:
+    """Format a datetime for an OData $filter (naive values are taken as UTC)."""
+    return _as_utc(value).astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
 
 class Graph:
     settings: SectionProxy
     device_code_credential: DeviceCodeCredential
     user_client: GraphServiceClient
 
+    # Fixed request configurations, built once and shared by every call (the
+    # SDK only reads them when building a request)
+    _USER_CONFIG = UserItemRequestBuilder.UserItemRequestBuilderGetRequestConfiguration(
+        # Only request specific properties using $select
+        query_parameters=UserItemRequestBuilder.UserItemRequestBuilderGetQueryParameters(
+            select=['id', 'displayName', 'mail', 'userPrincipalName']
+        )
+    )
+    _INBOX_CONFIG = MessagesRequestBuilder.MessagesRequestBuilderGetRequestConfiguration(
+        query_parameters=MessagesRequestBuilder.MessagesRequestBuilderGetQueryParameters(
+            # Only request specific properties
+            select=['from', 'isRead', 'receivedDateTime', 'subject'],
+            # Get at most 25 results
+            top=25,
+            # Sort by received time, newest first
+            orderby=['receivedDateTime DESC']
+        )
+    )
+    _CHATS_CONFIG = ChatsRequestBuilder.ChatsRequestBuilderGetRequestConfiguration(
+        query_parameters=ChatsRequestBuilder.ChatsRequestBuilderGetQueryParameters(
+            # Only request specific properties
+            select=['id', 'topic', 'chatType', 'createdDateTime', 'lastUpdatedDateTime'],
+            # Get at most 50 results (increased since we can't sort)
+            top=50
+        )
+    )
+    # Full history paging: newest created first, so messages come back as one
+    # contiguous sequence and paging can stop once it passes a cutoff
+    _MESSAGE_HISTORY_CONFIG = ChatMessagesRequestBuilder.MessagesRequestBuilderGetRequestConfiguration(
+        query_parameters=ChatMessagesRequestBuilder.MessagesRequestBuilderGetQueryParameters(
+            top=50,
+            orderby=['createdDateTime desc']
+        )
+    )
+    # Latest page of a chat's messages
+    _CHAT_MESSAGES_CONFIG = ChatMessagesRequestBuilder.MessagesRequestBuilderGetRequestConfiguration(
+        query_parameters=ChatMessagesRequestBuilder.MessagesRequestBuilderGetQueryParameters(
+            # Get at most 50 results
+            top=50
+        )
+    )
+
     def __init__(self, config: SectionProxy):
         self.settings = config
         client_id = self.settings['clientId']
@@ -52,6 +127,11 @@ class Graph:
             self.device_code_credential = DeviceCodeCredential(client_id, tenant_id=tenant_id)
 
         self.user_client = GraphServiceClient(self.device_code_credential, graph_scopes)
+
+        # Last get_teams_chats() response and when it was fetched (monotonic)
+        self._chats_cache_ttl = self.settings.getfloat('chatsCacheTtlSecs', fallback=CHATS_CACHE_TTL_SECS)
+        self._chats_cache = None
+        self._chats_cache_at = 0.0
 # </UserAuthConfigSnippet>
 
     # <GetUserTokenSnippet>
@@ -63,74 +143,164 @@ class Graph:
 
     # <GetUserSnippet>
     async def get_user(self):
-        # Only request specific properties using $select
-        query_params = UserItemRequestBuilder.UserItemRequestBuilderGetQueryParameters(
-            select=['id', 'displayName', 'mail', 'userPrincipalName']
-        )
-
-        request_config = UserItemRequestBuilder.UserItemRequestBuilderGetRequestConfiguration(
-            query_parameters=query_params
-        )
-
-        user = await self.user_client.me.get(request_configuration=request_config)
+        user = await self.user_client.me.get(request_configuration=self._USER_CONFIG)
         return user
     # </GetUserSnippet>
 
     # <GetInboxSnippet>
     async def get_inbox(self):
-        query_params = MessagesRequestBuilder.MessagesRequestBuilderGetQueryParameters(
-            # Only request specific properties
-            select=['from', 'isRead', 'receivedDateTime', 'subject'],
-            # Get at most 25 results
-            top=25,
-            # Sort by received time, newest first
-            orderby=['receivedDateTime DESC']
-        )
-        request_config = MessagesRequestBuilder.MessagesRequestBuilderGetRequestConfiguration(
-            query_parameters= query_params
-        )
-
         messages = await self.user_client.me.mail_folders.by_mail_folder_id('inbox').messages.get(
-                request_configuration=request_config)
+                request_configuration=self._INBOX_CONFIG)
         return messages
     # </GetInboxSnippet>
 
     # <GetTeamsChatsSnippet>
-    async def get_teams_chats(self):
-        query_params = ChatsRequestBuilder.ChatsRequestBuilderGetQueryParameters(
-            # Only request specific properties
-            select=['id', 'topic', 'chatType', 'createdDateTime', 'lastUpdatedDateTime'],
-            # Get at most 50 results (increased since we can't sort)
-            top=50
-        )
-        request_config = ChatsRequestBuilder.ChatsRequestBuilderGetRequestConfiguration(
-            query_parameters=query_params
-        )
+    async def get_teams_chats(self, refresh: bool = False):
+        """
+        List the user's chats, most recently active first.
+
+        The response is reused for chatsCacheTtlSecs (default 60s) so the
+        chat lookups below don't refetch the list on every call; pass
+        refresh=True to bypass it.
+        """
+        if (not refresh and self._chats_cache is not None
+                and time.monotonic() - self._chats_cache_at < self._chats_cache_ttl):
+            return self._chats_cache
 
-        chats = await self.user_client.chats.get(request_configuration=request_config)
+        chats = await self.user_client.chats.get(request_configuration=self._CHATS_CONFIG)
         
         # Sort manually after retrieving data
         if chats and chats.value:
             chats.value.sort(key=lambda x: x.last_updated_date_time if x.last_updated_date_time else x.created_date_time, reverse=True)
-        
+
+        self._chats_cache = chats
+        self._chats_cache_at = time.monotonic()
         return chats
     # </GetTeamsChatsSnippet>
 
     # <GetChatMessagesSnippet>
     async def get_chat_messages(self, chat_id: str):
-        query_params = ChatMessagesRequestBuilder.MessagesRequestBuilderGetQueryParameters(
-            # Get at most 50 results
-            top=50
-        )
-        request_config = ChatMessagesRequestBuilder.MessagesRequestBuilderGetRequestConfiguration(
-            query_parameters=query_params
-        )
-
         messages = await self.user_client.chats.by_chat_id(chat_id).messages.get(
-            request_configuration=request_config)
+            request_configuration=self._CHAT_MESSAGES_CONFIG)
         return messages
     # </GetChatMessagesSnippet>
 
+    # <BatchGetSnippet>
+    async def _batch_get(self, request_infos: Dict[str, object], response_type) -> Dict[str, object]:
+        """
+        Send GET requests through JSON $batch, GRAPH_BATCH_LIMIT per call,
+        with the batch calls themselves in flight together.
+
+        Throttled sub-requests (429/503/504) are resent after their
+        Retry-After, up to GRAPH_BATCH_RETRIES times; any still throttled,
+        or whose whole batch call failed, are then sent as single GETs
+        through the SDK's own retry handling.
+
+        Returns the parsed responses keyed like request_infos. Keys whose
+        request failed for good (e.g. 403/404) are left out.
+        """
+
+        async def send(chunk):
+            """(results, keys to retry, seconds to wait) for one batch call"""
+            content = BatchRequestContent()
+            for n, key in enumerate(chunk):
+                # The item keeps its own id (a random one unless given), not add_request's
+                content.add_request(str(n), BatchRequestItem(request_infos[key], id=str(n)))
+
+            try:
+                batch_response = await self.user_client.batch.post(batch_request_content=content)
+            except Exception as e:
+                print(f"Error sending batched requests: {e}")
+                return {}, chunk, 0.0
+
+            status_codes = batch_response.get_response_status_codes()
+            results, retry, wait = {}, [], 0.0
+            for n, key in enumerate(chunk):
+                status = status_codes.get(str(n))
+                if status in GRAPH_BATCH_RETRY_STATUSES:
+                    retry.append(key)
+                    wait = max(wait, self._retry_after(batch_response.get_response_by_id(str(n))))
+                    continue
+                if status != 200:
+                    continue
+                try:
+                    results[key] = batch_response.get_response_by_id(str(n), response_type)
+                except ValueError as e:
+                    print(f"Error reading batched response for {key}: {e}")
+            return results, retry, wait
+
+        responses = {}
+        pending = list(request_infos)
+        for attempt in range(GRAPH_BATCH_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(wait)
+            chunks = [pending[start:start + GRAPH_BATCH_LIMIT]
+                      for start in range(0, len(pending), GRAPH_BATCH_LIMIT)]
+            pending, wait = [], 0.0
+            for results, retry, retry_wait in await asyncio.gather(*(send(chunk) for chunk in chunks)):
+                responses.update(results)
+                pending.extend(retry)
+                wait = max(wait, retry_wait)
+            if not pending:
+                return responses
+
+        # Still throttled (or the batch call kept failing): one GET per key
+        singles = await asyncio.gather(*(self._get_one(request_infos[key], response_type) for key in pending))
+        responses.update((key, response) for key, response in zip(pending, singles) if response is not None)
+        return responses
+
+    @staticmethod
+    def _retry_after(item) -> float:
+        """Seconds a throttled batch sub-response asks us to wait (1s if unset)"""
+        headers = getattr(item, 'headers', None) or {}
+        value = next((v for k, v in headers.items() if k.lower() == 'retry-after'), None)
+        try:
+            seconds = float(value) if value is not None else 1.0
+        except (TypeError, ValueError):
+            seconds = 1.0
+        return min(max(seconds, 0.0), GRAPH_BATCH_MAX_RETRY_WAIT_SECS)
+
+    async def _get_one(self, request_info, response_type):
+        """Send one request outside $batch so the SDK's retry handler covers it"""
+        try:
+            return await self.user_client.request_adapter.send_async(
+                request_info, response_type, {"XXX": ODataError})
+        except Exception as e:
+            print(f"Error fetching {request_info.url_template}: {e}")
+            return None
+
+    async def _members_by_chat(self, chats) -> Dict[str, object]:
+        """Member lists for many chats via $batch; chats we can't read are left out"""
+        return await self._batch_get(
+            {chat.id: self.user_client.chats.by_chat_id(chat.id).members.to_get_request_information()
+             for chat in chats},
+            ConversationMemberCollectionResponse,
+        )
+
+    async def _recent_messages_by_chat(self, chats) -> Dict[str, object]:
+        """Latest page of messages for many chats via $batch; failures are left out"""
+        return await self._batch_get(
+            {chat.id: self.user_client.chats.by_chat_id(chat.id).messages.to_get_request_information(
+                request_configuration=self._CHAT_MESSAGES_CONFIG)
+             for chat in chats},
+            ChatMessageCollectionResponse,
+        )
+
+    @staticmethod
+    def _has_member(members, person_name: str = None, person_email: str = None) -> bool:
+        """Whether a member's display name contains person_name or their email equals person_email"""
+        name = person_name.lower() if person_name else None
+        email = person_email.lower() if person_email else None
+        for member in (members.value if members else None) or ():
+            display_name = getattr(member, 'display_name', None)
+            if name and display_name and name in display_name.lower():
+                return True
+            member_email = getattr(member, 'email', None)
+            if email and member_email and email == member_email.lower():
+                return True
+        return False
+    # </BatchGetSnippet>
+
     # <SendMailSnippet>
     async def send_mail(self, subject: str, body: str, recipient: str):
         message = Message()
@@ -156,31 +326,87 @@ class Graph:
     async def get_one_on_one_chats_with_person(self, person_name: str = None, person_email: str = None):
         # Get all chats first
         chats = await self.get_teams_chats()
-        one_on_one_chats = []
-        
-        if chats and chats.value:
-            for chat in chats.value:
-                # Only look at one-on-one chats
-                if chat.chat_type == 'oneOnOne':
-                    try:
-                        members = await self.user_client.chats.by_chat_id(chat.id).members.get()
-                        if members and members.value:
-                            for member in members.value:
-                                if hasattr(member, 'display_name') and member.display_name:
-                                    if person_name and person_name.lower() in member.display_name.lower():
-                                        one_on_one_chats.append(chat)
-                                        break
-                                if hasattr(member, 'email') and member.email:
-                                    if person_email and person_email.lower() == member.email.lower():
-                                        one_on_one_chats.append(chat)
-                                        break
-                    except Exception as e:
-                        continue
-        
-        return one_on_one_chats
+        if not chats or not chats.value:
+            return []
+
+        # Only look at one-on-one chats; their members come back in $batch calls
+        one_on_one = [chat for chat in chats.value if chat.chat_type == 'oneOnOne']
+        members_by_chat = await self._members_by_chat(one_on_one)
+        return [
+            chat for chat in one_on_one
+            if self._has_member(members_by_chat.get(chat.id), person_name, person_email)
+        ]
     # </GetOneOnOneChatsWithPersonSnippet>
 
     # <GetAllChatMessagesSnippet>
+    @staticmethod
+    def _reaches_cutoff(page, cutoff: datetime) -> bool:
+        """Whether a page holds a message created at or before cutoff"""
+        oldest = min((m.created_date_time for m in page if m.created_date_time), default=None)
+        return oldest is not None and _as_utc(oldest) <= cutoff
+
+    async def _iter_pages(self, chat_id: str, response, since_datetime: Optional[datetime] = None):
+        """
+        Yield each page of messages (newest created first), following next links.
+
+        With since_datetime, paging stops after the first page that reaches a
+        message created at or before it. That page is still yielded, so the
+        message just before the cutoff is there to pair with the first new one.
+
+        The next page is requested before the current one is yielded, so its
+        download overlaps with the caller's work on this page. A caller that
+        stops early cancels that one prefetch.
+        """
+        cutoff = _as_utc(since_datetime) if since_datetime is not None else None
+        next_page = None
+        try:
+            while response:
+                next_link = getattr(response, 'odata_next_link', None)
+                if cutoff is not None and response.value and self._reaches_cutoff(response.value, cutoff):
+                    next_link = None
+                if next_link:
+                    next_page = asyncio.create_task(
+                        self.user_client.chats.by_chat_id(chat_id).messages.with_url(next_link).get())
+                if response.value:
+                    yield response.value
+                if next_page is None:
+                    break
+                response = await next_page
+                next_page = None
+        except Exception as e:
+            print(f"Error fetching messages: {e}")
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def _iter_messages(self, chat_id: str, response, since_datetime: Optional[datetime] = None):
+        async for page in self._iter_pages(chat_id, response, since_datetime):
+            for message in page:
+                yield message
+
+    async def _page_chat_messages(self, chat_id: str, response, since_datetime: Optional[datetime] = None):
+        """Collect messages from a first-page response and any pages after it, oldest first."""
+        pages = []
+        total = 0
+
+        async for batch in self._iter_pages(chat_id, response, since_datetime):
+            # Pages arrive newest-first (createdDateTime desc): reverse each
+            # one here and chain the pages in reverse order below, no sort
+            pages.append(batch[::-1])
+            total += len(batch)
+            print(f"Fetched {len(batch)} messages... (Total: {total})")
+
+        all_messages = list(chain.from_iterable(reversed(pages)))
+
+        def created(message):
+            return _as_utc(message.created_date_time or datetime.min)
+
+        # Fallback if Graph ever breaks the ordering (e.g. a missing timestamp)
+        if any(created(a) > created(b) for a, b in pairwise(all_messages)):
+            all_messages.sort(key=created)
+
+        return all_messages
+
     async def get_all_chat_messages(self, chat_id: str, since_datetime: Optional[datetime] = None):
         """
         Fetch all messages from a chat, optionally stopping when messages older
@@ -189,88 +415,107 @@ class Graph:
         Args:
             chat_id: Teams chat ID
             since_datetime: If provided, stop paginating once messages are older
-                            than this timestamp (must be timezone-aware).
+                            than this timestamp. The last page fetched also
+                            holds some older messages, so callers keep their
+                            own cutoff check.
         """
-        all_messages = []
-        next_link = None
-
         try:
-            while True:
-                if next_link:
-                    response = await self.user_client.chats.by_chat_id(chat_id).messages.with_url(next_link).get()
-                else:
-                    query_params = ChatMessagesRequestBuilder.MessagesRequestBuilderGetQueryParameters(
-                        top=50
-                    )
-                    request_config = ChatMessagesRequestBuilder.MessagesRequestBuilderGetRequestConfiguration(
-                        query_parameters=query_params
-                    )
-                    response = await self.user_client.chats.by_chat_id(chat_id).messages.get(
-                        request_configuration=request_config)
-
-                if response and response.value:
-                    batch = response.value
-                    all_messages.extend(batch)
-                    print(f"Fetched {len(batch)} messages... (Total: {len(all_messages)})")
-
-                    # Early termination: API returns newest-first. If the oldest
-                    # message in this batch is older than the cutoff, stop paging.
-                    if since_datetime is not None:
-                        oldest_in_batch = min(
-                            (m.created_date_time for m in batch if m.created_date_time),
-                            default=None
-                        )
-                        if oldest_in_batch is not None:
-                            # Ensure both are timezone-aware for comparison
-                            cutoff = since_datetime
-                            if cutoff.tzinfo is None:
-                                cutoff = cutoff.replace(tzinfo=timezone.utc)
-                            if oldest_in_batch.tzinfo is None:
-                                oldest_in_batch = oldest_in_batch.replace(tzinfo=timezone.utc)
-                            if oldest_in_batch <= cutoff:
-                                break
+            response = await self.user_client.chats.by_chat_id(chat_id).messages.get(
+                request_configuration=self._MESSAGE_HISTORY_CONFIG)
+        except Exception as e:
+            print(f"Error fetching messages: {e}")
+            return []
 
-                if hasattr(response, 'odata_next_link') and response.odata_next_link:
-                    next_link = response.odata_next_link
-                else:
-                    break
+        return await self._page_chat_messages(chat_id, response, since_datetime)
+    # </GetAllChatMessagesSnippet>
 
+    # <GetChatMessagesBatchSnippet>
+    async def iter_chat_messages(self, chat_id: str, since_datetime: Optional[datetime] = None):
+        """
+        Stream a chat's messages newest first, one page in memory at a time.
+        Stops paging at since_datetime like get_all_chat_messages().
+        """
+        try:
+            response = await self.user_client.chats.by_chat_id(chat_id).messages.get(
+                request_configuration=self._MESSAGE_HISTORY_CONFIG)
         except Exception as e:
             print(f"Error fetching messages: {e}")
+            return
+
+        async for message in self._iter_messages(chat_id, response, since_datetime):
+            yield message
+
+    async def iter_chat_messages_batch(
+        self, chat_ids: List[str], since_datetime: Optional[datetime] = None
+    ) -> Dict[str, AsyncIterator]:
+        """
+        Start newest-first message streams for many chats, requesting the
+        first page of up to GRAPH_BATCH_LIMIT chats per JSON $batch call.
+
+        Later pages are only fetched as each stream is consumed, and stop at
+        since_datetime like get_all_chat_messages(). Chats whose sub-request
+        failed are left out of the result so the caller can fetch them one
+        by one.
+        """
+        first_pages = await self._batch_get(
+            {chat_id: self.user_client.chats.by_chat_id(chat_id).messages.to_get_request_information(
+                request_configuration=self._MESSAGE_HISTORY_CONFIG)
+             for chat_id in chat_ids},
+            ChatMessageCollectionResponse,
+        )
 
-        # Sort oldest-first for processing
-        if all_messages:
-            all_messages.sort(key=lambda x: x.created_date_time if x.created_date_time else datetime.min)
+        return {
+            chat_id: self._iter_messages(chat_id, response, since_datetime)
+            for chat_id, response in first_pages.items()
+        }
+    # </GetChatMessagesBatchSnippet>
+
+    # <GetSentMessagesSnippet>
+    async def get_sent_messages(self, since_datetime: datetime):
+        """
+        Fetch sent mail newer than since_datetime. The date filter and the
+        field list are applied by Graph, so older mail is never downloaded.
+        """
+        query_params = MessagesRequestBuilder.MessagesRequestBuilderGetQueryParameters(
+            filter=f"sentDateTime ge {_odata_datetime(since_datetime)}",
+            select=['id', 'subject', 'body', 'sentDateTime', 'from', 'toRecipients', 'isRead'],
+            orderby=['sentDateTime DESC'],
+            top=100
+        )
+        request_config = MessagesRequestBuilder.MessagesRequestBuilderGetRequestConfiguration(
+            query_parameters=query_params
+        )
+
+        messages_builder = self.user_client.me.mail_folders.by_mail_folder_id('sentitems').messages
+        all_messages = []
+
+        try:
+            response = await messages_builder.get(request_configuration=request_config)
+            while response:
+                if response.value:
+                    all_messages.extend(response.value)
+                if not response.odata_next_link:
+                    break
+                response = await messages_builder.with_url(response.odata_next_link).get()
+        except Exception as e:
+            print(f"Error fetching sent messages: {e}")
 
         return all_messages
-    # </GetAllChatMessagesSnippet>
+    # </GetSentMessagesSnippet>
 
     # <GetChatsWithPersonSnippet>
     async def get_chats_with_person(self, person_name: str = None, person_email: str = None):
         # Get all chats first
         chats = await self.get_teams_chats()
-        matching_chats = []
-        
-        if chats and chats.value:
-            for chat in chats.value:
-                # Get chat members to check if the person is in the chat
-                try:
-                    members = await self.user_client.chats.by_chat_id(chat.id).members.get()
-                    if members and members.value:
-                        for member in members.value:
-                            if hasattr(member, 'display_name') and member.display_name:
-                                if person_name and person_name.lower() in member.display_name.lower():
-                                    matching_chats.append(chat)
-                                    break
-                            if hasattr(member, 'email') and member.email:
-                                if person_email and person_email.lower() == member.email.lower():
-                                    matching_chats.append(chat)
-                                    break
-                except Exception as e:
-                    # Skip chats where we can't get members (permissions issue)
-                    continue
-        
-        return matching_chats
+        if not chats or not chats.value:
+            return []
+
+        # Chats whose members we can't read (permissions issue) are skipped
+        members_by_chat = await self._members_by_chat(chats.value)
+        return [
+            chat for chat in chats.value
+            if self._has_member(members_by_chat.get(chat.id), person_name, person_email)
+        ]
     # </GetChatsWithPersonSnippet>
 
     # <GetChatsAddressedToMeSnippet>
@@ -278,37 +523,44 @@ class Graph:
         # Get current user info
         current_user = await self.get_user()
         current_user_email = current_user.mail or current_user.user_principal_name
+        # Lower-cased name/email to look for in message bodies, built once
+        needles = [value.lower() for value in (current_user.display_name, current_user_email) if value]
         
         # Get all chats
         chats = await self.get_teams_chats()
         addressed_chats = []
         
         if chats and chats.value:
+            # Recent messages for every chat, in $batch calls; chats we can't
+            # read are skipped
+            messages_by_chat = await self._recent_messages_by_chat(chats.value)
             for chat in chats.value:
-                try:
-                    # Get recent messages from this chat
-                    messages = await self.get_chat_messages(chat.id)
-                    if messages and messages.value:
-                        # Check if any recent message mentions the current user
-                        for message in messages.value:
-                            if message.body and message.body.content:
-                                content = message.body.content.lower()
-                                user_name = current_user.display_name.lower() if current_user.display_name else ""
-                                
-                                # Check if user is mentioned by name or email
-                                if (user_name and user_name in content) or \
-                                   (current_user_email and current_user_email.lower() in content) or \
-                                   f"@{current_user.display_name}" in message.body.content if current_user.display_name else False:
-                                    addressed_chats.append({
-                                        'chat': chat,
-                                        'mentioning_message': message
-                                    })
-                                    break
-                except Exception as e:
-                    # Skip chats where we can't get messages
-                    continue
+                messages = messages_by_chat.get(chat.id)
+                if messages and messages.value:
+                    # Check if any recent message mentions the current user
+                    for message in messages.value:
+                        if self._mentions_user(message, current_user.id, needles):
+                            addressed_chats.append({
+                                'chat': chat,
+                                'mentioning_message': message
+                            })
+                            break
         
         return addressed_chats
+
+    @staticmethod
+    def _mentions_user(message, user_id: str, needles: List[str]) -> bool:
+        """Whether a message @mentions user_id, or its body contains one of needles"""
+        # Structured @mentions carry the user id, so no body scan is needed
+        for mention in getattr(message, 'mentions', None) or ():
+            user = getattr(getattr(mention, 'mentioned', None), 'user', None)
+            if user_id and user is not None and getattr(user, 'id', None) == user_id:
+                return True
+
+        if not (needles and message.body and message.body.content):
+            return False
+        content = message.body.content.lower()
+        return any(needle in content for needle in needles)
     # </GetChatsAddressedToMeSnippet>
 
     # <SearchChatsSnippet>
@@ -318,31 +570,34 @@ class Graph:
         matching_chats = []
         
         if chats and chats.value:
+            keyword_lower = keyword.lower()
+            # Messages are only fetched (in $batch calls) for chats whose topic doesn't match
+            unmatched = [chat for chat in chats.value
+                         if not (chat.topic and keyword_lower in chat.topic.lower())]
+            messages_by_chat = await self._recent_messages_by_chat(unmatched)
+
             for chat in chats.value:
-                try:
-                    # Check chat topic first
-                    if chat.topic and keyword.lower() in chat.topic.lower():
-                        matching_chats.append({
-                            'chat': chat,
-                            'match_type': 'topic',
-                            'match_text': chat.topic
-                        })
-                        continue
-                    
-                    # Search in recent messages
-                    messages = await self.get_chat_messages(chat.id)
-                    if messages and messages.value:
-                        for message in messages.value:
-                            if message.body and message.body.content:
-                                if keyword.lower() in message.body.content.lower():
-                                    matching_chats.append({
-                                        'chat': chat,
-                                        'match_type': 'message',
-                                        'match_text': message.body.content[:100] + "..." if len(message.body.content) > 100 else message.body.content
-                                    })
-                                    break
-                except Exception as e:
+                # Check chat topic first
+                if chat.topic and keyword_lower in chat.topic.lower():
+                    matching_chats.append({
+                        'chat': chat,
+                        'match_type': 'topic',
+                        'match_text': chat.topic
+                    })
                     continue
+
+                # Search in recent messages
+                messages = messages_by_chat.get(chat.id)
+                if messages and messages.value:
+                    for message in messages.value:
+                        if message.body and message.body.content:
+                            if keyword_lower in message.body.content.lower():
+                                matching_chats.append({
+                                    'chat': chat,
+                                    'match_type': 'message',
+                                    'match_text': message.body.content[:100] + "..." if len(message.body.content) > 100 else message.body.content
+                                })
+                                break
         
         return matching_chats
     # </SearchChatsSnippet>
@@ -17,6 +17,19 @@ import glob
 # Add project root for config import
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+try:
+    from backend.utils.text_utils import clean_html_tags
+except ImportError:
+    # Run standalone without the backend package on the path
+    from html import unescape
+
+    _HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+    def clean_html_tags(text: str) -> str:
+        if not text:
+            return ""
+        return ' '.join(unescape(_HTML_TAG_RE.sub('', text)).split())
+
 
 class ChatResponsivenessAnalyzer:
     def __init__(
@@ -68,17 +81,8 @@ class ChatResponsivenessAnalyzer:
             self.metadata = {}
     
     def _clean_html_tags(self, text: str) -> str:
-        """Remove HTML tags and decode common HTML entities"""
-        try:
-            from backend.utils.text_utils import clean_html_tags
-            return clean_html_tags(text)
-        except ImportError:
-            if not text:
-                return ""
-            text = re.sub(r'<[^>]+>', '', text)
-            for entity, replacement in {'&nbsp;': ' ', '&amp;': '&', '&lt;': '<', '&gt;': '>', '&quot;': '"', '&#39;': "'", '&apos;': "'"}.items():
-                text = text.replace(entity, replacement)
-            return ' '.join(text.split())
+        """Remove HTML tags and decode HTML entities"""
+        return clean_html_tags(text)
 
     def _call_ollama(self, prompt: str) -> str:
         """Call the configured LLM provider with a prompt."""
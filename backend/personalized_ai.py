@@ -25,6 +25,7 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
 from collections import defaultdict
 import re
+import threading
 
 
 logger = logging.getLogger(__name__)
@@ -111,6 +112,8 @@ class PersonalizedAI:
         self.consent_given = self._check_consent()
         # When True, skip SQLite sample writes (MongoDB is the primary store)
         self._mongo_mode: bool = False
+        # Collectors may add samples from several threads at once
+        self._samples_lock = threading.Lock()
 
         if self.consent_given:
             self._load_samples()
@@ -291,6 +294,27 @@ class PersonalizedAI:
         except Exception as e:
             logger.error(f"Error saving sample to DB: {e}")
     
+    def _save_samples(self, samples: List[CommunicationSample]):
+        """Save many samples to SQLite in one transaction (skipped in MongoDB mode)."""
+        if self._mongo_mode:
+            return
+        try:
+            from backend.db.learning_store import save_samples
+            save_samples(self.user_email, [
+                {
+                    'sample_id': sample.id,
+                    'source': sample.source,
+                    'timestamp': sample.timestamp.isoformat(),
+                    'context_type': sample.context_type,
+                    'trigger_text': sample.trigger,
+                    'response_text': sample.response,
+                    'metadata': sample.metadata or {},
+                }
+                for sample in samples
+            ])
+        except Exception as e:
+            logger.error(f"Error saving samples to DB: {e}")
+    
     def _save_profile(self):
         """Save user profile to SQLite (skipped in MongoDB mode)."""
         if self._mongo_mode or not self.profile:
@@ -342,24 +366,77 @@ class PersonalizedAI:
             metadata=metadata or {}
         )
         
-        self.samples.append(sample)
-        self._save_sample(sample)
+        with self._samples_lock:
+            self.samples.append(sample)
+            self._save_sample(sample)
 
-        # Index into RAG vector store immediately (non-blocking; skips if unavailable)
-        try:
-            from backend.rag import get_indexer
-            get_indexer().index_sample(sample)
-        except Exception:
-            pass
+            # Index into RAG vector store immediately (non-blocking; skips if unavailable)
+            try:
+                from backend.rag import get_indexer
+                get_indexer().index_sample(sample)
+            except Exception:
+                pass
 
-        logger.info(f"Added communication sample from {source}/{context_type}")
+            logger.info(f"Added communication sample from {source}/{context_type}")
 
-        # Trigger learning update if we have enough samples
-        if len(self.samples) % 10 == 0:
-            self._update_profile()
+            # Trigger learning update if we have enough samples
+            if len(self.samples) % 10 == 0:
+                self._update_profile()
 
         return True
     
+    def add_communication_samples(self, samples: List[Dict]) -> int:
+        """
+        Add several communication samples at once
+        
+        Args:
+            samples: Dicts with the add_communication_sample() arguments
+                     (source, context_type, trigger, response, metadata)
+            
+        Returns:
+            Number of samples added
+        """
+        if not samples:
+            return 0
+        if not self.consent_given:
+            logger.warning("Consent not given. Cannot add samples.")
+            return 0
+        
+        now = datetime.now()
+        batch_id = now.timestamp()
+        new_samples = [
+            CommunicationSample(
+                id=f"{s['source']}_{batch_id}_{n}",
+                source=s['source'],
+                timestamp=now,
+                context_type=s['context_type'],
+                trigger=s['trigger'],
+                response=s['response'],
+                metadata=s.get('metadata') or {}
+            )
+            for n, s in enumerate(samples)
+        ]
+        
+        with self._samples_lock:
+            previous_count = len(self.samples)
+            self.samples.extend(new_samples)
+            # One SQLite transaction for the whole batch
+            self._save_samples(new_samples)
+
+            try:
+                from backend.rag import get_indexer
+                get_indexer().index_samples(new_samples)
+            except Exception:
+                pass
+
+            logger.info(f"Added {len(new_samples)} communication samples")
+
+            # Same cadence as add_communication_sample: refresh every 10 samples
+            if len(self.samples) // 10 > previous_count // 10:
+                self._update_profile()
+
+        return len(new_samples)
+    
     def _update_profile(self):
         """Update user profile based on collected samples"""
         logger.info("Updating user profile from samples...")
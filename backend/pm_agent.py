@@ -11,6 +11,7 @@ Usage:
     created, failed = await agent.create_all(plan)
 """
 
+import asyncio
 import json
 import logging
 import re
@@ -19,6 +20,9 @@ from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on in-flight create calls per hierarchy level
+_MAX_CONCURRENT_CREATES = 8
+
 
 # ---------------------------------------------------------------------------
 # Data model
@@ -323,36 +327,48 @@ Required JSON format:
         """
         created: List[WorkItemNode] = []
         failed: List[Tuple[WorkItemNode, str]] = []
+        # Siblings within a level don't depend on each other, so their create
+        # calls overlap; the semaphore keeps platform rate limits in reach.
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_CREATES)
+
+        async def create_one(node: WorkItemNode) -> Optional[str]:
+            """Create one node; returns None on success or the failure reason."""
+            parent_node: Optional[WorkItemNode] = None
+            if node.parent_index is not None:
+                parent_node = plan.items[node.parent_index]
+                # If parent failed (no platform_id), skip this child
+                if parent_node.platform_id is None:
+                    err = f"parent '{parent_node.title[:40]}' creation failed"
+                    if on_progress:
+                        await on_progress(node, f"skipped — {err}")
+                    return err
+
+            error: Optional[str] = None
+            try:
+                async with semaphore:
+                    success = await self._create_item(node, parent_node)
+                if success:
+                    status = f"created {node.platform_id or ''}"
+                else:
+                    error = "platform returned no result"
+                    status = "failed"
+            except Exception as e:
+                error = str(e)
+                status = f"error: {str(e)[:50]}"
+
+            if on_progress:
+                await on_progress(node, status)
+            return error
 
         # Process level by level to ensure parents exist before children
         for level in (0, 1, 2):
             level_items = [item for item in plan.items if item.level == level]
-            for node in level_items:
-                parent_node: Optional[WorkItemNode] = None
-                if node.parent_index is not None:
-                    parent_node = plan.items[node.parent_index]
-                    # If parent failed (no platform_id), skip this child
-                    if parent_node.platform_id is None:
-                        err = f"parent '{parent_node.title[:40]}' creation failed"
-                        failed.append((node, err))
-                        if on_progress:
-                            await on_progress(node, f"skipped — {err}")
-                        continue
-
-                try:
-                    success = await self._create_item(node, parent_node)
-                    if success:
-                        created.append(node)
-                        status = f"created {node.platform_id or ''}"
-                    else:
-                        failed.append((node, "platform returned no result"))
-                        status = "failed"
-                except Exception as e:
-                    failed.append((node, str(e)))
-                    status = f"error: {str(e)[:50]}"
-
-                if on_progress:
-                    await on_progress(node, status)
+            errors = await asyncio.gather(*(create_one(node) for node in level_items))
+            for node, error in zip(level_items, errors):
+                if error is None:
+                    created.append(node)
+                else:
+                    failed.append((node, error))
 
         return created, failed
 
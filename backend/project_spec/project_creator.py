@@ -143,34 +143,35 @@ class ProjectCreator:
                     s["_epic_id"] = epic_id
                 all_stories.extend(stories)
 
+            # Stories only parent to their feature, never to each other, so
+            # they can all go out in a single $batch request.
             sorted_stories = _topo_sort(all_stories)
-            created_ids: Dict[str, int] = {}
+            story_items: List[Dict[str, Any]] = []
             for story in sorted_stories:
                 title = story.get("title", "")
                 sprint_num = story.get("sprint", 1)
-                iter_path = sprint_paths.get(sprint_num)
                 sp = story.get("story_points")
-                assignee = story.get("assigned_to") or None
-                epic_id = story.get("_epic_id")
-
                 await self._notify(f"Creating story: {title}")
-                if not dry_run:
-                    wi = await client.create_work_item_with_story_points(
-                        title=title,
-                        story_points=float(sp) if sp is not None else None,
-                        description="\n".join(story.get("acceptance_criteria", [])),
-                        work_item_type="User Story",
-                        parent_id=epic_id,
-                        iteration_path=iter_path,
-                        assigned_to=assignee,
-                    )
+                story_items.append({
+                    "title": title,
+                    "story_points": float(sp) if sp is not None else None,
+                    "description": "\n".join(story.get("acceptance_criteria", [])),
+                    "parent_id": story.get("_epic_id"),
+                    "iteration_path": sprint_paths.get(sprint_num),
+                    "assigned_to": story.get("assigned_to") or None,
+                })
+
+            if not dry_run:
+                created = await client.create_work_items_batch(story_items, work_item_type="User Story")
+                for story, wi in zip(sorted_stories, created):
+                    title = story.get("title", "")
                     if wi:
-                        created_ids[story["id"]] = wi.id
                         results["stories"].append({"id": story["id"], "work_item_id": wi.id, "title": title})
                     else:
                         results["errors"].append(f"Failed to create story: {title}")
-                else:
-                    results["stories"].append({"id": story["id"], "work_item_id": "dry_run", "title": title})
+            else:
+                for story in sorted_stories:
+                    results["stories"].append({"id": story["id"], "work_item_id": "dry_run", "title": story.get("title", "")})
         finally:
             await client.close()
 
@@ -0,0 +1,108 @@
+"""
+Tests for AzureDevOpsClient request building and batch helpers.
+
+No network access — the low-level _get/_post helpers are mocked.
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock
+
+from backend.azure.client import AzureDevOpsClient
+
+
+@pytest.fixture
+def client():
+    return AzureDevOpsClient(org="org", project="proj", pat="pat")
+
+
+def _created(wid: int, title: str) -> dict:
+    return {
+        "id": wid,
+        "fields": {"System.Title": title, "System.WorkItemType": "User Story"},
+        "_links": {"html": {"href": f"https://dev.azure.com/org/proj/_workitems/{wid}"}},
+    }
+
+
+class TestCreateOperations:
+
+    def test_title_only(self, client):
+        ops = client._create_operations("Do the thing")
+        assert ops == [{"op": "add", "path": "/fields/System.Title", "value": "Do the thing"}]
+
+    def test_parent_and_story_points(self, client):
+        ops = client._create_operations("Story", parent_id=7, story_points=3.0)
+        paths = [op["path"] for op in ops]
+        assert "/fields/Microsoft.VSTS.Scheduling.StoryPoints" in paths
+        assert ops[-1]["value"]["url"].endswith("/_apis/wit/workitems/7")
+
+
+class TestCreateWorkItemsBatch:
+
+    @pytest.mark.asyncio
+    async def test_single_request_for_all_items(self, client):
+        client._post = AsyncMock(return_value={
+            "count": 2,
+            "value": [
+                {"code": 200, "body": json.dumps(_created(11, "A"))},
+                {"code": 200, "body": json.dumps(_created(12, "B"))},
+            ],
+        })
+
+        results = await client.create_work_items_batch(
+            [{"title": "A"}, {"title": "B", "parent_id": 5}],
+            work_item_type="User Story",
+        )
+
+        assert client._post.call_count == 1
+        url = client._post.call_args.args[0]
+        body = client._post.call_args.kwargs["json_body"]
+        assert url.endswith("/org/_apis/wit/$batch")
+        assert len(body) == 2
+        assert body[0]["method"] == "PATCH"
+        assert body[0]["uri"].startswith("/proj/_apis/wit/workitems/$User%20Story")
+        assert [wi.id for wi in results] == [11, 12]
+
+    @pytest.mark.asyncio
+    async def test_sub_request_uri_encodes_project_and_type(self):
+        client = AzureDevOpsClient(org="org", project="My Proj/Ü", pat="pat")
+        client._post = AsyncMock(return_value=None)
+        await client.create_work_items_batch([{"title": "A"}], work_item_type="User Story")
+
+        uri = client._post.call_args.kwargs["json_body"][0]["uri"]
+        assert uri.startswith("/My%20Proj%2F%C3%9C/_apis/wit/workitems/$User%20Story?")
+
+    @pytest.mark.asyncio
+    async def test_failed_sub_request_is_none(self, client):
+        client._post = AsyncMock(return_value={
+            "count": 2,
+            "value": [
+                {"code": 400, "body": "{\"message\": \"bad field\"}"},
+                {"code": 200, "body": json.dumps(_created(12, "B"))},
+            ],
+        })
+
+        results = await client.create_work_items_batch([{"title": "A"}, {"title": "B"}])
+        assert results[0] is None
+        assert results[1].id == 12
+
+    @pytest.mark.asyncio
+    async def test_chunks_at_api_limit(self, client):
+        client._post = AsyncMock(return_value=None)
+        results = await client.create_work_items_batch([{"title": f"T{i}"} for i in range(450)])
+        assert client._post.call_count == 3
+        assert results == [None] * 450
+
+
+class TestGetWorkItemsBatch:
+
+    @pytest.mark.asyncio
+    async def test_chunks_fetched_in_input_order(self, client):
+        async def fake_get(url, params=None):
+            ids = [int(i) for i in params["ids"].split(",")]
+            return {"value": [_created(wid, str(wid)) for wid in ids]}
+
+        client._get = AsyncMock(side_effect=fake_get)
+        items = await client.get_work_items_batch(list(range(1, 451)))
+
+        assert client._get.call_count == 3
+        assert [wi.id for wi in items] == list(range(1, 451))
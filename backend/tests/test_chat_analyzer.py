@@ -0,0 +1,123 @@
+"""
+Tests for ChatAnalyzer's DuckDB-side message cleaning.
+
+Uses a throwaway DuckDB file shaped like the Teams chat export.
+"""
+import csv
+from datetime import datetime
+
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+
+from backend.msgraph_python.chat_analyzer import ChatAnalyzer
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    db = tmp_path / "chat.duckdb"
+    conn = duckdb.connect(str(db))
+    conn.execute(
+        "CREATE TABLE chat_messages (message_id VARCHAR, chat_id VARCHAR, sender_name VARCHAR,"
+        " sender_email VARCHAR, content TEXT, created_datetime TIMESTAMP, message_type VARCHAR,"
+        " is_deleted BOOLEAN)"
+    )
+    conn.executemany("INSERT INTO chat_messages VALUES (?, 'c1', ?, NULL, ?, ?, 'message', ?)", [
+        ("m1", "Sam", "<p>Deploy  <b>done</b></p>\n<p>ok</p>", datetime(2026, 3, 4, 9, 0), False),
+        ("m2", "Ana", "<div>Q&amp;A&nbsp;deploy at 5</div>", datetime(2026, 3, 4, 10, 0), False),
+        ("m3", "Ana", "<p>deploy reverted</p>", datetime(2026, 3, 4, 11, 0), True),
+    ])
+    conn.execute(
+        "CREATE TABLE chat_metadata (chat_id VARCHAR, chat_topic VARCHAR, chat_type VARCHAR,"
+        " created_datetime TIMESTAMP, last_updated_datetime TIMESTAMP, export_datetime TIMESTAMP,"
+        " total_messages INTEGER, notes VARCHAR)"
+    )
+    conn.execute("INSERT INTO chat_metadata VALUES ('c1', 'Release', 'group', NULL, NULL, NULL, 3, 'extra')")
+    conn.close()
+    chat = ChatAnalyzer(str(db))
+    yield chat
+    chat.conn.close()
+
+
+def test_connection_limits_applied(analyzer):
+    analyzer.close()
+    chat = ChatAnalyzer(analyzer.db_path, threads=2, memory_limit="256MB")
+    try:
+        assert chat.conn.execute("SELECT current_setting('threads')").fetchone() == (2,)
+        assert chat.conn.execute("SELECT current_setting('memory_limit')").fetchone() == ("244.1 MiB",)
+    finally:
+        chat.close()
+
+
+def test_metadata_read_by_column_name(analyzer):
+    assert analyzer.metadata["chat_topic"] == "Release"
+    assert analyzer.metadata["total_messages"] == 3
+    assert "notes" not in analyzer.metadata
+
+
+def test_search_results_are_cleaned(analyzer, capsys):
+    analyzer.search_messages("deploy")
+    out = capsys.readouterr().out
+    messages = [line.strip() for line in out.splitlines() if "Message:" in line]
+    assert messages == ["Message: Q&A deploy at 5", "Message: Deploy done ok"]
+    assert "reverted" not in out
+
+
+def test_timeline_is_cleaned_in_order(analyzer, capsys):
+    analyzer.get_message_timeline()
+    lines = [line for line in capsys.readouterr().out.splitlines() if "{" in line]
+    assert lines == [
+        "2026-03-04 09:00:00 - Sam: {Deploy done ok}",
+        "2026-03-04 10:00:00 - Ana: {Q&A deploy at 5}",
+    ]
+
+
+def test_literal_nbsp_collapsed_without_entities(analyzer, capsys):
+    # DuckDB's \s and trim() are ASCII-only, so U+00A0 reaches Python as is
+    analyzer.close()
+    conn = duckdb.connect(analyzer.db_path)
+    conn.execute("INSERT INTO chat_messages VALUES ('m4', 'c1', 'Sam', NULL, ?, ?, 'message', false)",
+                 ["<p>\u00a0hotfix\u00a0\u00a0 shipped\u00a0</p>", datetime(2026, 3, 4, 12, 0)])
+    conn.close()
+    chat = ChatAnalyzer(analyzer.db_path)
+    try:
+        chat.search_messages("hotfix")
+    finally:
+        chat.close()
+    out = capsys.readouterr().out
+    assert [line.split("Message: ")[1] for line in out.splitlines() if "Message:" in line] == ["hotfix shipped"]
+
+
+def test_export_to_csv_streams_all_rows(analyzer, tmp_path, capsys):
+    out = tmp_path / "export.csv"
+    analyzer.export_to_csv(str(out))
+    rows = list(csv.DictReader(out.open(encoding="utf-8")))
+    assert [r["sender_name"] for r in rows] == ["Sam", "Ana", "Ana"]
+    assert rows[0]["content"] == "<p>Deploy  <b>done</b></p>\n<p>ok</p>"
+    assert "Total records: 3" in capsys.readouterr().out
+
+
+def test_reports_share_one_activity_rollup(analyzer, capsys):
+    analyzer.show_summary()
+    analyzer.sender_statistics()
+    analyzer.hourly_pattern()
+    analyzer.daily_activity(days=100_000)
+
+    assert analyzer.conn.execute("SELECT SUM(messages) FROM _activity").fetchone() == (2,)
+    out = capsys.readouterr().out
+    assert "Total Messages: 2" in out and "Unique Senders: 2" in out
+    assert "Average Message Length: 35.5 characters" in out
+    assert "Sender: Ana\n  Messages: 1" in out
+    assert " 9:00 - 10:00 │    1" in out
+    assert "2026-03-04: 2 messages, 2 senders" in out
+
+
+@pytest.mark.parametrize("keyword,expected", [
+    ("DEPLOY AT", ["Q&A deploy at 5"]),
+    ("dep%ok", ["Deploy done ok"]),
+    ("nothing", []),
+])
+def test_search_keyword_and_wildcard(analyzer, capsys, keyword, expected):
+    analyzer.search_messages(keyword)
+    out = capsys.readouterr().out
+    assert [line.split("Message: ")[1] for line in out.splitlines() if "Message:" in line] == expected
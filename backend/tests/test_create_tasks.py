@@ -39,3 +39,188 @@ def test_import_from_csv_minimal():
     assert len(tasks) == 1
     assert tasks[0]["Title"] == "Task A"
     assert tasks[0]["State"] == "New"
+
+
+def test_export_to_markdown(tmp_path):
+    """Markdown export writes a header, separator and one row per task."""
+    gen = TaskGenerator()
+    tasks = [gen._create_task_dict({"title": "Build API"}, "dev@example.com", "42", 7)]
+    out = tmp_path / "tasks.md"
+    gen.export_to_markdown(tasks, str(out))
+
+    lines = out.read_text().splitlines()
+    assert lines[0].startswith("| Work Item Type | Title |")
+    assert lines[1] == "|" + "|".join(["---"] * 9) + "|"
+    assert lines[2] == "| Task | Build API | dev@example.com | To Do | Automation | 7 |  |  | 42 |"
+    assert len(lines) == 3
+
+
+def test_parse_response_numbered_and_bulleted_titles():
+    """Numbered and bulleted lines start tasks; inner hyphens survive."""
+    gen = TaskGenerator()
+    text = (
+        "1. Set up CI/CD - build pipeline\n"
+        "Description: Configure the build and test stages\n"
+        "Category: Infrastructure\n"
+        "\n"
+        "- Add e-mail alerts\n"
+        "Send an e-mail when the pipeline fails on main\n"
+    )
+    tasks = gen._parse_response(text, "dev@example.com", "42", 10)
+    assert [t["Title"] for t in tasks] == ["Set up CI/CD - build pipeline", "Add e-mail alerts"]
+    assert tasks[0]["Description"] == "Configure the build and test stages"
+    assert tasks[0]["Category"] == "Infrastructure"
+    assert tasks[1]["Description"] == "Send an e-mail when the pipeline fails on main"
+    assert [t["Work Item ID"] for t in tasks] == ["10", "11"]
+
+
+def _stream(*chunks, done=True):
+    """A provider generate_stream() generator; `done` is its completion flag"""
+    yield from chunks
+    return done
+
+
+def test_generate_tasks_reuses_cached_response(tmp_path, monkeypatch):
+    """A repeated prompt is answered from the on-disk cache without calling the LLM."""
+    from unittest.mock import MagicMock
+
+    monkeypatch.setenv("HTTP_TIMEOUT_LONG", "60")
+    provider = MagicMock()
+    provider.provider_name = "ollama"
+    provider.model_name = "llama3"
+    provider.generate_stream.side_effect = lambda *a, **kw: _stream(
+        "1. Write migration script\nCategory: Datab", "ase\n2. Backfill rows"
+    )
+
+    gen = TaskGenerator(provider=provider, cache_dir=tmp_path)
+    first = gen.generate_tasks("Migrate DB", "No downtime", starting_work_item_id=1)
+    second = gen.generate_tasks("Migrate DB", "No downtime", starting_work_item_id=1)
+
+    assert provider.generate_stream.call_count == 1
+    assert first == second
+    assert [t["Title"] for t in first] == ["Write migration script", "Backfill rows"]
+    assert first[0]["Category"] == "Database"
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    gen.generate_tasks("Migrate cache", "No downtime", starting_work_item_id=1)
+    assert provider.generate_stream.call_count == 2
+
+
+def test_generate_tasks_does_not_cache_cut_off_stream(tmp_path, monkeypatch):
+    """A stream that stops before the model is done is parsed but not cached."""
+    from unittest.mock import MagicMock
+
+    monkeypatch.setenv("HTTP_TIMEOUT_LONG", "60")
+    provider = MagicMock()
+    provider.generate_stream.side_effect = lambda *a, **kw: _stream("1. Write migration script\n2. Back", done=False)
+
+    gen = TaskGenerator(provider=provider, cache_dir=tmp_path)
+    tasks = gen.generate_tasks("Migrate DB", "No downtime", starting_work_item_id=1)
+    assert [t["Title"] for t in tasks] == ["Write migration script", "Back"]
+    assert not list(tmp_path.glob("*.json"))
+
+    gen.generate_tasks("Migrate DB", "No downtime", starting_work_item_id=1)
+    assert provider.generate_stream.call_count == 2
+
+
+def test_import_from_csv_keeps_text_and_fills_blanks(tmp_path):
+    """Cells are read as text; blank cells fall back to column defaults."""
+    path = tmp_path / "tasks.csv"
+    path.write_text("Title,Description,State\n007,,\nShip v2.50,Release notes,Done\n")
+
+    tasks = TaskGenerator().import_from_csv(str(path))
+    assert tasks[0]["Title"] == "007"
+    assert tasks[0]["Description"] == ""
+    assert tasks[0]["State"] == "New"
+    assert tasks[1]["Title"] == "Ship v2.50"
+    assert tasks[1]["State"] == "Done"
+
+
+def test_export_to_csv_round_trips(tmp_path):
+    """CSV export writes every task key as a column and re-imports cleanly."""
+    gen = TaskGenerator()
+    tasks = [
+        gen._create_task_dict({"title": 'Parse "quoted", titles', "description": "Line one"}, "", "42", 1),
+        gen._create_task_dict({"title": "Second task"}, "", "42", 2),
+    ]
+    out = tmp_path / "tasks.csv"
+    gen.export_to_csv(tasks, str(out))
+
+    header = out.read_text().splitlines()[0]
+    assert header.split(",") == list(tasks[0].keys())
+    imported = gen.import_from_csv(str(out))
+    assert [t["Title"] for t in imported] == ['Parse "quoted", titles', "Second task"]
+    assert imported[0]["Description"] == "Line one"
+
+
+def test_create_prompt_puts_project_content_after_static_preamble():
+    """Prompts for different projects share the same leading instructions."""
+    gen = TaskGenerator()
+    a = gen._create_prompt("Build a login page", "Backend only")
+    b = gen._create_prompt("Migrate the database", "No downtime", [{"title": "Back up data"}])
+
+    preamble_end = a.index("PROJECT REQUIREMENTS:")
+    assert a[:preamble_end] == b[:preamble_end]
+    assert b.rstrip().endswith("1. Back up data")
+
+
+def test_generate_tasks_batch_splits_answers_per_job(tmp_path, monkeypatch):
+    """Several jobs share one LLM call; each gets its own parsed task list."""
+    from unittest.mock import MagicMock
+
+    monkeypatch.setenv("HTTP_TIMEOUT_LONG", "60")
+    provider = MagicMock()
+    provider.generate.return_value = (
+        "===JOB 1===\n1. Build login form\n2. Add session store\n"
+        "===JOB 2===\n1. Write migration\n"
+    )
+    gen = TaskGenerator(provider=provider, cache_dir=tmp_path)
+    results = gen.generate_tasks_batch([
+        {"requirements": "Auth", "constraints": "None", "starting_work_item_id": 1},
+        {"requirements": "DB", "constraints": "None", "starting_work_item_id": 50},
+        {"requirements": "Docs", "constraints": "None", "starting_work_item_id": 90},
+    ])
+
+    assert provider.generate.call_count == 1
+    prompt = provider.generate.call_args.kwargs["prompt"]
+    assert "===JOB 3===" in prompt
+    assert [t["Title"] for t in results[0]] == ["Build login form", "Add session store"]
+    assert [t["Work Item ID"] for t in results[1]] == ["50"]
+    assert results[2] == []
+
+
+def test_generate_tasks_batch_style_query_covers_every_job(tmp_path, monkeypatch):
+    """Style examples are looked up with every job's requirements, not the first only."""
+    from unittest.mock import MagicMock
+    from backend.ai import create_tasks
+
+    queries = []
+    monkeypatch.setattr(create_tasks, "_inject_style",
+                        lambda prompt, context_type, query_text: queries.append(query_text) or prompt)
+    monkeypatch.setenv("HTTP_TIMEOUT_LONG", "60")
+    provider = MagicMock()
+    provider.generate.return_value = "===JOB 1===\n1. A\n===JOB 2===\n1. B\n"
+    gen = TaskGenerator(provider=provider, cache_dir=tmp_path)
+    gen.generate_tasks_batch([
+        {"requirements": "Auth service", "constraints": "None"},
+        {"requirements": "Billing export", "constraints": "None"},
+    ])
+
+    assert len(queries) == 1
+    assert "Auth service" in queries[0] and "Billing export" in queries[0]
+
+
+def test_generate_tasks_drops_repeats_of_existing_tasks(tmp_path, monkeypatch):
+    """Tasks the model copies from existing_tasks are dropped without using an ID."""
+    from unittest.mock import MagicMock
+
+    monkeypatch.setenv("HTTP_TIMEOUT_LONG", "60")
+    provider = MagicMock()
+    provider.generate_stream.side_effect = lambda *a, **kw: iter(
+        ["1. Table Metadata Validation\n2. Add retry logic\n3.  table metadata validation \n"]
+    )
+    gen = TaskGenerator(provider=provider, cache_dir=tmp_path)
+    tasks = gen.generate_tasks(
+        "Extract", "Backend", existing_tasks=[{"title": "Table Metadata Validation"}], starting_work_item_id=5
+    )
+    assert [(t["Title"], t["Work Item ID"]) for t in tasks] == [("Add retry logic", "5")]
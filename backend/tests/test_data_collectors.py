@@ -0,0 +1,425 @@
+"""
+Tests for the communication data collectors used by personalized AI learning.
+
+The Graph/Azure clients are faked — no network access.
+"""
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.learning_integration import AsyncTeamsDataCollector
+from backend.data_collectors import (
+    DataCollectionOrchestrator,
+    OutlookDataCollector,
+    TeamsDataCollector,
+)
+
+
+USER = "me@example.com"
+
+
+def _msg(mid: str, sender: str, text: str, ts: str = "2099-01-01T00:00:00Z") -> dict:
+    return {
+        "id": mid,
+        "createdDateTime": ts,
+        "from": {"user": {"userPrincipalName": sender}},
+        "body": {"content": text},
+    }
+
+
+async def _stream(messages):
+    for message in messages:
+        yield message
+
+
+@pytest.fixture
+def ai():
+    fake = MagicMock()
+    fake.consent_given = True
+    fake.user_email = USER
+    return fake
+
+
+class TestTextExtraction:
+
+    def test_teams_message_html_removed(self, ai):
+        collector = TeamsDataCollector(ai)
+        msg = {"body": {"content": "<p>Sounds <b>good</b></p> "}}
+        assert collector._extract_message_content(msg) == "Sounds good"
+
+    @pytest.mark.parametrize("html,expected", [
+        ("<p>a&nbsp;&amp;&nbsp;b</p>\n<br>  c", "a & b c"),
+        ("&lt;tag&gt; &quot;q&quot; &#39;s&apos; &hellip;", "<tag> \"q\" 's' \u2026"),
+        ("&amp;lt;", "&lt;"),
+        (None, ""),
+    ])
+    def test_clean_html_tags_decodes_entities_once(self, html, expected):
+        from backend.utils.text_utils import clean_html_tags
+        assert clean_html_tags(html) == expected
+
+    @pytest.mark.parametrize("lexbor", [True, False])
+    def test_html_to_text_decodes_entities_with_or_without_selectolax(self, monkeypatch, lexbor):
+        from backend.utils import text_utils
+        if lexbor:
+            pytest.importorskip("selectolax")
+        else:
+            monkeypatch.setattr(text_utils, "LexborHTMLParser", None)
+        assert text_utils.html_to_text("<p>Q&amp;A&nbsp;at 5 &lt;ok&gt;</p>") == "Q&A\u00a0at 5 <ok>"
+
+    def test_email_body_drops_html_and_quotes(self, ai):
+        collector = OutlookDataCollector(ai)
+        email = {"body": {"content": "<div>Thanks, will do.</div>\n> Can you fix it?\n> -- Sam"}}
+        assert collector._extract_email_body(email) == "Thanks, will do."
+
+    def test_email_html_quote_blocks_dropped(self, ai):
+        pytest.importorskip("selectolax")
+        collector = OutlookDataCollector(ai)
+        email = {"body": {"content": (
+            "<html><head><style>p {}</style></head><body>"
+            "<div>Fixed &amp; deployed.</div>"
+            "<div class='gmail_quote'>On Mon, Sam wrote: can you fix it?</div>"
+            "</body></html>"
+        )}}
+        assert collector._extract_email_body(email) == "Fixed & deployed."
+
+
+    @pytest.mark.parametrize("subject,expected", [
+        ("RE: status", True),
+        ("Re: status", True),
+        ("re : status", True),
+        ("  RE:status", True),
+        ("Fwd: status", False),
+        ("Results are in", False),
+        (None, False),
+    ])
+    def test_reply_detection(self, ai, subject, expected):
+        assert OutlookDataCollector(ai)._is_reply({"subject": subject}) is expected
+
+    @pytest.mark.parametrize("content,expected", [
+        ("Sure\n\nOn Mon, Sam wrote:\n> fix it", "On Mon, Sam wrote:\n> fix it"),
+        ("Done\n  > can you\n> check", "> can you\n> check"),
+        ("Ok\n-----Original Message-----\nFrom: Sam", "-----Original Message-----\nFrom: Sam"),
+        ("No history here", "No history here"),
+    ])
+    def test_original_message_starts_at_first_marker(self, ai, content, expected):
+        email = {"body": {"content": content}}
+        assert OutlookDataCollector(ai)._get_original_message(email) == expected
+
+
+    @pytest.mark.parametrize("value", [None, "", "not a date"])
+    def test_bad_timestamp_falls_back_to_now(self, ai, value):
+        from datetime import datetime
+        before = datetime.now()
+        assert TeamsDataCollector(ai)._parse_timestamp(value) >= before
+
+    def test_graph_timestamp_parsed_as_utc(self, ai):
+        from datetime import timezone
+        parsed = OutlookDataCollector(ai)._parse_timestamp("2026-01-02T03:04:05.123Z")
+        assert parsed.tzinfo is not None and parsed.utcoffset() == timezone.utc.utcoffset(None)
+        assert (parsed.year, parsed.microsecond) == (2026, 123000)
+
+
+    def test_user_match_ignores_case(self, ai):
+        ai.user_email = "Me@Example.com"
+        collector = TeamsDataCollector(ai)
+        assert collector._is_user_message(_msg("1", "ME@example.COM", "hi"))
+        assert not collector._is_user_message(_msg("2", "sam@example.com", "hi"))
+
+    def test_missing_sender_never_matches_blank_user(self, ai):
+        ai.user_email = ""
+        collector = TeamsDataCollector(ai)
+        assert not collector._is_user_message({"from": {"user": {}}})
+
+
+class TestAsyncTeamsCollector:
+
+    @pytest.mark.asyncio
+    async def test_streams_batched_chats_newest_first(self, ai):
+        class FakeGraph:
+            async def get_teams_chats(self):
+                return [{"id": "a"}, {"id": "b"}]
+
+            async def iter_chat_messages_batch(self, chat_ids, since_datetime=None):
+                assert chat_ids == ["a", "b"]
+                return {
+                    # Graph order: newest first
+                    "a": _stream([_msg("3", USER, "pong"), _msg("2", "other@example.com", "ping"),
+                                  _msg("1", USER, "hello")]),
+                    "b": _stream([]),
+                }
+
+        collector = AsyncTeamsDataCollector(ai)
+        collector.graph_client = FakeGraph()
+        assert await collector.collect_chat_history_async(days=7) == 1
+
+        (samples,), _ = ai.add_communication_samples.call_args
+        assert (samples[0]["trigger"], samples[0]["response"]) == ("ping", "pong")
+        assert samples[0]["metadata"]["prev_message_id"] == "2"
+
+    @pytest.mark.asyncio
+    async def test_pairs_yielded_without_buffering_the_chat(self):
+        from backend.learning_integration import _pairs_newest_first
+
+        pulled = []
+
+        async def stream():
+            for n in (3, 2, 1):
+                pulled.append(n)
+                yield _msg(str(n), USER, f"m{n}")
+
+        pairs = _pairs_newest_first(stream(), lambda m: False)
+        (older, _), (newer, _) = await pairs.__anext__()
+        assert (older["id"], newer["id"]) == ("2", "3")
+        assert pulled == [3, 2]
+        await pairs.aclose()
+
+    @pytest.mark.asyncio
+    async def test_each_message_classified_once(self, ai):
+        class FakeGraph:
+            async def get_teams_chats(self):
+                return [{"id": "a"}]
+
+            async def iter_chat_messages_batch(self, chat_ids, since_datetime=None):
+                return {"a": _stream(
+                    _msg(str(n), USER if n % 2 else "other@example.com", f"m{n}") for n in reversed(range(6)))}
+
+        collector = AsyncTeamsDataCollector(ai)
+        collector.graph_client = FakeGraph()
+        seen = []
+        classify = collector._is_user_message
+        collector._is_user_message = lambda m: seen.append(m["id"]) or classify(m)
+
+        assert await collector.collect_chat_history_async(days=7) == 3
+        assert seen == [str(n) for n in reversed(range(6))]
+
+
+class TestGraphClientAdapter:
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_entries_streamed_individually(self):
+        from types import SimpleNamespace
+        from backend.learning_integration import GraphClientAdapter
+
+        def sdk_msg(mid):
+            return SimpleNamespace(id=mid, created_date_time=None, from_=None, body=None)
+
+        async def stream(*messages):
+            for message in messages:
+                yield message
+
+        graph = MagicMock()
+        graph.iter_chat_messages_batch = AsyncMock(return_value={"a": stream(sdk_msg("1"))})
+        graph.iter_chat_messages = MagicMock(return_value=stream(sdk_msg("2")))
+
+        result = await GraphClientAdapter(graph).iter_chat_messages_batch(["a", "b"])
+
+        assert [m["id"] async for m in result["a"]] == ["1"]
+        assert [m["id"] async for m in result["b"]] == ["2"]
+        graph.iter_chat_messages.assert_called_once_with("b", since_datetime=None)
+
+    def test_message_to_dict_sender_variants(self):
+        from datetime import datetime, timezone
+        from types import SimpleNamespace as NS
+        from backend.learning_integration import GraphClientAdapter
+
+        to_dict = GraphClientAdapter(None)._message_to_dict
+        teams = NS(id="t", created_date_time=datetime(2026, 1, 2, tzinfo=timezone.utc),
+                   body=NS(content="hi"),
+                   from_=NS(user=NS(id="oid", display_name="Me", additional_data={"userPrincipalName": USER})))
+        outlook = NS(id="o", created_date_time=None, body=None,
+                     from_=NS(user=None, email_address=NS(address=USER, name="Me")))
+
+        assert to_dict(teams) == {
+            "id": "t", "createdDateTime": "2026-01-02T00:00:00+00:00",
+            "from": {"user": {"userPrincipalName": USER, "displayName": "Me", "id": "oid"}},
+            "body": {"content": "hi"},
+        }
+        assert to_dict(outlook)["from"] == {"user": {"userPrincipalName": USER, "displayName": "Me"}}
+        assert to_dict(outlook)["body"] == {"content": None}
+        assert to_dict(NS(id="s", from_=NS(user=None)))["from"] is None
+
+    @pytest.mark.asyncio
+    async def test_sent_emails_filtered_by_graph(self):
+        from datetime import datetime, timezone
+        from types import SimpleNamespace
+        from backend.learning_integration import GraphClientAdapter
+
+        sent = SimpleNamespace(
+            id="m1",
+            subject="RE: deploy",
+            sent_date_time=datetime(2026, 1, 2, tzinfo=timezone.utc),
+            body=SimpleNamespace(content="<p>Done</p>"),
+            from_=SimpleNamespace(email_address=SimpleNamespace(address=USER, name="Me")),
+            to_recipients=[SimpleNamespace(email_address=SimpleNamespace(address="sam@example.com", name="Sam"))],
+            is_read=True,
+        )
+        graph = MagicMock()
+        graph.get_sent_messages = AsyncMock(return_value=[sent])
+
+        emails = await GraphClientAdapter(graph).get_sent_emails(days=3)
+
+        since = graph.get_sent_messages.await_args.args[0]
+        assert 2.9 < (datetime.now(tz=timezone.utc) - since).total_seconds() / 86400 < 3.1
+        assert emails == [{
+            "id": "m1",
+            "subject": "RE: deploy",
+            "sentDateTime": "2026-01-02T00:00:00+00:00",
+            "body": {"content": "<p>Done</p>"},
+            "from": {"address": USER, "name": "Me"},
+            "toRecipients": [{"address": "sam@example.com", "name": "Sam"}],
+            "isRead": True,
+        }]
+
+
+class TestBulkSamples:
+
+    def test_sync_collector_writes_samples_in_one_batch(self, ai):
+        collector = OutlookDataCollector(ai)
+        collector._get_sent_emails = lambda days: [
+            {"id": f"e{n}", "subject": "RE: status", "sentDateTime": "2099-01-01T00:00:00",
+             "body": {"content": f"reply {n}"}}
+            for n in range(3)
+        ]
+
+        assert collector.collect_sent_emails(days=7) == 3
+        ai.add_communication_sample.assert_not_called()
+        ai.add_communication_samples.assert_called_once()
+        (samples,), _ = ai.add_communication_samples.call_args
+        assert [s["metadata"]["email_id"] for s in samples] == ["e0", "e1", "e2"]
+
+    def test_sync_teams_collector_windows_utc_timestamps(self, ai):
+        collector = TeamsDataCollector(ai)
+        collector.graph_client = MagicMock()
+        collector.graph_client.get_teams_chats.return_value = [{"id": "c1"}]
+        collector._get_chat_messages = lambda chat_id: iter([
+            _msg("1", "other@example.com", "old question", ts="2001-01-01T00:00:00Z"),
+            _msg("2", USER, "old answer", ts="2001-01-01T00:01:00Z"),
+            _msg("3", "other@example.com", "question"),
+            _msg("4", USER, "answer"),
+        ])
+
+        assert collector.collect_chat_history(days=7) == 1
+        (samples,), _ = ai.add_communication_samples.call_args
+        assert samples[0]["response"] == "answer"
+
+    def test_save_samples_single_transaction(self, tmp_path, monkeypatch):
+        from backend.db import learning_store
+
+        monkeypatch.setattr(learning_store, "_db_path", lambda: str(tmp_path / "learn.db"))
+        rows = [
+            dict(sample_id=f"s{n}", source="teams", timestamp="2026-01-01T00:00:00",
+                 context_type="chat", trigger_text="q", response_text="a", metadata={"n": n})
+            for n in range(5)
+        ]
+
+        assert learning_store.save_samples(USER, rows) == 5
+        # Re-inserting the same IDs is ignored, like save_sample()
+        assert learning_store.save_samples(USER, rows[:2]) == 0
+        assert len(learning_store.load_samples(USER)) == 5
+
+
+class TestAzureCommentsCollector:
+
+    def test_one_session_projects_once_comments_memoized(self, ai, monkeypatch):
+        import requests
+        import backend.config as config
+        from backend.data_collectors import AzureDevOpsDataCollector
+
+        monkeypatch.setattr(config, "azure_org", lambda: "org")
+        monkeypatch.setattr(config, "azure_pat", lambda: "pat")
+        monkeypatch.setattr(config, "http_timeout_short", lambda: 5)
+
+        get_urls = []
+
+        def fake_get(url, **kwargs):
+            get_urls.append(url)
+            if "/_apis/projects" in url:
+                return MagicMock(status_code=200, json=lambda: {"value": [{"name": "A"}, {"name": "B"}]})
+            return MagicMock(status_code=200, json=lambda: {"comments": [
+                {"id": 1, "text": "why?", "createdBy": {"uniqueName": "sam@example.com"}},
+                {"id": 2, "text": "because", "createdBy": {"uniqueName": USER}},
+            ]})
+
+        sessions = []
+
+        class FakeSession:
+            def __init__(self):
+                sessions.append(self)
+                self.closed = False
+
+            get = staticmethod(fake_get)
+
+            @staticmethod
+            def post(url, **kwargs):
+                return MagicMock(status_code=200, json=lambda: {"workItems": [{"id": 1}, {"id": 2}]})
+
+            def mount(self, prefix, adapter):
+                pass
+
+            def close(self):
+                self.closed = True
+
+        monkeypatch.setattr(requests, "Session", FakeSession)
+
+        collector = AzureDevOpsDataCollector(ai)
+        collector.initialize(object())
+
+        assert collector.collect_comments_history(days=7) == 2
+        assert collector._get_work_item_comments(1) == collector._comments_cache[1]
+
+        # One keep-alive session served the whole run and was closed after it
+        assert len(sessions) == 1 and sessions[0].closed
+
+        assert sum("/_apis/projects" in u for u in get_urls) == 1
+        comment_urls = [u for u in get_urls if "/comments" in u]
+        assert len(comment_urls) == 2
+        assert all("/org/A/_apis/wit/workItems/" in u for u in comment_urls)
+
+
+    def test_session_retries_throttled_requests(self, ai):
+        from backend.data_collectors import AzureDevOpsDataCollector
+
+        collector = AzureDevOpsDataCollector(ai)
+        retry = collector._http("pat").get_adapter("https://dev.azure.com/org").max_retries
+
+        assert retry.total == 5
+        assert 429 in retry.status_forcelist and 503 in retry.status_forcelist
+        assert retry.respect_retry_after_header
+        assert retry.is_retry("POST", 429)
+
+
+class TestOrchestrator:
+
+    @pytest.mark.asyncio
+    async def test_sources_collected_concurrently(self, ai, caplog):
+        import threading
+
+        started = threading.Barrier(3, timeout=2)
+
+        def collector(count):
+            def collect(days):
+                # Deadlocks (and times out) unless all three run at once
+                started.wait()
+                return count
+            return MagicMock(**{
+                "collect_chat_history.side_effect": collect,
+                "collect_comments_history.side_effect": collect,
+                "collect_sent_emails.side_effect": collect,
+            })
+
+        orchestrator = DataCollectionOrchestrator.__new__(DataCollectionOrchestrator)
+        orchestrator.ai = ai
+        orchestrator.teams_collector = collector(1)
+        orchestrator.azure_collector = collector(2)
+        orchestrator.outlook_collector = collector(3)
+
+        with caplog.at_level("INFO", logger="backend.data_collectors"):
+            results = await orchestrator.collect_all_data(days=7)
+
+        assert results == {"teams": 1, "azure_devops": 2, "outlook": 3}
+        ai._update_profile.assert_called_once()
+        summary = next(r.getMessage() for r in caplog.records if "summary" in r.getMessage())
+        assert json.loads(summary.split(": ", 1)[1]) == {
+            "days": 7, "teams": 1, "azure_devops": 2, "outlook": 3, "total": 6,
+        }
@@ -0,0 +1,171 @@
+"""
+Tests for EmailReporter activity queries and report formatting.
+
+Uses a throwaway SQLite database shaped like the Go daemon's task_updates table.
+"""
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from backend.email_reporter import EmailReporter
+
+
+DAY = datetime(2026, 3, 4, 15, 0)
+
+
+def _make_db(path, rows, extended=True):
+    conn = sqlite3.connect(path)
+    extra = ", time_estimate REAL, source TEXT" if extended else ""
+    conn.execute(
+        "CREATE TABLE task_updates (id INTEGER PRIMARY KEY, timestamp TEXT, project TEXT,"
+        f" ticket_id TEXT, status TEXT, update_text TEXT{extra})"
+    )
+    cols = "timestamp, project, ticket_id, status, update_text" + (", time_estimate, source" if extended else "")
+    marks = ", ".join("?" * len(cols.split(", ")))
+    conn.executemany(f"INSERT INTO task_updates ({cols}) VALUES ({marks})", rows)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def reporter(tmp_path):
+    db = tmp_path / "devtrack.db"
+    _make_db(db, [
+        ("2026-03-04T09:00:00", "api", "T-1", "completed", "Fix login", 1.5, "commit"),
+        ("2026-03-04T10:00:00", "api", "T-2", "in_progress", "Add cache", 2.0, "manual"),
+        ("2026-03-04T11:00:00", None, "", None, "Standup", None, None),
+        ("2026-03-04T12:00:00", "web", "T-1", "blocked", "Waiting on API", 0.5, "timer"),
+        ("2026-03-05T09:00:00", "web", "T-9", "completed", "Tomorrow", 3.0, "manual"),
+    ])
+    rep = EmailReporter(str(db))
+    yield rep
+    rep.close()
+
+
+class TestDailySummary:
+
+    def test_aggregates_match_activity_rows(self, reporter):
+        report = reporter.generate_daily_report(DAY)
+        activities = report.activities
+
+        assert len(activities) == 4
+        assert report.total_hours == pytest.approx(sum(a.time_spent for a in activities))
+        assert sorted(report.projects_worked) == sorted({a.project for a in activities})
+        assert sorted(report.tickets_updated) == ["T-1", "T-2"]
+        assert (report.completed_count, report.in_progress_count, report.blocked_count) == (1, 2, 1)
+
+    def test_summary_only_skips_rows(self, reporter):
+        report = reporter.generate_daily_report(DAY, summary_only=True)
+        assert report.activities == [] and report.by_project == {}
+        assert report.total_hours == pytest.approx(4.0)
+        assert report.projects_worked == ["Unknown", "api", "web"]
+
+    def test_rows_and_totals_read_from_one_snapshot(self, reporter):
+        list_rows = reporter.get_daily_activities
+
+        def list_then_daemon_writes(date):
+            rows = list_rows(date)
+            writer = sqlite3.connect(reporter.db_path)
+            writer.execute("INSERT INTO task_updates (timestamp, project, status, time_estimate)"
+                           " VALUES ('2026-03-04T13:00:00', 'ops', 'completed', 8.0)")
+            writer.commit()
+            writer.close()
+            return rows
+
+        reporter.get_daily_activities = list_then_daemon_writes
+        report = reporter.generate_daily_report(DAY)
+
+        assert len(report.activities) == 4
+        assert report.total_hours == pytest.approx(sum(a.time_spent for a in report.activities))
+        assert "ops" not in report.projects_worked
+        assert reporter.get_daily_summary(DAY)["total_hours"] == pytest.approx(12.0)
+
+    def test_go_schema_without_time_columns(self, tmp_path):
+        db = tmp_path / "go.db"
+        _make_db(db, [("2026-03-04T09:00:00", "api", "T-1", "completed", "Fix login")], extended=False)
+        report = EmailReporter(str(db)).generate_daily_report(DAY)
+        assert report.total_hours == 0.0
+        assert report.activities[0].source == "manual"
+        assert report.completed_count == 1
+
+    def test_empty_day(self, reporter):
+        report = reporter.generate_daily_report(datetime(2026, 1, 1))
+        assert report.activities == []
+        assert report.projects_worked == [] and report.tickets_updated == []
+        assert report.total_hours == 0.0
+
+
+class TestConnection:
+
+    def test_connection_opened_once_in_wal_mode(self, reporter):
+        reporter.generate_daily_report(DAY)
+        conn = reporter._get_conn()
+        reporter.get_daily_activities(DAY)
+        assert reporter._get_conn() is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_failing_pragma_does_not_break_reports(self, reporter, monkeypatch):
+        import backend.email_reporter as email_reporter
+        # e.g. journal_mode=WAL on a locked or read-only database
+        monkeypatch.setattr(email_reporter, "_CONNECTION_PRAGMAS",
+                            ("PRAGMA journal_mode=WAL", "PRAGMA not valid sql", "PRAGMA temp_store=MEMORY"))
+        report = reporter.generate_daily_report(DAY)
+        assert len(report.activities) == 4 and report.completed_count == 1
+        assert reporter._get_conn().execute("PRAGMA temp_store").fetchone() == (2,)
+
+    def test_close_then_reopen(self, reporter):
+        reporter.get_daily_activities(DAY)
+        reporter.close()
+        assert reporter._conn is None
+        assert len(reporter.get_daily_activities(DAY)) == 4
+
+    def test_day_queries_use_timestamp_index(self, reporter):
+        conn = reporter._get_conn()
+        plan = " ".join(r[3] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FILTER (WHERE status = 'blocked') FROM task_updates"
+            " WHERE timestamp >= ? AND timestamp <= ?", ("a", "b")))
+        assert "COVERING INDEX idx_task_updates_ts_status" in plan
+
+    def test_schema_checked_once_per_connection(self, reporter):
+        reporter.generate_daily_report(DAY)
+        conn = reporter._get_conn()
+        statements = []
+        conn.set_trace_callback(statements.append)
+        reporter.generate_daily_report(DAY)
+        assert not any("table_info" in sql for sql in statements)
+
+
+class TestFormatting:
+
+    def test_html_report_groups_activities_by_project(self, reporter):
+        html = reporter.format_report_html(reporter.generate_daily_report(DAY))
+        assert html.lstrip().startswith("<!DOCTYPE html>") and html.rstrip().endswith("</html>")
+        assert "<style>" in html and "{{" not in html
+        assert html.count('class="project-section"') == 3
+        assert '<span class="status-blocked">✗</span>' in html
+        assert "<strong>Blocked:</strong> 1 tasks" in html
+
+    def test_activities_grouped_once_on_report(self, reporter):
+        report = reporter.generate_daily_report(DAY)
+        assert sorted(report.by_project) == ["Unknown", "api", "web"]
+        assert [a.ticket_id for a in report.by_project["api"]] == ["T-1", "T-2"]
+
+    def test_activity_records_are_slotted(self, reporter):
+        act = reporter.get_daily_activities(DAY)[0]
+        assert not hasattr(act, "__dict__")
+
+    @pytest.mark.parametrize("fmt", ["text", "html"])
+    def test_saved_report_matches_formatted(self, reporter, tmp_path, fmt):
+        report = reporter.generate_daily_report(DAY)
+        out = tmp_path / f"report.{fmt}"
+        reporter.save_report(report, str(out), format=fmt)
+
+        saved = out.read_text(encoding="utf-8")
+        if fmt == "html":
+            # Only the generation-time footer may differ
+            expected = reporter.format_report_html(report)
+            assert saved.split('<div class="footer">')[0] == expected.split('<div class="footer">')[0]
+            assert saved.endswith("</html>\n")
+        else:
+            assert saved == reporter.format_report_text(report, style="detailed") + "\n"
@@ -0,0 +1,206 @@
+"""
+Tests for GitHubBranchAnalyzer's GraphQL commit streaming.
+
+No network access — _graphql is replaced with canned responses.
+"""
+import json
+import logging
+import sqlite3
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
+import pytest
+
+pytest.importorskip("github")
+
+from backend.github.ghAnalysis import GitHubBranchAnalyzer, _ETagCache, _graphql_url, _http_session
+
+
+def _node(sha: str, additions: int = 1, deletions: int = 1) -> dict:
+    return {
+        "oid": sha,
+        "message": f"commit {sha}",
+        "committedDate": "2026-03-04T10:00:00Z",
+        "additions": additions,
+        "deletions": deletions,
+        "author": {"name": "Sam", "email": "sam@example.com"},
+    }
+
+
+def _history(nodes, cursor=None) -> dict:
+    return {"pageInfo": {"endCursor": cursor, "hasNextPage": cursor is not None}, "nodes": nodes}
+
+
+@pytest.fixture
+def analyzer():
+    # Skip __init__: it reads config and configures file logging
+    obj = GitHubBranchAnalyzer.__new__(GitHubBranchAnalyzer)
+    obj.ist_tz = ZoneInfo("Asia/Kolkata")
+    obj.logger = logging.getLogger("test_gh_analysis")
+    obj._graphql = MagicMock()
+    return obj
+
+
+class TestGraphqlUrl:
+
+    @pytest.mark.parametrize("api_url,expected", [
+        ("", "https://api.github.com/graphql"),
+        ("https://api.github.com/", "https://api.github.com/graphql"),
+        ("https://ghe.example.com/api/v3", "https://ghe.example.com/api/graphql"),
+    ])
+    def test_endpoint(self, api_url, expected):
+        assert _graphql_url(api_url) == expected
+
+    def test_shared_session_pools_and_retries_posts(self):
+        adapter = _http_session("tok").get_adapter("https://api.github.com/graphql")
+        assert adapter._pool_maxsize >= 16
+        assert adapter.max_retries.allowed_methods is None
+        assert 429 in adapter.max_retries.status_forcelist
+
+
+class TestCommitStreaming:
+
+    def test_branch_and_history_pages_followed(self, analyzer):
+        analyzer._graphql.side_effect = [
+            {"repository": {"refs": {
+                "pageInfo": {"endCursor": "b1", "hasNextPage": True},
+                "nodes": [{"name": "main", "target": {"history": _history([_node("a")], cursor="h1")}}],
+            }}},
+            {"repository": {"ref": {"target": {"history": _history([_node("b")])}}}},
+            {"repository": {"refs": {
+                "pageInfo": {"endCursor": None, "hasNextPage": False},
+                "nodes": [{"name": "dev", "target": {"history": _history([_node("c", 5, 2)])}}],
+            }}},
+        ]
+
+        commits = analyzer.analyze_repository_commits("me/repo")
+
+        assert [(c["branch_name"], c["commit_sha"]) for c in commits] == [
+            ("main", "a"), ("main", "b"), ("dev", "c")]
+        assert commits[2]["lines_modified"] == 7
+        assert commits[0]["last_modified_time_ist"] == "2026-03-04T15:30:00+05:30"
+        history_call = analyzer._graphql.call_args_list[1].args[1]
+        assert history_call["ref"] == "refs/heads/main" and history_call["cursor"] == "h1"
+
+    def test_branches_use_head_commit_only(self, analyzer):
+        analyzer._graphql.return_value = {"repository": {"refs": {
+            "pageInfo": {"endCursor": None, "hasNextPage": False},
+            "nodes": [{"name": "main", "target": {"history": _history([_node("a")], cursor="more")}}],
+        }}}
+
+        branches = analyzer.analyze_repository_branches("me/repo")
+
+        assert analyzer._graphql.call_count == 1
+        assert analyzer._graphql.call_args.args[1]["commits"] == 1
+        assert branches == [{
+            "repository_name": "me/repo",
+            "branch_name": "main",
+            "last_modified_time_ist": "2026-03-04T15:30:00+05:30",
+            "lines_modified": 2,
+            "author_name": "Sam",
+            "author_email": "sam@example.com",
+        }]
+
+    def test_branch_joining_read_history_stops_paging(self, analyzer):
+        def node(sha):
+            return {"oid": sha, "message": sha, "committedDate": "2026-03-04T10:00:00Z", "author": None}
+
+        analyzer._graphql.side_effect = [
+            {"repository": {"refs": {
+                "pageInfo": {"endCursor": None, "hasNextPage": False},
+                "nodes": [
+                    {"name": "main", "target": {"history": _history([node("m"), node("base")], cursor="h1")}},
+                    {"name": "feature", "target": {"history": _history([node("f"), node("base")], cursor="h2")}},
+                ],
+            }}},
+            {"repository": {"ref": {"target": {"history": _history([node("root")])}}}},
+        ]
+
+        commits = analyzer.analyze_repository_commits("me/repo", include_stats=False)
+
+        # main's older history is not fetched again for feature
+        assert analyzer._graphql.call_count == 2
+        assert analyzer._graphql.call_args.args[1]["ref"] == "refs/heads/main"
+        assert analyzer._graphql.call_args.args[1]["stats"] is False
+        assert [(c["branch_name"], c["commit_sha"]) for c in commits] == [
+            ("main", "m"), ("main", "base"), ("main", "root"), ("feature", "f"), ("feature", "base")]
+        assert commits[0]["lines_modified"] is None
+
+    def test_bad_branch_skipped_not_repository(self, analyzer):
+        broken = _node("b")
+        del broken["committedDate"]
+        analyzer._graphql.return_value = {"repository": {"refs": {
+            "pageInfo": {"endCursor": None, "hasNextPage": False},
+            "nodes": [
+                {"name": "broken", "target": {"history": _history([broken])}},
+                {"name": "tag-like", "target": {}},
+                {"name": "main", "target": {"history": _history([_node("a")])}},
+            ],
+        }}}
+
+        branches = analyzer.analyze_repository_branches("me/repo")
+        assert [b["branch_name"] for b in branches] == ["main"]
+
+    def test_query_errors_logged_and_empty(self, analyzer):
+        analyzer._graphql.side_effect = RuntimeError("Could not resolve to a Repository")
+        assert analyzer.analyze_repository_commits("me/missing") == []
+
+
+class _Response:
+
+    def __init__(self, status_code, body=None, etag=None, next_url=None):
+        self.status_code = status_code
+        self.text = json.dumps(body)
+        self.headers = {"ETag": etag} if etag else {}
+        self.links = {"next": {"url": next_url}} if next_url else {}
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class TestConditionalRequests:
+
+    def test_unchanged_listing_served_from_cache(self, analyzer, tmp_path):
+        analyzer.api_url = "https://api.github.com"
+        analyzer.timeout = 5
+        analyzer.cache = _ETagCache(str(tmp_path / "gh_cache.db"))
+        repos_url = "https://api.github.com/user/repos?per_page=100"
+        first_run = {
+            repos_url: _Response(200, [{"name": "repo", "full_name": "me/repo"}], etag='"r1"'),
+            "https://api.github.com/repos/me/repo/branches?per_page=100":
+                _Response(200, [{"name": "main"}], etag='"b1"', next_url="https://api.github.com/b?page=2"),
+            "https://api.github.com/b?page=2": _Response(200, [{"name": "dev"}], etag='"b2"'),
+        }
+        analyzer.session = MagicMock()
+        analyzer.session.get.side_effect = lambda url, headers, timeout: first_run[url]
+        assert analyzer.getRepos() == {"repo": ["main", "dev"]}
+
+        analyzer.session.get.side_effect = lambda url, headers, timeout: _Response(304)
+        assert analyzer.getRepos() == {"repo": ["main", "dev"]}
+        sent = analyzer.session.get.call_args_list[-1].kwargs["headers"]
+        assert sent["If-None-Match"] == '"b2"'
+
+
+    def test_cache_closed(self, tmp_path):
+        cache = _ETagCache(str(tmp_path / "gh_cache.db"))
+        cache.put("u", '"e"', "[]", None)
+        cache.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            cache.get("u")
+
+
+class TestExport:
+
+    def test_jsonl_one_record_per_line(self, analyzer, tmp_path):
+        path = tmp_path / "all_repos.jsonl"
+        with open(path, "wb") as output:
+            analyzer.export_jsonl([{"commit_sha": "a", "author_name": "Zoë"}], output)
+            analyzer.export_jsonl([{"commit_sha": "b"}], output)
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["commit_sha"] for line in lines] == ["a", "b"]
+        assert "Zoë" in lines[0]
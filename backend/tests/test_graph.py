@@ -0,0 +1,179 @@
+"""
+Tests for the Graph client's chat message paging and JSON $batch helper.
+
+No network access — user_client is a mock returning canned pages.
+"""
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("msgraph")
+
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from backend.msgraph_python import graph as graph_module
+from backend.msgraph_python.graph import Graph
+
+
+def _page(hours, next_link=None):
+    """A newest-first page of messages created at the given hours on 2026-03-04"""
+    return SimpleNamespace(
+        value=[SimpleNamespace(id=f"m{h}", created_date_time=datetime(2026, 3, 4, h, tzinfo=timezone.utc))
+               for h in hours],
+        odata_next_link=next_link,
+    )
+
+
+@pytest.fixture
+def graph():
+    # Skip __init__: it reads settings and builds a device-code credential
+    obj = Graph.__new__(Graph)
+    obj.user_client = MagicMock()
+    return obj
+
+
+def _next_pages(graph, pages):
+    messages = graph.user_client.chats.by_chat_id.return_value.messages
+    messages.with_url.return_value.get = AsyncMock(side_effect=pages)
+    return messages
+
+
+class TestMessagePaging:
+
+    @pytest.mark.asyncio
+    async def test_stops_after_page_reaching_cutoff(self, graph):
+        messages = _next_pages(graph, [_page([12, 11], "p3"), _page([10, 9])])
+        stream = graph._iter_messages("c", _page([14, 13], "p2"), datetime(2026, 3, 4, 11, 30))
+
+        # The page holding the last message before the cutoff is kept
+        assert [m.id async for m in stream] == ["m14", "m13", "m12", "m11"]
+        messages.with_url.assert_called_once_with("p2")
+
+    @pytest.mark.asyncio
+    async def test_all_pages_without_cutoff(self, graph):
+        _next_pages(graph, [_page([12, 11], "p3"), _page([10])])
+        stream = graph._iter_messages("c", _page([14, 13], "p2"))
+        assert [m.id async for m in stream] == ["m14", "m13", "m12", "m11", "m10"]
+
+    @pytest.mark.asyncio
+    async def test_history_sorted_oldest_first(self, graph):
+        _next_pages(graph, [_page([12, 11])])
+        messages = await graph._page_chat_messages("c", _page([14, 13], "p2"))
+        assert [m.id for m in messages] == ["m11", "m12", "m13", "m14"]
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_history_still_sorted(self, graph):
+        late = _page([13])
+        late.value[0].created_date_time = None
+        _next_pages(graph, [_page([12, 11], "p3"), late])
+        messages = await graph._page_chat_messages("c", _page([14, 10], "p2"))
+        assert [m.id for m in messages] == ["m13", "m10", "m11", "m12", "m14"]
+
+    def test_history_ordered_by_created_time(self):
+        params = Graph._MESSAGE_HISTORY_CONFIG.query_parameters
+        assert params.orderby == ["createdDateTime desc"] and params.filter is None
+
+
+def _request(key):
+    info = RequestInformation()
+    info.http_method = Method.GET
+    info.url = f"https://graph.microsoft.com/v1.0/chats/{key}/members"
+    return info
+
+
+class _BatchResponse:
+    """Stand-in for msgraph_core's BatchResponseContent"""
+
+    def __init__(self, statuses, retry_after=None):
+        self._statuses = statuses
+        self._retry_after = retry_after
+
+    def get_response_status_codes(self):
+        return {rid: status for rid, (_, status) in self._statuses.items()}
+
+    def get_response_by_id(self, rid, response_type=None):
+        key, status = self._statuses[rid]
+        if response_type is None:
+            headers = {"Retry-After": self._retry_after} if self._retry_after else {}
+            return SimpleNamespace(status=status, headers=headers)
+        return f"parsed {key}"
+
+
+class TestBatchGet:
+
+    @pytest.fixture
+    def posts(self, graph):
+        """Batch calls made, as lists of chat keys; status_for(key, call) decides each status"""
+        calls = []
+        graph.status_for = lambda key, call: 200
+        graph.retry_after = None
+
+        async def post(batch_request_content):
+            items = batch_request_content.requests
+            keys = {rid: item.url.split("/chats/")[1].split("/")[0] for rid, item in items.items()}
+            calls.append(sorted(keys.values()))
+            statuses = {rid: (key, graph.status_for(key, len(calls))) for rid, key in keys.items()}
+            return _BatchResponse(statuses, graph.retry_after)
+
+        graph.user_client.batch.post = AsyncMock(side_effect=post)
+        graph.user_client.request_adapter.send_async = AsyncMock(
+            side_effect=lambda info, response_type, error_map: f"single {info.url.split('/')[-2]}")
+        return calls
+
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        sleep = AsyncMock()
+        monkeypatch.setattr(graph_module.asyncio, "sleep", sleep)
+        return sleep
+
+    @pytest.mark.asyncio
+    async def test_chunked_at_batch_limit(self, graph, posts):
+        keys = [f"c{n:02d}" for n in range(45)]
+        result = await graph._batch_get({key: _request(key) for key in keys}, object)
+
+        assert sorted(len(call) for call in posts) == [5, 20, 20]
+        assert result == {key: f"parsed {key}" for key in keys}
+
+    @pytest.mark.asyncio
+    async def test_failed_sub_requests_left_out(self, graph, posts, sleeps):
+        graph.status_for = lambda key, call: 404 if key == "b" else 200
+        result = await graph._batch_get({key: _request(key) for key in "abc"}, object)
+
+        assert result == {"a": "parsed a", "c": "parsed c"}
+        assert len(posts) == 1
+        sleeps.assert_not_called()
+        graph.user_client.request_adapter.send_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_throttled_sub_requests_retried_after_wait(self, graph, posts, sleeps):
+        graph.status_for = lambda key, call: 429 if key == "b" and call == 1 else 200
+        graph.retry_after = "3"
+        result = await graph._batch_get({key: _request(key) for key in "abc"}, object)
+
+        assert result == {key: f"parsed {key}" for key in "abc"}
+        assert posts == [["a", "b", "c"], ["b"]]
+        sleeps.assert_awaited_once_with(3.0)
+
+    @pytest.mark.asyncio
+    async def test_still_throttled_falls_back_to_single_gets(self, graph, posts, sleeps):
+        graph.status_for = lambda key, call: 503 if key == "b" else 200
+        result = await graph._batch_get({key: _request(key) for key in "abc"}, object)
+
+        assert result == {"a": "parsed a", "b": "single b", "c": "parsed c"}
+        assert len(posts) == 1 + graph_module.GRAPH_BATCH_RETRIES
+        assert sleeps.await_args.args == (1.0,)  # no Retry-After header
+        graph.user_client.request_adapter.send_async.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_call_falls_back_to_single_gets(self, graph, posts, sleeps):
+        graph.user_client.batch.post = AsyncMock(side_effect=RuntimeError("boom"))
+        result = await graph._batch_get({key: _request(key) for key in "ab"}, object)
+        assert result == {"a": "single a", "b": "single b"}
+
+    def test_retry_after_capped(self):
+        item = SimpleNamespace(headers={"retry-after": "3600"})
+        assert Graph._retry_after(item) == graph_module.GRAPH_BATCH_MAX_RETRY_WAIT_SECS
@@ -0,0 +1,211 @@
+"""
+Tests for the IPC message codec and IPCClient socket framing.
+
+Uses socket.socketpair() in place of the Go daemon's TCP server.
+"""
+import json
+import socket
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.ipc_client import (
+    IPCClient,
+    IPCMessage,
+    MessageType,
+    create_ack_message,
+    create_task_update_message,
+)
+
+
+@pytest.fixture
+def pair(request):
+    """A connected IPCClient and the daemon's end of the socket"""
+    client_sock, daemon_sock = socket.socketpair()
+    client = IPCClient(socket_path="127.0.0.1:0", length_prefixed=getattr(request, "param", False))
+    client.sock = client_sock
+    client.connected = True
+    yield client, daemon_sock
+    client.disconnect()
+    daemon_sock.close()
+
+
+def _frame(msg_type: str, msg_id: str, data: dict) -> bytes:
+    return (json.dumps({"type": msg_type, "timestamp": "2026-01-01T00:00:00Z",
+                        "id": msg_id, "data": data}) + "\n").encode()
+
+
+class TestMessageCodec:
+
+    def test_round_trip(self):
+        msg = create_task_update_message("proj", "T-1", "Fixed ✓", "done", "1h")
+        parsed = IPCMessage.from_json(msg.to_json())
+        assert parsed.type is MessageType.TASK_UPDATE
+        assert parsed.id == msg.id
+        assert parsed.data["description"] == "Fixed ✓"
+
+    def test_from_json_accepts_bytes(self):
+        parsed = IPCMessage.from_json(_frame("commit_trigger", "c1", {"branch": "main"}).strip())
+        assert parsed.type is MessageType.COMMIT_TRIGGER
+        assert parsed.data == {"branch": "main"}
+        assert parsed.timestamp == "2026-01-01T00:00:00Z"
+        assert not hasattr(parsed, "__dict__")
+
+    def test_from_dict_fills_missing_fields(self):
+        parsed = IPCMessage.from_dict({"type": "shutdown"})
+        assert parsed.data == {} and parsed.error is None
+        assert parsed.id.startswith("shutdown-")
+        assert datetime.fromisoformat(parsed.timestamp).tzinfo is not None
+
+    def test_generated_ids_unique(self):
+        ids = {IPCMessage(MessageType.TASK_UPDATE, {}).id for _ in range(1000)}
+        assert len(ids) == 1000
+        assert next(iter(ids)).startswith("task_update-")
+
+    def test_timestamp_is_rfc3339_with_offset(self):
+        stamp = create_ack_message("x").to_dict()["timestamp"]
+        parsed = datetime.fromisoformat(stamp)
+        assert parsed.tzinfo is not None
+        assert abs((datetime.now(timezone.utc) - parsed).total_seconds()) < 5
+
+    def test_unknown_type_rejected(self):
+        with pytest.raises(ValueError):
+            IPCMessage.from_json(_frame("bogus", "x", {}))
+
+    def test_error_only_serialized_when_set(self):
+        assert "error" not in create_ack_message("x").to_dict()
+
+    def test_to_bytes_is_one_utf8_frame(self):
+        msg = create_task_update_message("proj", "T-1", "naïve", "done", "1h")
+        frame = msg.to_bytes()
+        assert frame.endswith(b"\n") and b"\n" not in frame[:-1]
+        assert json.loads(frame) == json.loads(msg.to_json())
+
+
+class TestSocketIO:
+
+    def test_send_is_newline_delimited_json(self, pair):
+        client, daemon = pair
+        assert client.send_message(create_ack_message("req-1"))
+        line = daemon.recv(65536)
+        assert line.endswith(b"\n") and line.count(b"\n") == 1
+        payload = json.loads(line)
+        assert payload["type"] == "ack" and payload["id"] == "req-1"
+
+    def test_send_messages_in_one_write(self, pair):
+        client, daemon = pair
+        assert client.send_messages([create_ack_message("a"), create_ack_message("b")])
+        lines = daemon.recv(65536).splitlines()
+        assert [json.loads(line)["id"] for line in lines] == ["a", "b"]
+
+    def test_receive_one_message_per_call(self, pair):
+        client, daemon = pair
+        daemon.sendall(_frame("commit_trigger", "a", {}) + _frame("timer_trigger", "b", {}))
+        first = client.receive_message(timeout=1)
+        second = client.receive_message(timeout=1)
+        assert (first.id, second.id) == ("a", "b")
+        assert client.receive_message(timeout=0.05) is None
+
+    @pytest.mark.parametrize("pair", [False, True], indirect=True)
+    def test_receive_messages_drains_buffered_burst(self, pair):
+        client, daemon = pair
+        payloads = [_frame("ack", str(i), {}) for i in range(3)]
+        if client.length_prefixed:
+            payloads = [struct.pack("<I", len(p)) + p for p in payloads]
+        daemon.sendall(b"".join(payloads[:2]) + payloads[2][:5])
+
+        assert [m.id for m in client.receive_messages(timeout=1)] == ["0", "1"]
+        # The partial third frame stays buffered for the next call
+        daemon.sendall(payloads[2][5:])
+        assert [m.id for m in client.receive_messages(timeout=1)] == ["2"]
+
+    def test_message_split_across_reads_and_timeouts(self, pair):
+        client, daemon = pair
+        frame = _frame("report_trigger", "r1", {"text": "x" * 100_000})
+        daemon.sendall(frame[:10])
+        assert client.receive_message(timeout=0.05) is None  # partial frame is kept
+        daemon.sendall(frame[10:])
+        assert client.receive_message(timeout=1).data["text"] == "x" * 100_000
+        assert client._rx_pos == client._rx_end == 0
+
+    def test_send_not_blocked_by_pending_receive(self, pair):
+        client, daemon = pair
+        reader = threading.Thread(target=client.receive_message, kwargs={"timeout": 2})
+        reader.start()
+        time.sleep(0.05)
+        started = time.monotonic()
+        assert client.send_message(create_ack_message("req-2"))
+        assert time.monotonic() - started < 1
+        assert json.loads(daemon.recv(65536))["id"] == "req-2"
+        daemon.sendall(_frame("ack", "done", {}))
+        reader.join()
+
+
+@pytest.mark.parametrize("pair", [True], indirect=True)
+class TestLengthPrefixedFraming:
+
+    def test_send_prefixes_payload_size(self, pair):
+        client, daemon = pair
+        assert client.send_message(create_ack_message("req-1"))
+        frame = daemon.recv(65536)
+        (size,) = struct.unpack("<I", frame[:4])
+        assert size == len(frame) - 4 and json.loads(frame[4:])["id"] == "req-1"
+
+    def test_receive_payload_with_embedded_newline(self, pair):
+        client, daemon = pair
+        payload = _frame("report_trigger", "r1", {"text": "a\nb"})  # trailing newline is part of the payload
+        frame = struct.pack("<I", len(payload)) + payload
+        daemon.sendall(frame[:3])
+        assert client.receive_message(timeout=0.05) is None
+        daemon.sendall(frame[3:] + frame)
+        assert [client.receive_message(timeout=1).id for _ in range(2)] == ["r1", "r1"]
+
+    def test_oversized_header_drops_connection(self, pair):
+        client, daemon = pair
+        daemon.sendall(struct.pack("<I", 0xFFFFFFFF))
+        assert client.receive_message(timeout=1) is None
+        assert not client.connected
+
+
+class TestListener:
+
+    def test_handler_called_and_stop_is_prompt(self, pair):
+        client, daemon = pair
+        received = threading.Event()
+        client.register_handler(MessageType.TIMER_TRIGGER, lambda msg: received.set())
+        client.start_listening()
+        daemon.sendall(_frame("timer_trigger", "t1", {}))
+        assert received.wait(1)
+
+        started = time.monotonic()
+        client.stop_listening()
+        assert time.monotonic() - started < 0.5
+        assert not client.listener_thread.is_alive()
+
+    def test_listener_exits_when_daemon_hangs_up(self, pair):
+        client, daemon = pair
+        client.start_listening()
+        daemon.close()
+        client.listener_thread.join(1)
+        assert not client.listener_thread.is_alive() and not client.connected
+        client.disconnect()
+        assert client.sock is None
+
+
+class TestConnect:
+
+    def test_socket_tuned_before_connect(self, monkeypatch):
+        monkeypatch.setenv("IPC_RETRY_DELAY_MS", "10")
+        server = socket.create_server(("127.0.0.1", 0))
+        host, port = server.getsockname()
+        client = IPCClient(socket_path=f"{host}:{port}", length_prefixed=False, socket_buffer_size=256 * 1024)
+        try:
+            assert client.connect(timeout=1, retry_count=1)
+            assert client.sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+            assert client.sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 256 * 1024
+        finally:
+            client.disconnect()
+            server.close()
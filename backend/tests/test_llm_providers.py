@@ -87,6 +87,32 @@ class TestProviderChain:
         chain = self._make_chain(_NeverAvailableProvider(), _NeverAvailableProvider())
         assert chain.generate("hi") is None
 
+    def test_generate_stream_falls_back_past_empty_provider(self):
+        from backend.llm.provider_factory import ProviderChain
+        chain = ProviderChain([_FailingProvider(), _AlwaysAvailableProvider("streamed")])
+        assert list(chain.generate_stream("hi")) == ["streamed"]
+
+    def test_generate_stream_empty_when_all_fail(self):
+        from backend.llm.provider_factory import ProviderChain
+        chain = ProviderChain([_NeverAvailableProvider(), _FailingProvider()])
+        assert list(chain.generate_stream("hi")) == []
+
+    def test_generate_stream_reports_completion(self):
+        from backend.llm.base import TrackedStream
+        from backend.llm.provider_factory import ProviderChain
+
+        def cut_off(prompt, options=None, timeout=30):
+            yield "partial"
+            return False
+
+        streaming = _AlwaysAvailableProvider()
+        streaming.generate_stream = cut_off
+        tracked = TrackedStream(ProviderChain([streaming]).generate_stream("hi"))
+        assert list(tracked) == ["partial"] and tracked.completed is False
+
+        tracked = TrackedStream(ProviderChain([_AlwaysAvailableProvider("whole")]).generate_stream("hi"))
+        assert list(tracked) == ["whole"] and tracked.completed is True
+
     def test_primary_property(self):
         p1 = _AlwaysAvailableProvider("first")
         p2 = _AlwaysAvailableProvider("second")
@@ -134,6 +160,39 @@ class TestOllamaProvider:
         with patch("backend.ai.ollama_client.generate", side_effect=Exception("timeout")):
             assert provider.generate("test") is None
 
+    def test_delegates_generate_stream_to_ollama_client(self):
+        from backend.llm.ollama_provider import OllamaProvider
+        provider = OllamaProvider(host="http://localhost:11434", model="llama3.2")
+        with patch("backend.ai.ollama_client.generate_stream", return_value=iter(["a", "b"])) as mock_stream:
+            assert list(provider.generate_stream("test prompt")) == ["a", "b"]
+            assert mock_stream.call_args.kwargs.get("model") == "llama3.2"
+
+    @pytest.mark.parametrize("lines,completed", [
+        ([b'{"response": "a"}', b'{"response": "b", "done": true}'], True),
+        ([b'{"response": "a"}', b'not json'], False),
+    ])
+    def test_ollama_stream_completion_flag(self, lines, completed):
+        from backend.ai import ollama_client
+        from backend.llm.base import TrackedStream
+
+        response = MagicMock(status_code=200)
+        response.iter_lines.return_value = iter(lines)
+        response.__enter__.return_value = response
+        session = MagicMock()
+        session.post.return_value = response
+        with patch.object(ollama_client, "_get_session", return_value=session):
+            tracked = TrackedStream(ollama_client.generate_stream("p", model="m", host="http://h"))
+            chunks = list(tracked)
+        assert chunks[0] == "a" and tracked.completed is completed
+
+    def test_passes_keep_alive_to_ollama_client(self):
+        from backend.llm.base import LLMOptions
+        from backend.llm.ollama_provider import OllamaProvider
+        provider = OllamaProvider(host="http://localhost:11434", model="llama3.2")
+        with patch("backend.ai.ollama_client.generate", return_value="ok") as mock_gen:
+            provider.generate("test", LLMOptions(keep_alive="10m"))
+            assert mock_gen.call_args.kwargs.get("keep_alive") == "10m"
+
     def test_provider_name(self):
         from backend.llm.ollama_provider import OllamaProvider
         assert OllamaProvider(host="h", model="m").provider_name == "ollama"
@@ -226,6 +226,37 @@ class TestCreateAllAzure:
         assert len(created) < 4
 
 
+    @pytest.mark.asyncio
+    async def test_create_all_overlaps_sibling_creates(self, azure_agent, mock_provider):
+        import asyncio
+        plan = azure_agent.decompose("Build auth")
+
+        in_flight = [0]
+        peak = [0]
+        mock_client = AsyncMock()
+
+        async def fake_create(**kwargs):
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0)
+            in_flight[0] -= 1
+            wi = MagicMock()
+            wi.id = 100
+            wi.url = ""
+            return wi
+
+        mock_client.create_work_item.side_effect = fake_create
+        mock_client.close = AsyncMock()
+        azure_agent._azure_client = mock_client
+
+        created, failed = await azure_agent.create_all(plan)
+        assert len(created) == 4
+        # The two level-2 siblings (Task + Bug) were in flight together
+        assert peak[0] == 2
+        # Result order follows the plan, not completion order
+        assert [n.title for n in created] == [n.title for n in plan.items]
+
+
 class TestCreateAllGitLab:
 
     @pytest.mark.asyncio
@@ -0,0 +1,34 @@
+"""
+JSON encode/decode helpers with an optional fast backend.
+
+Uses orjson when it is installed (it is already pulled in transitively) and
+falls back to the stdlib json module otherwise. Hot paths that parse large
+API payloads import from here so the backend can be swapped in one place.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    _orjson = None
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Decode a JSON document from str or bytes."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode *obj* to compact UTF-8 JSON bytes."""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def dumps(obj: Any) -> str:
+    """Encode *obj* to a compact JSON string (e.g. for aiohttp's json_serialize)."""
+    return dumps_bytes(obj).decode()
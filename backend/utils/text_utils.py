@@ -5,8 +5,30 @@ Provides common text processing functions used across multiple modules.
 """
 
 import re
+from datetime import datetime
+from html import unescape
 from typing import Optional
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    # Python 3.11+ fromisoformat accepts the "Z" suffix Graph uses
+    _parse_iso = datetime.fromisoformat
+
+# Compiled once; used on every collected message/email body
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# A whole "> quoted" line including its newline; [^\S\n] keeps the match
+# from swallowing blank lines above the quote
+_QUOTED_LINE_RE = re.compile(r'^[^\S\n]*>.*(?:\n|$)', re.MULTILINE)
+
+# Reply-history containers inserted by common mail clients
+_QUOTED_HTML_SELECTOR = 'blockquote, .gmail_quote, #divRplyFwdMsg, .OutlookMessageHeader'
+
 
 def clean_html_tags(text: Optional[str]) -> str:
     """
@@ -17,22 +39,47 @@ def clean_html_tags(text: Optional[str]) -> str:
     if not text:
         return ""
 
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-
-    # Decode common HTML entities
-    html_entities = {
-        '&nbsp;': ' ',
-        '&amp;': '&',
-        '&lt;': '<',
-        '&gt;': '>',
-        '&quot;': '"',
-        '&#39;': "'",
-        '&apos;': "'"
-    }
-
-    for entity, replacement in html_entities.items():
-        text = text.replace(entity, replacement)
+    # Remove HTML tags, then decode every named/numeric entity in one pass
+    # (&nbsp; becomes U+00A0, which split() below treats as whitespace)
+    text = unescape(_HTML_TAG_RE.sub('', text))
 
     # Clean up extra whitespace
     return ' '.join(text.split())
+
+
+def html_to_text(content: str, drop_quoted: bool = False) -> str:
+    """
+    Strip HTML markup from a message body.
+
+    Uses selectolax (lexbor, compiled C) when installed, which also drops
+    <script>/<style> content; falls back to removing tags with a regex.
+    Entities are decoded either way. drop_quoted additionally removes quoted
+    reply history.
+
+    Used by the Teams and Outlook data collectors.
+    """
+    if '<' not in content:
+        return content
+    if LexborHTMLParser is None:
+        return unescape(_HTML_TAG_RE.sub('', content))
+
+    tree = LexborHTMLParser(content)
+    tree.strip_tags(['script', 'style'])
+    if drop_quoted:
+        for node in tree.css(_QUOTED_HTML_SELECTOR):
+            node.decompose()
+    root = tree.body or tree.root
+    return root.text() if root else ''
+
+
+def strip_quoted_lines(text: str) -> str:
+    """Remove "> quoted" reply lines from plain text"""
+    return _QUOTED_LINE_RE.sub('', text)
+
+
+def parse_iso_timestamp(timestamp_str: Optional[str]) -> datetime:
+    """Parse an ISO 8601 timestamp, falling back to now() if it is missing or invalid"""
+    try:
+        return _parse_iso(timestamp_str)
+    except (TypeError, ValueError):
+        return datetime.now()
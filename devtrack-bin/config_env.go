@@ -721,6 +721,15 @@ func IsWebhookEnabled() bool {
 	return val == "true" || val == "1" || val == "yes" || val == "on"
 }
 
+// IsIPCLengthPrefixed returns whether IPC frames carry a 4-byte little-endian
+// length prefix instead of a trailing newline.
+// Reads IPC_LENGTH_PREFIX from .env (default: false). The Python backend reads
+// the same variable; both sides must agree.
+func IsIPCLengthPrefixed() bool {
+	val := strings.TrimSpace(strings.ToLower(os.Getenv("IPC_LENGTH_PREFIX")))
+	return val == "true" || val == "1" || val == "yes" || val == "on"
+}
+
 // GetWebhookPort returns the webhook server listen port.
 // Reads WEBHOOK_PORT from .env (default: 8089).
 func GetWebhookPort() int {
@@ -331,6 +331,7 @@ func (d *Database) initSchema() error {
 	CREATE INDEX IF NOT EXISTS idx_task_updates_response ON task_updates(response_id);
 	CREATE INDEX IF NOT EXISTS idx_task_updates_synced ON task_updates(synced);
 	CREATE INDEX IF NOT EXISTS idx_task_updates_platform ON task_updates(platform);
+	CREATE INDEX IF NOT EXISTS idx_task_updates_ts_status ON task_updates(timestamp, status, project, ticket_id);
 	CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp);
 	CREATE INDEX IF NOT EXISTS idx_logs_level ON logs(level);
 	CREATE INDEX IF NOT EXISTS idx_logs_component ON logs(component);
@@ -2,6 +2,7 @@ package main
 
 import (
 	"bufio"
+	"encoding/binary"
 	"encoding/json"
 	"errors"
 	"fmt"
@@ -15,6 +16,10 @@ import (
 // ErrNoClients is returned when no IPC clients are connected
 var ErrNoClients = errors.New("no IPC clients connected")
 
+// maxIPCFrameSize bounds a length-prefixed frame so a corrupt header cannot
+// trigger an unbounded allocation
+const maxIPCFrameSize = 64 << 20
+
 // MessageType defines the type of IPC message
 type MessageType string
 
@@ -239,12 +244,22 @@ func (s *IPCServer) handleClient(clientID string, conn net.Conn) {
 		log.Printf("IPC client disconnected: %s", clientID)
 	}()
 
-	scanner := bufio.NewScanner(conn)
-	for scanner.Scan() {
-		line := scanner.Text()
+	reader := bufio.NewReader(conn)
+	lengthPrefixed := IsIPCLengthPrefixed()
+	for {
+		payload, err := readFrame(reader, lengthPrefixed)
+		if err != nil {
+			if err != io.EOF {
+				log.Printf("Error reading from client %s: %v", clientID, err)
+			}
+			return
+		}
+		if len(payload) == 0 {
+			continue
+		}
 
 		var msg IPCMessage
-		if err := json.Unmarshal([]byte(line), &msg); err != nil {
+		if err := json.Unmarshal(payload, &msg); err != nil {
 			log.Printf("Error parsing IPC message: %v", err)
 			continue
 		}
@@ -258,10 +273,44 @@ func (s *IPCServer) handleClient(clientID string, conn net.Conn) {
 			log.Printf("No handler for message type: %s", msg.Type)
 		}
 	}
+}
 
-	if err := scanner.Err(); err != nil {
-		log.Printf("Error reading from client %s: %v", clientID, err)
+// encodeFrame frames a marshaled message for the wire: a 4-byte little-endian
+// length prefix when lengthPrefixed, otherwise a trailing newline
+func encodeFrame(payload []byte, lengthPrefixed bool) []byte {
+	if !lengthPrefixed {
+		return append(payload, '\n')
+	}
+	frame := make([]byte, 4+len(payload))
+	binary.LittleEndian.PutUint32(frame, uint32(len(payload)))
+	copy(frame[4:], payload)
+	return frame
+}
+
+// readFrame reads the next message payload framed by encodeFrame. It returns
+// io.EOF only when the stream ends cleanly between frames.
+func readFrame(r *bufio.Reader, lengthPrefixed bool) ([]byte, error) {
+	if !lengthPrefixed {
+		line, err := r.ReadBytes('\n')
+		if err == io.EOF && len(line) > 0 {
+			return line, nil
+		}
+		return line, err
+	}
+
+	var header [4]byte
+	if _, err := io.ReadFull(r, header[:]); err != nil {
+		return nil, err
+	}
+	size := binary.LittleEndian.Uint32(header[:])
+	if size > maxIPCFrameSize {
+		return nil, fmt.Errorf("IPC frame of %d bytes exceeds %d byte limit", size, maxIPCFrameSize)
+	}
+	payload := make([]byte, size)
+	if _, err := io.ReadFull(r, payload); err != nil {
+		return nil, err
 	}
+	return payload, nil
 }
 
 // RegisterHandler registers a handler function for a message type
@@ -285,8 +334,7 @@ func (s *IPCServer) SendMessage(msg IPCMessage) error {
 		return ErrNoClients
 	}
 
-	// Add newline delimiter
-	data = append(data, '\n')
+	data = encodeFrame(data, IsIPCLengthPrefixed())
 
 	for id, conn := range s.clients {
 		if _, err := conn.Write(data); err != nil {
@@ -380,8 +428,7 @@ func (c *IPCClient) SendMessage(msg IPCMessage) error {
 		return fmt.Errorf("failed to marshal message: %w", err)
 	}
 
-	// Add newline delimiter
-	data = append(data, '\n')
+	data = encodeFrame(data, IsIPCLengthPrefixed())
 
 	if _, err := c.conn.Write(data); err != nil {
 		return fmt.Errorf("failed to send message: %w", err)
@@ -400,7 +447,7 @@ func (c *IPCClient) ReceiveMessage() (*IPCMessage, error) {
 	}
 
 	reader := bufio.NewReader(c.conn)
-	line, err := reader.ReadString('\n')
+	line, err := readFrame(reader, IsIPCLengthPrefixed())
 	if err != nil {
 		if err == io.EOF {
 			return nil, fmt.Errorf("connection closed")
@@ -409,7 +456,7 @@ func (c *IPCClient) ReceiveMessage() (*IPCMessage, error) {
 	}
 
 	var msg IPCMessage
-	if err := json.Unmarshal([]byte(line), &msg); err != nil {
+	if err := json.Unmarshal(line, &msg); err != nil {
 		return nil, fmt.Errorf("failed to unmarshal message: %w", err)
 	}
 